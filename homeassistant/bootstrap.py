@@ -15,15 +15,22 @@ import yarl
 
 from homeassistant import config as conf_util, config_entries, core, loader
 from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
     REQUIRED_NEXT_PYTHON_DATE,
     REQUIRED_NEXT_PYTHON_VER,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.startup_trace import (
+    DATA_STARTUP_TRACE,
+    StartupTrace,
+    async_save_trace,
+)
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
     DATA_SETUP,
     DATA_SETUP_STARTED,
+    DATA_SETUP_TIME,
     async_set_domains_to_be_loaded,
     async_setup_component,
 )
@@ -70,6 +77,16 @@ STAGE_1_INTEGRATIONS = {
     # as possible so problem integrations can
     # be removed
     "frontend",
+    # The AIS dom voice assistant
+    "ais_ai_service",
+}
+# Integrations which are slow to import and set up, they are set up after
+# Home Assistant has started unless another integration depends on them
+DEFERRED_INTEGRATIONS = {
+    "ais_drives_service",
+    "ais_spotify_service",
+    "ais_yt_service",
+    "ais_updater",
 }
 
 
@@ -79,6 +96,8 @@ async def async_setup_hass(
     """Set up Home Assistant."""
     hass = core.HomeAssistant()
     hass.config.config_dir = runtime_config.config_dir
+    if runtime_config.trace_startup:
+        hass.data[DATA_STARTUP_TRACE] = StartupTrace()
 
     async_enable_logging(
         hass,
@@ -542,6 +561,14 @@ async def _async_set_up_integrations(
 
     stage_2_domains = domains_to_setup - logging_domains - debuggers - stage_1_domains
 
+    # Defer the heavy integrations which the others don't depend on
+    dependencies: Set[str] = set()
+    for itg in integration_cache.values():
+        if itg.domain not in DEFERRED_INTEGRATIONS:
+            dependencies.update(itg.all_dependencies)
+    deferred_domains = (stage_2_domains & DEFERRED_INTEGRATIONS) - dependencies
+    stage_2_domains -= deferred_domains
+
     # Kick off loading the registries. They don't need to be awaited.
     asyncio.create_task(hass.helpers.device_registry.async_get_registry())
     asyncio.create_task(hass.helpers.entity_registry.async_get_registry())
@@ -582,3 +609,43 @@ async def _async_set_up_integrations(
             await hass.async_block_till_done()
     except asyncio.TimeoutError:
         _LOGGER.warning("Setup timed out for bootstrap - moving forward")
+
+    if not deferred_domains:
+        _async_report_startup(hass)
+        return
+
+    async def async_setup_deferred(_: Optional[core.Event] = None) -> None:
+        """Set up the deferred integrations."""
+        _LOGGER.info("Setting up deferred integrations: %s", deferred_domains)
+        await async_setup_multi_components(
+            hass, deferred_domains, config, setup_started
+        )
+        _async_report_startup(hass)
+
+    if hass.state == core.CoreState.running:
+        hass.async_create_task(async_setup_deferred())
+    else:
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, async_setup_deferred)
+
+
+@core.callback
+def _async_report_startup(hass: core.HomeAssistant) -> None:
+    """Log the startup timeline and save the startup trace."""
+    if DATA_STARTUP_TRACE in hass.data:
+        hass.async_create_task(async_save_trace(hass))
+
+    setup_time = hass.data.get(DATA_SETUP_TIME)
+    if not setup_time:
+        return
+
+    started = min(times["start"] for times in setup_time.values())
+    _LOGGER.info(
+        "Startup timeline:\n%s",
+        "\n".join(
+            f"{times['start'] - started:8.2f}s {domain}: "
+            f"import {times['import']:.2f}s, setup {times['setup']:.2f}s"
+            for domain, times in sorted(
+                setup_time.items(), key=lambda item: item[1]["start"]
+            )
+        ),
+    )
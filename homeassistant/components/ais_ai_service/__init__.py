@@ -11,7 +11,6 @@ import warnings
 
 from aiohttp.web import json_response
 import async_timeout
-import requests
 import voluptuous as vol
 
 from homeassistant import core
@@ -63,13 +62,24 @@ from homeassistant.helpers import config_validation as cv, event, intent
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
+from homeassistant.util.async_ import run_callback_threadsafe
 
 from .ais_agent import AisAgent
+from .entity_index import EntityNameIndex
+from .frame_client import AisFrameClient
+from .intent_index import IntentIndex
+from .remote_menu import RemoteMenu
+from .tts_client import AisTtsClient
 
 aisCloudWS = None
 
 ATTR_TEXT = "text"
 DOMAIN = "ais_ai_service"
+DATA_INTENT_INDEX = "ais_ai_service_intent_index"
+DATA_ENTITY_INDEX = "ais_ai_service_entity_index"
+DATA_FRAME_CLIENT = "ais_ai_service_frame_client"
+DATA_REMOTE_MENU = "ais_ai_service_remote_menu"
+DATA_TTS_CLIENT = "ais_ai_service_tts_client"
 
 REGEX_TURN_COMMAND = re.compile(r"turn (?P<name>(?: |\w)+) (?P<command>\w+)")
 
@@ -94,6 +104,7 @@ INTENT_PLAY_RADIO = "AisPlayRadio"
 INTENT_PLAY_PODCAST = "AisPlayPodcast"
 INTENT_PLAY_YT_MUSIC = "AisPlayYtMusic"
 INTENT_PLAY_SPOTIFY = "AisPlaySpotify"
+INTENT_PLAY_LOCAL_MEDIA = "AisPlayLocalMedia"
 INTENT_ASK_QUESTION = "AisAskQuestion"
 INTENT_ASKWIKI_QUESTION = "AisAskWikiQuestion"
 INTENT_CHANGE_CONTEXT = "AisChangeContext"
@@ -124,6 +135,133 @@ INTENT_SPELL_STATUS = "AisSpellStatusInfo"
 INTENT_RUN_AUTOMATION = "AisRunAutomation"
 INTENT_ASK_GOOGLE = "AisAskGoogle"
 
+# AIS dom intents utterances, the intents are matched in this order
+INTENT_UTTERANCES = {
+    INTENT_GET_WEATHER: ["[aktualna] pogoda", "jaka jest pogoda"],
+    INTENT_GET_WEATHER_48: ["prognoza pogody", "pogoda prognoza", "jaka będzie pogoda"],
+    INTENT_CLIMATE_SET_TEMPERATURE: [
+        "Ogrzewanie [w] {item} {temp} stopni[e]",
+        "Ogrzewanie [w] {item} temperatura {temp} stopni[e]",
+    ],
+    INTENT_CLIMATE_SET_PRESENT_MODE: ["Ogrzewanie tryb {item}"],
+    INTENT_CLIMATE_SET_ALL_OFF: ["Wyłącz całe ogrzewanie"],
+    INTENT_CLIMATE_SET_ALL_ON: ["Włącz całe ogrzewanie"],
+    INTENT_LAMPS_ON: [
+        "włącz światła",
+        "zapal światła",
+        "włącz wszystkie światła",
+        "zapal wszystkie światła",
+    ],
+    INTENT_LAMPS_OFF: [
+        "zgaś światła",
+        "wyłącz światła",
+        "wyłącz wszystkie światła",
+        "zgaś wszystkie światła",
+    ],
+    INTENT_SWITCHES_ON: ["włącz przełączniki", "włącz wszystkie przełączniki"],
+    INTENT_SWITCHES_OFF: ["wyłącz przełączniki", "wyłącz wszystkie przełączniki"],
+    INTENT_GET_TIME: [
+        "która",
+        "która [jest] [teraz] godzina",
+        "którą mamy godzinę",
+        "jaki [jest] czas",
+        "[jaka] [jest] godzina",
+    ],
+    INTENT_GET_DATE: [
+        "[jaka] [jest] data",
+        "jaki [mamy] [jest] [dzisiaj] dzień",
+        "co dzisiaj jest",
+        "co [mamy] [jest] dzisiaj",
+    ],
+    INTENT_PLAY_RADIO: [
+        "Włącz radio",
+        "Radio {item}",
+        "Włącz radio {item}",
+        "Graj radio {item}",
+        "Graj {item} radio",
+        "Posłuchał bym radio {item}",
+        "Włącz stację radiową {item}",
+    ],
+    INTENT_PLAY_PODCAST: [
+        "Podcast {item}",
+        "Włącz podcast {item}",
+        "Graj podcast {item}",
+        "Graj {item} podcast",
+        "Posłuchał bym podcast {item}",
+    ],
+    INTENT_PLAY_YT_MUSIC: [
+        "Muzyka {item}",
+        "Włącz muzykę {item}",
+        "Graj muzykę {item}",
+        "Graj {item} muzykę",
+        "Posłuchał bym muzykę {item}",
+        "Włącz [z] [na] YouTube {item}",
+        "YouTube {item}",
+    ],
+    INTENT_PLAY_SPOTIFY: ["Spotify {item}"],
+    INTENT_PLAY_LOCAL_MEDIA: [
+        "Album {item}",
+        "Włącz album {item}",
+        "Graj album {item}",
+        "Z dysku {item}",
+        "Włącz z dysku {item}",
+        "Graj z dysku {item}",
+        "Posłuchał bym z dysku {item}",
+    ],
+    INTENT_TURN_ON: ["Włącz {item}", "Zapal światło w {item}"],
+    INTENT_TURN_OFF: ["Wyłącz {item}", "Zgaś Światło w {item}"],
+    INTENT_TOGGLE: ["Przełącz {item}"],
+    INTENT_STATUS: [
+        "Jaka jest {item}",
+        "Jaki jest {item}",
+        "Jak jest {item}",
+        "Jakie jest {item}",
+        "[jaki] [ma] status {item}",
+    ],
+    INTENT_ASK_QUESTION: [
+        "Co to jest {item}",
+        "Kto to jest {item}",
+        "Znajdź informację o {item}",
+        "Znajdź informacje o {item}",
+        "Wyszukaj informację o {item}",
+        "Wyszukaj informacje o {item}",
+        "Wyszukaj {item}",
+        "Kim jest {item}",
+        "Informacje o {item}",
+        "Czym jest {item}",
+        "Opowiedz mi o {intem}",
+        "Informację na temat {item}",
+        "Co wiesz o {item}",
+        "Co wiesz na temat {item}",
+        "Opowiedz o {item}",
+        "Kim są {item}",
+        "Kto to {item}",
+    ],
+    INTENT_SPELL_STATUS: ["Przeliteruj {item}", "Literuj {item}"],
+    INTENT_ASKWIKI_QUESTION: ["Wikipedia {item}", "wiki {item}", "encyklopedia {item}"],
+    INTENT_OPEN_COVER: ["Otwórz {item}", "Odsłoń {item}"],
+    INTENT_CLOSE_COVER: ["Zamknij {item}", "Zasłoń {item}"],
+    INTENT_STOP: ["Stop", "Zatrzymaj", "Koniec", "Pauza", "Zaniechaj", "Stój"],
+    INTENT_PLAY: ["Start", "Graj", "Odtwarzaj"],
+    INTENT_SCENE: ["Scena {item}", "Aktywuj [scenę] {item}"],
+    INTENT_RUN_AUTOMATION: ["Uruchom {item}", "Automatyzacja {item}"],
+    INTENT_ASK_GOOGLE: ["Google {item}"],
+    INTENT_PERSON_STATUS: ["Gdzie jest {item}", "Lokalizacja {item}"],
+    INTENT_NEXT: [
+        "[włącz] następny",
+        "[włącz] kolejny",
+        "[graj] następny",
+        "[graj] kolejny",
+    ],
+    INTENT_PREV: [
+        "[włącz] poprzedni",
+        "[włącz] wcześniejszy",
+        "[graj] poprzedni",
+        "[graj] wcześniejszy",
+    ],
+    INTENT_SAY_IT: ["Powiedz", "Mów", "Powiedz {item}", "Mów {item}", "Echo {item}"],
+}
+
 REGEX_TYPE = type(re.compile(""))
 
 _LOGGER = logging.getLogger(__name__)
@@ -304,9 +442,25 @@ def async_register(hass, intent_type, utterances):
 
     for utterance in utterances:
         if isinstance(utterance, REGEX_TYPE):
-            conf.append(utterance)
+            matcher = utterance
         else:
-            conf.append(_create_matcher(utterance))
+            matcher = _create_matcher(utterance)
+        # the same matcher registered again can't change the first match
+        if matcher in conf:
+            continue
+        conf.append(matcher)
+        hass.data.pop(DATA_INTENT_INDEX, None)
+
+
+@core.callback
+def _async_get_intent_index(hass):
+    """Return the index of the registered intents, build it if needed."""
+    intent_index = hass.data.get(DATA_INTENT_INDEX)
+    if intent_index is None:
+        intent_index = hass.data[DATA_INTENT_INDEX] = IntentIndex(
+            hass.data.get(DOMAIN, {})
+        )
+    return intent_index
 
 
 def translate_state(state):
@@ -2079,131 +2233,16 @@ def go_home(hass):
 
 def get_groups(hass):
     global GROUP_ENTITIES
-    all_ais_sensors = []
-    all_ais_persons = []
-    all_ais_automations = []
-    all_ais_scenes = []
-    all_ais_switches = []
-    all_ais_lights = []
-    all_ais_climates = []
-    all_ais_covers = []
-    all_ais_locks = []
-    all_ais_vacuums = []
-    all_ais_cameras = []
-    all_ais_fans = []
-    entities = hass.states.async_all()
-    GROUP_ENTITIES = []
-
-    def add_menu_item(l_entity):
-        l_group = {
-            "friendly_name": l_entity.attributes.get("friendly_name"),
-            "order": l_entity.attributes.get("order"),
-            "entity_id": l_entity.entity_id,
-            "entities": l_entity.attributes.get("entity_id"),
-            "context_key_words": l_entity.attributes.get("context_key_words"),
-            "context_answer": l_entity.attributes.get("context_answer"),
-            "context_suffix": l_entity.attributes.get("context_suffix"),
-            "remote_group_view": l_entity.attributes.get("remote_group_view"),
-            "player_mode": l_entity.attributes.get("player_mode", ""),
-        }
-        GROUP_ENTITIES.append(l_group)
-
-    def get_key(item):
-        return item["order"]
-
-    for entity in entities:
-        if entity.entity_id.startswith("group."):
-            remote = entity.attributes.get("remote_group_view")
-            if remote is not None:
-                add_menu_item(entity)
-        elif entity.entity_id.startswith("sensor."):
-            device_class = entity.attributes.get("device_class", None)
-            if device_class is not None:
-                all_ais_sensors.append(entity.entity_id)
-        elif entity.entity_id.startswith("person."):
-            all_ais_persons.append(entity.entity_id)
-        elif entity.entity_id.startswith(
-            "automation."
-        ) and not entity.entity_id.startswith("automation.ais_"):
-            all_ais_automations.append(entity.entity_id)
-        elif entity.entity_id.startswith("scene."):
-            all_ais_scenes.append(entity.entity_id)
-        elif (
-            entity.entity_id.startswith("switch.")
-            and entity.entity_id != "switch.zigbee_tryb_parowania"
-        ):
-            all_ais_switches.append(entity.entity_id)
-        elif entity.entity_id.startswith("light."):
-            all_ais_lights.append(entity.entity_id)
-        elif entity.entity_id.startswith("climate."):
-            all_ais_climates.append(entity.entity_id)
-        elif entity.entity_id.startswith("cover."):
-            all_ais_covers.append(entity.entity_id)
-        elif entity.entity_id.startswith("lock."):
-            all_ais_locks.append(entity.entity_id)
-        elif entity.entity_id.startswith("vacuum."):
-            all_ais_vacuums.append(entity.entity_id)
-        elif (
-            entity.entity_id.startswith("camera.")
-            and entity.entity_id != "camera.remote_access"
-        ):
-            all_ais_cameras.append(entity.entity_id)
-        elif entity.entity_id.startswith("fan."):
-            all_ais_fans.append(entity.entity_id)
-
-    # update group on remote
-    all_unique_sensors = list(set(all_ais_sensors))
-    all_unique_sensors.sort()
-    all_unique_persons = list(set(all_ais_persons))
-    all_unique_persons.sort()
-    all_unique_automations = list(set(all_ais_automations))
-    all_unique_automations.sort()
-    all_unique_scenes = list(set(all_ais_scenes))
-    all_unique_scenes.sort()
-    all_unique_switches = list(set(all_ais_switches))
-    all_unique_switches.sort()
-    all_unique_lights = list(set(all_ais_lights))
-    all_unique_lights.sort()
-    all_unique_climates = list(set(all_ais_climates))
-    all_unique_climates.sort()
-    all_unique_covers = list(set(all_ais_covers))
-    all_unique_covers.sort()
-    all_unique_locks = list(set(all_ais_locks))
-    all_unique_locks.sort()
-    all_unique_vacuums = list(set(all_ais_vacuums))
-    all_unique_vacuums.sort()
-    all_unique_cameras = list(set(all_ais_cameras))
-    all_unique_cameras.sort()
-    all_unique_fans = list(set(all_ais_fans))
-    all_unique_fans.sort()
-
-    GROUP_ENTITIES = sorted(GROUP_ENTITIES, key=get_key)
-
-    for group in GROUP_ENTITIES:
-        if group["entity_id"] == "group.all_ais_automations":
-            group["entities"] = all_unique_automations
-        elif group["entity_id"] == "group.all_ais_scenes":
-            group["entities"] = all_unique_scenes
-        elif group["entity_id"] == "group.all_ais_persons":
-            group["entities"] = all_unique_persons
-        elif group["entity_id"] == "group.all_ais_sensors":
-            group["entities"] = all_unique_sensors
-        elif group["entity_id"] == "group.all_ais_switches":
-            group["entities"] = all_unique_switches
-        elif group["entity_id"] == "group.all_ais_lights":
-            group["entities"] = all_unique_lights
-        elif group["entity_id"] == "group.all_ais_climates":
-            group["entities"] = all_unique_climates
-        elif group["entity_id"] == "group.all_ais_covers":
-            group["entities"] = all_unique_covers
-        elif group["entity_id"] == "group.all_ais_locks":
-            group["entities"] = all_unique_locks
-        elif group["entity_id"] == "group.all_ais_vacuums":
-            group["entities"] = all_unique_vacuums
-        elif group["entity_id"] == "group.all_ais_cameras":
-            group["entities"] = all_unique_cameras
-        elif group["entity_id"] == "group.all_ais_fans":
-            group["entities"] = all_unique_fans
+    remote_menu = hass.data[DATA_REMOTE_MENU]
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # called from the executor, the menu is changed by the loop only
+        GROUP_ENTITIES = run_callback_threadsafe(
+            hass.loop, remote_menu.async_update
+        ).result()
+    else:
+        GROUP_ENTITIES = remote_menu.async_update()
 
 
 # new way to communicate with frame
@@ -2341,6 +2380,9 @@ async def async_setup(hass, config):
         if conf is None:
             conf = intents[intent_type] = []
         conf.extend(_create_matcher(utterance) for utterance in utterances)
+    hass.data.pop(DATA_INTENT_INDEX, None)
+    remote_menu = hass.data[DATA_REMOTE_MENU] = RemoteMenu(hass)
+    remote_menu.async_start()
 
     async def process(service):
         """Parse text into commands."""
@@ -2486,6 +2528,7 @@ async def async_setup(hass, config):
         _process_command_from_frame(hass, service)
 
     # fix for the problem on box with remote
+    @core.callback
     def prepare_remote_menu(service):
         get_groups(hass)
         # register context intent
@@ -2870,6 +2913,7 @@ async def async_setup(hass, config):
     hass.helpers.intent.async_register(AisPlayPodcastIntent())
     hass.helpers.intent.async_register(AisPlayYtMusicIntent())
     hass.helpers.intent.async_register(AisPlaySpotifyIntent())
+    hass.helpers.intent.async_register(AisPlayLocalMediaIntent())
     hass.helpers.intent.async_register(AskQuestionIntent())
     hass.helpers.intent.async_register(AskWikiQuestionIntent())
     hass.helpers.intent.async_register(ChangeContextIntent())
@@ -2891,187 +2935,8 @@ async def async_setup(hass, config):
     hass.helpers.intent.async_register(AisSayIt())
     hass.helpers.intent.async_register(SpellStatusIntent())
 
-    async_register(hass, INTENT_GET_WEATHER, ["[aktualna] pogoda", "jaka jest pogoda"])
-    async_register(
-        hass,
-        INTENT_GET_WEATHER_48,
-        ["prognoza pogody", "pogoda prognoza", "jaka będzie pogoda"],
-    )
-    async_register(
-        hass,
-        INTENT_CLIMATE_SET_TEMPERATURE,
-        [
-            "Ogrzewanie [w] {item} {temp} stopni[e]",
-            "Ogrzewanie [w] {item} temperatura {temp} stopni[e]",
-        ],
-    )
-    async_register(hass, INTENT_CLIMATE_SET_PRESENT_MODE, ["Ogrzewanie tryb {item}"])
-    async_register(hass, INTENT_CLIMATE_SET_ALL_OFF, ["Wyłącz całe ogrzewanie"])
-    async_register(hass, INTENT_CLIMATE_SET_ALL_ON, ["Włącz całe ogrzewanie"])
-    async_register(
-        hass,
-        INTENT_LAMPS_ON,
-        [
-            "włącz światła",
-            "zapal światła",
-            "włącz wszystkie światła",
-            "zapal wszystkie światła",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_LAMPS_OFF,
-        [
-            "zgaś światła",
-            "wyłącz światła",
-            "wyłącz wszystkie światła",
-            "zgaś wszystkie światła",
-        ],
-    )
-    async_register(
-        hass, INTENT_SWITCHES_ON, ["włącz przełączniki", "włącz wszystkie przełączniki"]
-    )
-    async_register(
-        hass,
-        INTENT_SWITCHES_OFF,
-        ["wyłącz przełączniki", "wyłącz wszystkie przełączniki"],
-    )
-    async_register(
-        hass,
-        INTENT_GET_TIME,
-        [
-            "która",
-            "która [jest] [teraz] godzina",
-            "którą mamy godzinę",
-            "jaki [jest] czas",
-            "[jaka] [jest] godzina",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_GET_DATE,
-        [
-            "[jaka] [jest] data",
-            "jaki [mamy] [jest] [dzisiaj] dzień",
-            "co dzisiaj jest",
-            "co [mamy] [jest] dzisiaj",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_PLAY_RADIO,
-        [
-            "Włącz radio",
-            "Radio {item}",
-            "Włącz radio {item}",
-            "Graj radio {item}",
-            "Graj {item} radio",
-            "Posłuchał bym radio {item}",
-            "Włącz stację radiową {item}",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_PLAY_PODCAST,
-        [
-            "Podcast {item}",
-            "Włącz podcast {item}",
-            "Graj podcast {item}",
-            "Graj {item} podcast",
-            "Posłuchał bym podcast {item}",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_PLAY_YT_MUSIC,
-        [
-            "Muzyka {item}",
-            "Włącz muzykę {item}",
-            "Graj muzykę {item}",
-            "Graj {item} muzykę",
-            "Posłuchał bym muzykę {item}",
-            "Włącz [z] [na] YouTube {item}",
-            "YouTube {item}",
-        ],
-    )
-    async_register(hass, INTENT_PLAY_SPOTIFY, ["Spotify {item}"])
-    async_register(hass, INTENT_TURN_ON, ["Włącz {item}", "Zapal światło w {item}"])
-    async_register(hass, INTENT_TURN_OFF, ["Wyłącz {item}", "Zgaś Światło w {item}"])
-    async_register(hass, INTENT_TOGGLE, ["Przełącz {item}"])
-    async_register(
-        hass,
-        INTENT_STATUS,
-        [
-            "Jaka jest {item}",
-            "Jaki jest {item}",
-            "Jak jest {item}",
-            "Jakie jest {item}",
-            "[jaki] [ma] status {item}",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_ASK_QUESTION,
-        [
-            "Co to jest {item}",
-            "Kto to jest {item}",
-            "Znajdź informację o {item}",
-            "Znajdź informacje o {item}",
-            "Wyszukaj informację o {item}",
-            "Wyszukaj informacje o {item}",
-            "Wyszukaj {item}",
-            "Kim jest {item}",
-            "Informacje o {item}",
-            "Czym jest {item}",
-            "Opowiedz mi o {intem}",
-            "Informację na temat {item}",
-            "Co wiesz o {item}",
-            "Co wiesz na temat {item}",
-            "Opowiedz o {item}",
-            "Kim są {item}",
-            "Kto to {item}",
-        ],
-    )
-    async_register(hass, INTENT_SPELL_STATUS, ["Przeliteruj {item}", "Literuj {item}"])
-    async_register(
-        hass,
-        INTENT_ASKWIKI_QUESTION,
-        ["Wikipedia {item}", "wiki {item}", "encyklopedia {item}"],
-    )
-    async_register(hass, INTENT_OPEN_COVER, ["Otwórz {item}", "Odsłoń {item}"])
-    async_register(hass, INTENT_CLOSE_COVER, ["Zamknij {item}", "Zasłoń {item}"])
-    async_register(
-        hass, INTENT_STOP, ["Stop", "Zatrzymaj", "Koniec", "Pauza", "Zaniechaj", "Stój"]
-    )
-    async_register(hass, INTENT_PLAY, ["Start", "Graj", "Odtwarzaj"])
-    async_register(hass, INTENT_SCENE, ["Scena {item}", "Aktywuj [scenę] {item}"])
-    async_register(
-        hass, INTENT_RUN_AUTOMATION, ["Uruchom {item}", "Automatyzacja {item}"]
-    )
-    async_register(hass, INTENT_ASK_GOOGLE, ["Google {item}"])
-    async_register(
-        hass, INTENT_PERSON_STATUS, ["Gdzie jest {item}", "Lokalizacja {item}"]
-    )
-    async_register(
-        hass,
-        INTENT_NEXT,
-        ["[włącz] następny", "[włącz] kolejny", "[graj] następny", "[graj] kolejny"],
-    )
-    async_register(
-        hass,
-        INTENT_PREV,
-        [
-            "[włącz] poprzedni",
-            "[włącz] wcześniejszy",
-            "[graj] poprzedni",
-            "[graj] wcześniejszy",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_SAY_IT,
-        ["Powiedz", "Mów", "Powiedz {item}", "Mów {item}", "Echo {item}"],
-    )
+    for intent_type, utterances in INTENT_UTTERANCES.items():
+        async_register(hass, intent_type, utterances)
 
     # initial status of the player
     hass.states.async_set("sensor.ais_player_mode", "ais_favorites")
@@ -3103,10 +2968,26 @@ async def async_setup(hass, config):
     return True
 
 
+@core.callback
+def _async_get_frame_client(hass):
+    """Return the client sending the commands to the frames."""
+    frame_client = hass.data.get(DATA_FRAME_CLIENT)
+    if frame_client is None:
+        frame_client = hass.data[DATA_FRAME_CLIENT] = AisFrameClient(hass)
+    return frame_client
+
+
+@core.callback
+def _async_get_tts_client(hass):
+    """Return the client sending the text to speech to the speakers."""
+    tts_client = hass.data.get(DATA_TTS_CLIENT)
+    if tts_client is None:
+        tts_client = hass.data[DATA_TTS_CLIENT] = AisTtsClient(hass)
+    return tts_client
+
+
 async def _publish_command_to_frame(hass, key, val, ip):
     # sent the command to the android frame via http
-    url = ais_global.G_HTTP_REST_SERVICE_BASE_URL.format(ip)
-
     if key == "WifiConnectToSid":
         ssid = val.split(";")[0]
         if ssid is None or ssid == "-" or ssid == "":
@@ -3181,10 +3062,7 @@ async def _publish_command_to_frame(hass, key, val, ip):
         }
     else:
         requests_json = {key: val, "ip": ip}
-    try:
-        requests.post(url + "/command", json=requests_json, timeout=2)
-    except Exception as e:
-        pass
+    _async_get_frame_client(hass).async_send_command(ip, key, requests_json)
 
 
 def _wifi_rssi_to_info(rssi):
@@ -3571,39 +3449,33 @@ def _post_message(
         else:
             tts_browser_text = tts_browser_text[0:250]
 
-    hass.async_add_job(
-        hass.services.async_call(
-            "ais_ai_service", "say_in_browser", {"text": tts_browser_text}
-        )
+    # called from the executor as well, the calls are passed to the loop
+    hass.add_job(
+        hass.services.async_call,
+        "ais_ai_service",
+        "say_in_browser",
+        {"text": tts_browser_text},
     )
-    try:
-        requests.post(
-            ais_global.G_HTTP_REST_SERVICE_BASE_URL.format("127.0.0.1")
-            + "/text_to_speech",
-            json=j_data,
-            timeout=1,
-        )
-    except Exception as e:
-        pass
-    # do the same for speakers in the group
+    # do the same for speakers in the group, all at once
+    ips = ["127.0.0.1"]
     for s in ais_global.G_SPEAKERS_GROUP_LIST:
         if s != "media_player.wbudowany_glosnik":
-            attr = hass.states.get(s).attributes
+            state = hass.states.get(s)
+            if state is None:
+                continue
+            attr = state.attributes
             if "unique_id" in attr and attr["unique_id"] not in (
                 str(exclude_say_it),
                 "1111111111111111111",
             ):
-                try:
-                    requests.post(
-                        ais_global.G_HTTP_REST_SERVICE_BASE_URL.format(
-                            attr["device_ip"]
-                        )
-                        + "/text_to_speech",
-                        json=j_data,
-                        timeout=1,
-                    )
-                except Exception:
-                    pass
+                ips.append(attr["device_ip"])
+    hass.add_job(_async_say, hass, ips, j_data)
+
+
+@core.callback
+def _async_say(hass, ips, tts_data):
+    """Send the text to speech to the speakers."""
+    _async_get_tts_client(hass).async_say(ips, tts_data)
 
 
 def _beep_it(hass, tone):
@@ -3863,26 +3735,17 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
             return response
 
     # check the AIS dom intents
-    intents = hass.data.get(DOMAIN, {})
+    intent_index = _async_get_intent_index(hass)
     try:
-        for intent_type, matchers in intents.items():
-            if found_intent is not None:
-                break
-            for matcher in matchers:
-                match = matcher.match(text)
-                if match:
-                    # we have a match
-                    found_intent = intent_type
-                    m, s = await hass.helpers.intent.async_handle(
-                        DOMAIN,
-                        intent_type,
-                        {
-                            key: {"value": value}
-                            for key, value in match.groupdict().items()
-                        },
-                        text,
-                    )
-                    break
+        found_intent, match = intent_index.match(text)
+        if match:
+            # we have a match
+            m, s = await hass.helpers.intent.async_handle(
+                DOMAIN,
+                found_intent,
+                {key: {"value": value} for key, value in match.groupdict().items()},
+                text,
+            )
         # the item was match as INTENT_TURN_ON but we don't have such device - maybe it is radio or podcast???
         if s is False and found_intent == INTENT_TURN_ON:
             m_org = m
@@ -3930,8 +3793,8 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
                 if suffix == "youtube" and text != "":
                     # in case of youtube we need to ask cloud first
                     m = "Nie rozumiem " + text
-                    ws_resp = aisCloudWS.ask(text, m)
-                    m = ws_resp.text.split("---")[0]
+                    answer = await aisCloudWS.async_ask(text, m)
+                    m = answer.split("---")[0]
                     if m != "Nie rozumiem " + text:
                         s = True
                         found_intent = "YT"
@@ -3940,28 +3803,22 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
         if found_intent is None and hot_word_on is False:
             suffix = get_context_suffix(hass)
             if suffix is not None:
-                for intent_type, matchers in intents.items():
-                    if found_intent is not None:
-                        break
-                    for matcher in matchers:
-                        match = matcher.match(suffix + " " + text)
-                        if match:
-                            # we have a match
-                            found_intent = intent_type
-                            m, s = await hass.helpers.intent.async_handle(
-                                DOMAIN,
-                                intent_type,
-                                {
-                                    key: {"value": value}
-                                    for key, value in match.groupdict().items()
-                                },
-                                suffix + " " + text,
-                            )
-                            # reset the curr button code
-                            # TODO the mic should send a button code too
-                            # in this case we will know if the call source
-                            CURR_BUTTON_CODE = 0
-                            break
+                found_intent, match = intent_index.match(suffix + " " + text)
+                if match:
+                    # we have a match
+                    m, s = await hass.helpers.intent.async_handle(
+                        DOMAIN,
+                        found_intent,
+                        {
+                            key: {"value": value}
+                            for key, value in match.groupdict().items()
+                        },
+                        suffix + " " + text,
+                    )
+                    # reset the curr button code
+                    # TODO the mic should send a button code too
+                    # in this case we will know if the call source
+                    CURR_BUTTON_CODE = 0
 
         # the was no match - try again but with player context
         # we should get media player source first
@@ -3985,32 +3842,28 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
                         if suffix == "youtube" and text != "":
                             # in case of youtube we need to ask cloud first
                             m = "Nie rozumiem " + text
-                            ws_resp = aisCloudWS.ask(text, m)
-                            m = ws_resp.text.split("---")[0]
+                            answer = await aisCloudWS.async_ask(text, m)
+                            m = answer.split("---")[0]
                             if not m.startswith("Nie rozumiem "):
                                 s = True
                                 found_intent = "YT"
                         if s is not True:
-                            for intent_type, matchers in intents.items():
-                                if found_intent is not None:
-                                    break
-                                for matcher in matchers:
-                                    match = matcher.match(suffix + " " + text)
-                                    if match:
-                                        # we have a match
-                                        found_intent = intent_type
-                                        (m, s) = await hass.helpers.intent.async_handle(
-                                            DOMAIN,
-                                            intent_type,
-                                            {
-                                                key: {"value": value}
-                                                for key, value in match.groupdict().items()
-                                            },
-                                            suffix + " " + text,
-                                        )
-                                        # reset the curr button code
-                                        CURR_BUTTON_CODE = 0
-                                        break
+                            found_intent, match = intent_index.match(
+                                suffix + " " + text
+                            )
+                            if match:
+                                # we have a match
+                                (m, s) = await hass.helpers.intent.async_handle(
+                                    DOMAIN,
+                                    found_intent,
+                                    {
+                                        key: {"value": value}
+                                        for key, value in match.groupdict().items()
+                                    },
+                                    suffix + " " + text,
+                                )
+                                # reset the curr button code
+                                CURR_BUTTON_CODE = 0
         if s is False or found_intent is None:
             # no success - try to ask the cloud
             if m is None:
@@ -4018,8 +3871,8 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
                 m = "Nie rozumiem " + text
             # asking without the suffix
             if text != "":
-                ws_resp = aisCloudWS.ask(text, m)
-                m = ws_resp.text.split("---")[0]
+                answer = await aisCloudWS.async_ask(text, m)
+                m = answer.split("---")[0]
             else:
                 m = "Co proszę? Nic nie słyszę!"
 
@@ -4039,23 +3892,21 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
     return intent_resp
 
 
+@core.callback
+def _async_get_entity_index(hass):
+    """Return the index of the entity names, build it if needed."""
+    entity_index = hass.data.get(DATA_ENTITY_INDEX)
+    if entity_index is None:
+        entity_index = hass.data[DATA_ENTITY_INDEX] = EntityNameIndex(hass)
+        entity_index.async_start()
+    return entity_index
+
+
 @core.callback
 def _match_entity(hass, name, domain=None):
     """Match a name to an entity."""
-    from fuzzywuzzy import process as fuzzy_extract
-
-    if domain is not None:
-        # entities = hass.states.async_entity_ids(domain)
-        entities = {
-            state.entity_id: state.name
-            for state in hass.states.async_all()
-            if state.entity_id.startswith(domain)
-        }
-    else:
-        entities = {state.entity_id: state.name for state in hass.states.async_all()}
-
     try:
-        entity_id = fuzzy_extract.extractOne(name, entities, score_cutoff=86)[2]
+        entity_id = _async_get_entity_index(hass).async_match(name, domain)
     except Exception as e:
         entity_id = None
 
@@ -4257,10 +4108,9 @@ class PlayRadioIntent(intent.IntentHandler):
         if station is None:
             message = "Powiedz jaką stację mam włączyć"
         else:
-            ws_resp = aisCloudWS.audio(
+            json_ws_resp = await aisCloudWS.async_audio(
                 station, ais_global.G_AN_RADIO, intent_obj.text_input
             )
-            json_ws_resp = ws_resp.json()
             json_ws_resp["media_source"] = ais_global.G_AN_RADIO
             name = json_ws_resp["name"]
             if len(name.replace(" ", "")) == 0:
@@ -4288,10 +4138,9 @@ class AisPlayPodcastIntent(intent.IntentHandler):
         if not item:
             message = "Nie wiem jaką audycję chcesz posłuchać."
         else:
-            ws_resp = aisCloudWS.audio(
+            json_ws_resp = await aisCloudWS.async_audio(
                 item, ais_global.G_AN_PODCAST, intent_obj.text_input
             )
-            json_ws_resp = ws_resp.json()
             json_ws_resp["media_source"] = ais_global.G_AN_PODCAST
             name = json_ws_resp["name"]
             if len(name.replace(" ", "")) == 0:
@@ -4366,6 +4215,35 @@ class AisPlaySpotifyIntent(intent.IntentHandler):
         return message, success
 
 
+class AisPlayLocalMediaIntent(intent.IntentHandler):
+    """Handle the intents playing the media from the local and USB drives."""
+
+    intent_type = INTENT_PLAY_LOCAL_MEDIA
+    slot_schema = {"item": cv.string}
+
+    async def async_handle(self, intent_obj):
+        """Handle the intent."""
+        hass = intent_obj.hass
+        slots = self.async_validate_slots(intent_obj.slots)
+        item = slots["item"]["value"]
+        success = False
+        if ais_drives_service.DOMAIN not in hass.data:
+            return "Dyski nie są jeszcze gotowe, spróbuj za chwilę", False
+
+        if not item:
+            message = "Nie wiem czego mam szukać na dyskach"
+        else:
+            track = await hass.async_add_executor_job(
+                hass.data[ais_drives_service.DOMAIN].play_search, item
+            )
+            if track is None:
+                message = "Nie znalazłem na dyskach " + item
+            else:
+                message = "OK, odtwarzam z dysku " + (track["title"] or track["name"])
+                success = True
+        return message, success
+
+
 class AskQuestionIntent(intent.IntentHandler):
     """Handle AskQuestion intents."""
 
@@ -4499,8 +4377,10 @@ class AisGetWeather(intent.IntentHandler):
             )
             command = "pogoda w miejscowości " + address
             # ask AIS
-            ws_resp = aisCloudWS.ask(command, "niestety nie wiem jaka jest pogoda")
-            answer = ws_resp.text.split("---")[0]
+            answer = await aisCloudWS.async_ask(
+                command, "niestety nie wiem jaka jest pogoda"
+            )
+            answer = answer.split("---")[0]
         except Exception as e:
             _LOGGER.warning(
                 "Handle the intent problem for location " + address + " " + str(e)
@@ -4538,8 +4418,8 @@ class AisGetWeather48(intent.IntentHandler):
                 location.address.split(",")[0] + " " + location.address.split(",")[1]
             )
             command = "jaka będzie pogoda jutro w miejscowości " + address
-            ws_resp = aisCloudWS.ask(command, answer)
-            answer = ws_resp.text.split("---")[0]
+            answer = await aisCloudWS.async_ask(command, answer)
+            answer = answer.split("---")[0]
         except Exception as e:
             _LOGGER.warning(
                 "Handle the intent problem for location " + address + " " + str(e)
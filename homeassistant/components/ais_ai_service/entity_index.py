@@ -0,0 +1,169 @@
+"""Index of the entity names for the AIS dom intents."""
+from collections import Counter
+import re
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import callback
+
+# the score below which the fuzzy match is not accepted
+SCORE_CUTOFF = 86
+# part of the text trigrams which the entity name has to contain
+MIN_TRIGRAMS_SHARE = 0.5
+# the text length up to which only the same name scores 100
+MAX_SAME_NAME_LENGTH = 100
+# the texts of shorter words match inside the words, all the names are scored
+MIN_INDEXED_WORD_LENGTH = 3
+
+POLISH_CHARS = str.maketrans("ąćęłńóśźż", "acelnoszz")
+NON_WORD_CHARS = re.compile(r"\W+")
+
+
+def _fold(text):
+    """Return the text in lower case and without the Polish diacritics."""
+    return NON_WORD_CHARS.sub(" ", text.lower().translate(POLISH_CHARS)).strip()
+
+
+def _trigrams(text):
+    """Return the trigrams of the words in the text."""
+    trigrams = set()
+    for word in _fold(text).split():
+        word = f" {word} "
+        trigrams.update(word[idx : idx + 3] for idx in range(len(word) - 2))
+    return trigrams
+
+
+def _process(text):
+    """Process the text the same way as fuzzywuzzy.process.extractOne does."""
+    from fuzzywuzzy import utils  # pylint: disable=import-outside-toplevel
+
+    return utils.full_process(utils.full_process(text), force_ascii=True)
+
+
+class EntityNameIndex:
+    """Trigram index of the entity names.
+
+    Only the names sharing a word or enough trigrams with the text are
+    scored with the same scorer as fuzzywuzzy.process.extractOne, instead
+    of scoring all the entities on each call. A shared word alone can give
+    the name a score above the cutoff. The texts with no word as long as
+    a trigram are scored against all the names. The index follows the state changes.
+    """
+
+    def __init__(self, hass):
+        """Initialize the index."""
+        self.hass = hass
+        self._entities = {}
+        self._postings = {}
+        self._words = {}
+        self._names = {}
+        self._sequence = 0
+
+    @callback
+    def async_start(self):
+        """Index the current states and follow the state changes."""
+        for state in self.hass.states.async_all():
+            self._async_add(state.entity_id, state.name)
+        self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed)
+
+    @callback
+    def _async_state_changed(self, event):
+        """Update the index after the entity was added, renamed or removed."""
+        entity_id = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            self._async_remove(entity_id)
+            return
+        entry = self._entities.get(entity_id)
+        if entry is None or entry[1] != new_state.name:
+            self._async_add(entity_id, new_state.name)
+
+    @callback
+    def _async_add(self, entity_id, name):
+        """Add the entity to the index or update its name."""
+        entry = self._entities.get(entity_id)
+        if entry is None:
+            self._sequence += 1
+            sequence = self._sequence
+        else:
+            # renamed entity keeps its position, like in the state machine
+            sequence = entry[0]
+            self._async_remove(entity_id)
+        trigrams = _trigrams(name)
+        processed_name = _process(name)
+        self._entities[entity_id] = (sequence, name, processed_name, trigrams)
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, set()).add(entity_id)
+        for word in set(processed_name.split()):
+            self._words.setdefault(word, set()).add(entity_id)
+        self._names.setdefault(processed_name, set()).add(entity_id)
+
+    @callback
+    def _async_remove(self, entity_id):
+        """Remove the entity from the index."""
+        entry = self._entities.pop(entity_id, None)
+        if entry is None:
+            return
+        for trigram in entry[3]:
+            entity_ids = self._postings[trigram]
+            entity_ids.discard(entity_id)
+            if not entity_ids:
+                del self._postings[trigram]
+        for word in set(entry[2].split()):
+            entity_ids = self._words[word]
+            entity_ids.discard(entity_id)
+            if not entity_ids:
+                del self._words[word]
+        entity_ids = self._names[entry[2]]
+        entity_ids.discard(entity_id)
+        if not entity_ids:
+            del self._names[entry[2]]
+
+    @callback
+    def async_match(self, text, domain=None):
+        """Return the id of the entity with the best matching name."""
+        from fuzzywuzzy import fuzz  # pylint: disable=import-outside-toplevel
+
+        trigrams = _trigrams(text)
+        processed_text = _process(text)
+        if not trigrams or not processed_text:
+            return None
+
+        # only the same name can get the score 100, longer texts
+        # which differ a little could be rounded up to 100 too
+        if len(processed_text) < MAX_SAME_NAME_LENGTH:
+            same_name = [
+                (self._entities[entity_id][0], entity_id)
+                for entity_id in self._names.get(processed_text, ())
+                if domain is None or entity_id.startswith(domain)
+            ]
+            if same_name:
+                return min(same_name)[1]
+
+        if max(map(len, processed_text.split())) < MIN_INDEXED_WORD_LENGTH:
+            candidates = self._entities
+        else:
+            shared = Counter()
+            for trigram in trigrams:
+                shared.update(self._postings.get(trigram, ()))
+            min_shared = max(1, int(len(trigrams) * MIN_TRIGRAMS_SHARE))
+            candidates = {
+                entity_id for entity_id, count in shared.items() if count >= min_shared
+            }
+            for word in set(processed_text.split()):
+                candidates.update(self._words.get(word, ()))
+
+        best = None
+        for entity_id in candidates:
+            if domain is not None and not entity_id.startswith(domain):
+                continue
+            sequence, _, processed_name, _ = self._entities[entity_id]
+            score = fuzz.WRatio(processed_text, processed_name, full_process=False)
+            if score < SCORE_CUTOFF:
+                continue
+            # on the same score the first entity wins, like in extractOne
+            if best is None or (score, -sequence) > (best[0], -best[1]):
+                best = (score, sequence, entity_id)
+
+        if best is None:
+            return None
+        return best[2]
@@ -0,0 +1,123 @@
+"""Client sending the commands to the AIS dom Android frames."""
+from collections import OrderedDict
+import itertools
+import logging
+import time
+
+import async_timeout
+
+import homeassistant.components.ais_dom.ais_global as ais_global
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMAND_TIMEOUT = 2
+MAX_QUEUED_COMMANDS = 50
+# the commands which set a value, only the last queued one needs to be sent
+COALESCED_KEYS = {
+    "setPlaybackSpeed",
+    "setPlayerShuffle",
+    "setTtsVoice",
+    "setVolume",
+    "skipTo",
+}
+
+
+class FrameQueue:
+    """Commands waiting to be sent to one frame."""
+
+    def __init__(self, ip):
+        """Initialize the queue."""
+        self.ip = ip
+        self.commands = OrderedDict()
+        self.sending = False
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.last_latency = None
+        self.total_latency = 0.0
+
+    @property
+    def metrics(self):
+        """Return the queue depth and the command latency of the frame."""
+        handled = self.sent + self.failed
+        return {
+            "queue_depth": len(self.commands),
+            "sent": self.sent,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "last_latency": self.last_latency,
+            "average_latency": self.total_latency / handled if handled else None,
+        }
+
+
+class AisFrameClient:
+    """Send the commands to the frames without blocking the event loop.
+
+    The commands to each frame are sent one by one, in the queued order,
+    over the shared aiohttp session which keeps the connections to the
+    frames alive. The value setting commands waiting in the queue are
+    dropped when a newer one with the same key is queued.
+    """
+
+    def __init__(self, hass):
+        """Initialize the client."""
+        self.hass = hass
+        self._queues = {}
+        self._sequence = itertools.count()
+
+    @property
+    def metrics(self):
+        """Return the metrics of each frame."""
+        return {ip: queue.metrics for ip, queue in self._queues.items()}
+
+    @callback
+    def async_send_command(self, ip, key, command):
+        """Queue the command to the frame."""
+        queue = self._queues.get(ip)
+        if queue is None:
+            queue = self._queues[ip] = FrameQueue(ip)
+
+        if key in COALESCED_KEYS and key in queue.commands:
+            # the newer value is sent after the commands queued before it
+            queued_at, _ = queue.commands.pop(key)
+            queue.commands[key] = (queued_at, command)
+            queue.coalesced += 1
+            return
+
+        if len(queue.commands) >= MAX_QUEUED_COMMANDS:
+            _, (_, dropped) = queue.commands.popitem(last=False)
+            queue.dropped += 1
+            _LOGGER.warning("Too many commands to %s, dropping %s", ip, dropped)
+
+        if key not in COALESCED_KEYS:
+            key = next(self._sequence)
+        queue.commands[key] = (time.monotonic(), command)
+
+        if not queue.sending:
+            queue.sending = True
+            self.hass.async_create_task(self._async_send_queued(queue))
+
+    async def _async_send_queued(self, queue):
+        """Send the queued commands to the frame."""
+        session = async_get_clientsession(self.hass)
+        url = ais_global.G_HTTP_REST_SERVICE_BASE_URL.format(queue.ip) + "/command"
+        try:
+            while queue.commands:
+                _, (queued_at, command) = queue.commands.popitem(last=False)
+                try:
+                    with async_timeout.timeout(COMMAND_TIMEOUT):
+                        async with session.post(url, json=command) as response:
+                            await response.read()
+                    queue.sent += 1
+                except Exception as err:  # pylint: disable=broad-except
+                    queue.failed += 1
+                    _LOGGER.debug("Can't send %s to %s: %s", command, queue.ip, err)
+                queue.last_latency = time.monotonic() - queued_at
+                queue.total_latency += queue.last_latency
+        finally:
+            queue.sending = False
+        _LOGGER.debug("Commands to %s: %s", queue.ip, queue.metrics)
@@ -0,0 +1,85 @@
+"""Index of the AIS dom intent matchers."""
+import re
+
+# characters that end the literal part of a matcher pattern
+REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+# characters that make the preceding character optional or repeated
+REGEX_QUANTIFIERS = frozenset("*+?{")
+# trie key for the matchers that end in the node
+MATCHERS_KEY = None
+
+
+def _fold(text):
+    """Fold the case of the text the same way as the re.I flag does."""
+    # re.I treats the dotless ı as i, casefold keeps them apart
+    return text.casefold().replace("ı", "i")
+
+
+def _literal_prefix(matcher):
+    """Return the literal text every match of the matcher starts with."""
+    pattern = matcher.pattern
+    if not isinstance(pattern, str) or matcher.flags & re.VERBOSE:
+        return ""
+    if not pattern.startswith("^"):
+        return ""
+    prefix = []
+    for char in pattern[1:]:
+        if char in REGEX_SPECIAL_CHARS:
+            if char in REGEX_QUANTIFIERS and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+    return _fold("".join(prefix))
+
+
+class IntentIndex:
+    """Narrow down the intent matchers that can match the text.
+
+    All the matchers are kept in one trie keyed by their literal prefix,
+    one walk over the text gives the candidates. The candidates are tried
+    in the registration order, so the first match is the same as when
+    trying all the matchers one by one.
+    """
+
+    def __init__(self, intents):
+        """Build the index from the intent type to matchers dict."""
+        self._matchers = []
+        self._without_prefix = []
+        self._trie = {}
+        for intent_type, matchers in intents.items():
+            for matcher in matchers:
+                position = len(self._matchers)
+                self._matchers.append((intent_type, matcher))
+                prefix = _literal_prefix(matcher)
+                if not prefix:
+                    self._without_prefix.append(position)
+                    continue
+                node = self._trie
+                for char in prefix:
+                    node = node.setdefault(char, {})
+                node.setdefault(MATCHERS_KEY, []).append(position)
+
+    def __len__(self):
+        """Return the number of the indexed matchers."""
+        return len(self._matchers)
+
+    def candidates(self, text):
+        """Return the positions of the matchers that can match the text."""
+        positions = list(self._without_prefix)
+        node = self._trie
+        for char in _fold(text):
+            node = node.get(char)
+            if node is None:
+                break
+            positions.extend(node.get(MATCHERS_KEY, ()))
+        positions.sort()
+        return positions
+
+    def match(self, text):
+        """Return the intent type and the match of the first matching matcher."""
+        for position in self.candidates(text):
+            intent_type, matcher = self._matchers[position]
+            match = matcher.match(text)
+            if match:
+                return intent_type, match
+        return None, None
@@ -0,0 +1,131 @@
+"""Model of the AIS dom remote menu."""
+import bisect
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import (
+    async_track_state_added_domain,
+    async_track_state_removed_domain,
+)
+
+# the menu groups listing the entities of the domain
+DOMAIN_GROUPS = {
+    "automation": "group.all_ais_automations",
+    "camera": "group.all_ais_cameras",
+    "climate": "group.all_ais_climates",
+    "cover": "group.all_ais_covers",
+    "fan": "group.all_ais_fans",
+    "light": "group.all_ais_lights",
+    "lock": "group.all_ais_locks",
+    "person": "group.all_ais_persons",
+    "scene": "group.all_ais_scenes",
+    "sensor": "group.all_ais_sensors",
+    "switch": "group.all_ais_switches",
+    "vacuum": "group.all_ais_vacuums",
+}
+GROUP_DOMAINS = {group: domain for domain, group in DOMAIN_GROUPS.items()}
+# the entities which are not listed in the menu groups
+EXCLUDED_ENTITIES = {"camera.remote_access", "switch.zigbee_tryb_parowania"}
+
+
+def _is_listed(state):
+    """Return if the entity is listed in the menu group of its domain."""
+    if state.entity_id in EXCLUDED_ENTITIES:
+        return False
+    if state.domain == "automation":
+        return not state.entity_id.startswith("automation.ais_")
+    if state.domain == "sensor":
+        return state.attributes.get("device_class") is not None
+    return True
+
+
+def _menu_group(state):
+    """Return the menu group of the group entity."""
+    return {
+        "friendly_name": state.attributes.get("friendly_name"),
+        "order": state.attributes.get("order"),
+        "entity_id": state.entity_id,
+        "entities": state.attributes.get("entity_id"),
+        "context_key_words": state.attributes.get("context_key_words"),
+        "context_answer": state.attributes.get("context_answer"),
+        "context_suffix": state.attributes.get("context_suffix"),
+        "remote_group_view": state.attributes.get("remote_group_view"),
+        "player_mode": state.attributes.get("player_mode", ""),
+    }
+
+
+class RemoteMenu:
+    """Groups of the remote menu.
+
+    The sorted entities of each domain are kept up to date when the
+    entities are added or removed, the menu update does not walk all the
+    states. The menu groups which did not change are kept as they are.
+    """
+
+    def __init__(self, hass):
+        """Initialize the menu."""
+        self.hass = hass
+        self.groups = []
+        self._members = {domain: [] for domain in DOMAIN_GROUPS}
+        self._changed_domains = set(DOMAIN_GROUPS)
+
+    @callback
+    def async_start(self):
+        """Add the current entities and follow the added and removed ones."""
+        for state in self.hass.states.async_all(DOMAIN_GROUPS):
+            self._async_add(state)
+        async_track_state_added_domain(
+            self.hass, DOMAIN_GROUPS, self._async_state_added
+        )
+        async_track_state_removed_domain(
+            self.hass, DOMAIN_GROUPS, self._async_state_removed
+        )
+
+    @callback
+    def _async_state_added(self, event):
+        """Add the new entity to its domain."""
+        self._async_add(event.data["new_state"])
+
+    @callback
+    def _async_add(self, state):
+        """Add the entity to its domain if it is listed."""
+        if not _is_listed(state):
+            return
+        members = self._members[state.domain]
+        idx = bisect.bisect_left(members, state.entity_id)
+        if idx < len(members) and members[idx] == state.entity_id:
+            return
+        members.insert(idx, state.entity_id)
+        self._changed_domains.add(state.domain)
+
+    @callback
+    def _async_state_removed(self, event):
+        """Remove the entity from its domain."""
+        state = event.data["old_state"]
+        members = self._members[state.domain]
+        idx = bisect.bisect_left(members, state.entity_id)
+        if idx < len(members) and members[idx] == state.entity_id:
+            del members[idx]
+            self._changed_domains.add(state.domain)
+
+    @callback
+    def async_update(self):
+        """Update the menu groups and return them sorted by the order."""
+        old_groups = {group["entity_id"]: group for group in self.groups}
+        groups = []
+        for state in self.hass.states.async_all("group"):
+            if state.attributes.get("remote_group_view") is None:
+                continue
+            group = _menu_group(state)
+            old_group = old_groups.get(state.entity_id)
+            domain = GROUP_DOMAINS.get(state.entity_id)
+            if domain is not None:
+                if old_group is None or domain in self._changed_domains:
+                    group["entities"] = list(self._members[domain])
+                else:
+                    group["entities"] = old_group["entities"]
+            if group == old_group:
+                group = old_group
+            groups.append(group)
+        self._changed_domains.clear()
+        self.groups = sorted(groups, key=lambda group: group["order"])
+        return self.groups
@@ -0,0 +1,169 @@
+"""Client sending the text to speech to the AIS dom speakers."""
+import asyncio
+import logging
+import time
+
+import async_timeout
+
+import homeassistant.components.ais_dom.ais_global as ais_global
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+_LOGGER = logging.getLogger(__name__)
+
+TTS_TIMEOUT = 1
+# after this many failures in a row the speaker is skipped for a while
+MAX_FAILURES = 3
+# how long the skipped speaker is not asked, doubled after each failed retry
+RETRY_INTERVAL = 30
+MAX_RETRY_INTERVAL = 600
+# weight of the last delivery in the average latency of the speaker
+LATENCY_WEIGHT = 0.3
+# the faster speakers are not held back longer than this
+MAX_ALIGN_DELAY = 0.5
+
+
+class SpeakerHealth:
+    """Delivery statistics and the circuit breaker of one speaker."""
+
+    def __init__(self, ip):
+        """Initialize the speaker."""
+        self.ip = ip
+        self.delivered = 0
+        self.failed = 0
+        self.skipped = 0
+        self.failures_in_row = 0
+        self.retry_at = None
+        self.retry_interval = RETRY_INTERVAL
+        self.last_latency = None
+        self.average_latency = None
+
+    @property
+    def available(self):
+        """Return True if the speaker should be asked now."""
+        return self.retry_at is None or time.monotonic() >= self.retry_at
+
+    @property
+    def metrics(self):
+        """Return the delivery statistics of the speaker."""
+        return {
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "circuit_open": not self.available,
+            "last_latency": self.last_latency,
+            "average_latency": self.average_latency,
+        }
+
+    def delivery_succeeded(self, latency):
+        """Record the delivery and close the circuit."""
+        self.delivered += 1
+        self.failures_in_row = 0
+        self.retry_at = None
+        self.retry_interval = RETRY_INTERVAL
+        self.last_latency = latency
+        if self.average_latency is None:
+            self.average_latency = latency
+        else:
+            self.average_latency += LATENCY_WEIGHT * (latency - self.average_latency)
+
+    def delivery_failed(self):
+        """Record the failure and open the circuit of a dead speaker."""
+        self.failed += 1
+        self.failures_in_row += 1
+        if self.retry_at is not None:
+            # the retry failed, wait longer before the next one
+            self.retry_interval = min(self.retry_interval * 2, MAX_RETRY_INTERVAL)
+        elif self.failures_in_row < MAX_FAILURES:
+            return
+        self.retry_at = time.monotonic() + self.retry_interval
+        _LOGGER.info(
+            "Speaker %s is not responding, next try in %s s",
+            self.ip,
+            self.retry_interval,
+        )
+
+
+class AisTtsClient:
+    """Send the text to speech to all the speakers at once.
+
+    The text is posted to the speakers concurrently over the shared aiohttp
+    session. The speakers that stopped responding are skipped until their
+    retry time, so a dead speaker does not delay the announcements. The
+    posts to the speakers which answer faster than the others are held back
+    by the difference of their average latencies, so the speakers start
+    talking at roughly the same moment.
+    """
+
+    def __init__(self, hass):
+        """Initialize the client."""
+        self.hass = hass
+        self._speakers = {}
+
+    @property
+    def metrics(self):
+        """Return the delivery statistics of each speaker."""
+        return {ip: speaker.metrics for ip, speaker in self._speakers.items()}
+
+    @callback
+    def async_say(self, ips, tts_data):
+        """Send the text to speech to the speakers in the background."""
+        self.hass.async_create_task(self.async_say_now(ips, tts_data))
+
+    async def async_say_now(self, ips, tts_data):
+        """Send the text to speech to the speakers, return the latencies."""
+        speakers = []
+        for ip in ips:
+            speaker = self._speakers.get(ip)
+            if speaker is None:
+                speaker = self._speakers[ip] = SpeakerHealth(ip)
+            if speaker.available:
+                speakers.append(speaker)
+            else:
+                speaker.skipped += 1
+
+        latencies = [
+            speaker.average_latency
+            for speaker in speakers
+            if speaker.average_latency is not None
+        ]
+        slowest = max(latencies, default=0)
+        results = await asyncio.gather(
+            *(
+                self._async_post(speaker, tts_data, self._align_delay(speaker, slowest))
+                for speaker in speakers
+            )
+        )
+        _LOGGER.debug("Text to speech delivered: %s", results)
+        return dict(zip((speaker.ip for speaker in speakers), results))
+
+    @staticmethod
+    def _align_delay(speaker, slowest):
+        """Return how long to hold back the post to the speaker."""
+        if speaker.average_latency is None:
+            return 0
+        return min(slowest - speaker.average_latency, MAX_ALIGN_DELAY)
+
+    async def _async_post(self, speaker, tts_data, delay):
+        """Post the text to speech to the speaker, return the latency."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        session = async_get_clientsession(self.hass)
+        url = (
+            ais_global.G_HTTP_REST_SERVICE_BASE_URL.format(speaker.ip)
+            + "/text_to_speech"
+        )
+        start = time.monotonic()
+        try:
+            with async_timeout.timeout(TTS_TIMEOUT):
+                async with session.post(url, json=tts_data) as response:
+                    await response.read()
+        except Exception as err:  # pylint: disable=broad-except
+            speaker.delivery_failed()
+            _LOGGER.debug("Can't send the text to speech to %s: %s", speaker.ip, err)
+            return None
+
+        latency = time.monotonic() - start
+        speaker.delivery_succeeded(latency)
+        return latency
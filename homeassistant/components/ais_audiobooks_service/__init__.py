@@ -14,12 +14,25 @@ import requests
 
 from homeassistant.components.ais_dom import ais_global
 
+from .catalogue import AudioBooksCatalogue
+
 DOMAIN = "ais_audiobooks_service"
+DATA_CATALOGUE = "ais_audiobooks_catalogue"
 PERSISTENCE_AUDIOBOOKS = "/.dom/audiobboks.json"
 _LOGGER = logging.getLogger(__name__)
 AUDIOBOOKS_WS_URL = "https://wolnelektury.pl/api/audiobooks/?format=json"
 
 
+def get_catalogue(hass):
+    """Return the catalogue of the audiobooks list file."""
+    catalogue = hass.data.get(DATA_CATALOGUE)
+    if catalogue is None:
+        catalogue = hass.data[DATA_CATALOGUE] = AudioBooksCatalogue(
+            hass.config.path() + PERSISTENCE_AUDIOBOOKS
+        )
+    return catalogue
+
+
 @asyncio.coroutine
 def async_setup(hass, config):
     """Register the service."""
@@ -60,21 +73,15 @@ class AudioBooksData:
     def __init__(self, hass, config):
         """Initialize the books authors."""
         self.hass = hass
-        self.all_books = []
+        self.catalogue = get_catalogue(hass)
 
     def get_authors(self, call):
         """Load books authors list"""
-        path = self.hass.config.path() + PERSISTENCE_AUDIOBOOKS
-        if not os.path.isfile(path):
+        if not os.path.isfile(self.catalogue.path):
             return
 
-        with open(path) as file:
-            self.all_books = json.loads(file.read())
-
-        authors = [ais_global.G_FAVORITE_OPTION]
-        for item in self.all_books:
-            if item["author"] not in authors:
-                authors.append(item["author"])
+        self.catalogue.load()
+        authors = [ais_global.G_FAVORITE_OPTION] + self.catalogue.authors
         self.hass.services.call(
             "input_select",
             "set_options",
@@ -93,26 +100,26 @@ class AudioBooksData:
             self.hass.states.async_set("sensor.audiobookschapterslist", -1, {})
             return
 
+        self.catalogue.load()
         list_info = {}
         list_idx = 0
-        for item in self.all_books:
-            if item["author"] == call.data["author"]:
-                list_info[list_idx] = {}
-                try:
-                    list_info[list_idx]["thumbnail"] = (
-                        "https://wolnelektury.pl/media/" + item["cover_thumb"]
-                    )
-                except Exception:
-                    list_info[list_idx]["thumbnail"] = item["simple_thumb"]
-                list_info[list_idx]["title"] = item["title"]
-                list_info[list_idx]["name"] = item["title"]
-                list_info[list_idx]["uri"] = item["url"]
-                list_info[list_idx]["media_source"] = ais_global.G_AN_AUDIOBOOK
-                list_info[list_idx]["audio_type"] = ais_global.G_AN_AUDIOBOOK
-                list_info[list_idx]["icon"] = "mdi:book-play"
-                list_info[list_idx]["lookup_url"] = item["href"]
-                list_info[list_idx]["lookup_name"] = item["title"]
-                list_idx = list_idx + 1
+        for item in self.catalogue.books(call.data["author"]):
+            list_info[list_idx] = {}
+            try:
+                list_info[list_idx]["thumbnail"] = (
+                    "https://wolnelektury.pl/media/" + item["cover_thumb"]
+                )
+            except Exception:
+                list_info[list_idx]["thumbnail"] = item["simple_thumb"]
+            list_info[list_idx]["title"] = item["title"]
+            list_info[list_idx]["name"] = item["title"]
+            list_info[list_idx]["uri"] = item["url"]
+            list_info[list_idx]["media_source"] = ais_global.G_AN_AUDIOBOOK
+            list_info[list_idx]["audio_type"] = ais_global.G_AN_AUDIOBOOK
+            list_info[list_idx]["icon"] = "mdi:book-play"
+            list_info[list_idx]["lookup_url"] = item["href"]
+            list_info[list_idx]["lookup_name"] = item["title"]
+            list_idx = list_idx + 1
 
         self.hass.states.async_set("sensor.audiobookslist", -1, list_info)
         import homeassistant.components.ais_ai_service as ais_ai
@@ -247,4 +254,6 @@ class AudioBooksData:
                 except Exception as e:
                     _LOGGER.warning("Can't load books list: " + str(e))
 
+            self.catalogue.load()
+
         yield from self.hass.async_add_job(load)
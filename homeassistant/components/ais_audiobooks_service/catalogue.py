@@ -0,0 +1,68 @@
+"""Catalogue of the audiobooks from wolnelektury.pl."""
+import json
+import logging
+import os
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _sort_key(text):
+    """Return the key sorting the text without the letter case."""
+    return text.casefold()
+
+
+class AudioBooksCatalogue:
+    """In-memory catalogue of the audiobooks list file.
+
+    The file is parsed once and again only after its modification time
+    changes. The books are indexed by the author, the authors are kept
+    sorted.
+    """
+
+    def __init__(self, path):
+        """Initialize the catalogue."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._authors = []
+        self._books_by_author = {}
+
+    @property
+    def authors(self):
+        """Return the sorted authors."""
+        return self._authors
+
+    def books(self, author):
+        """Return the books of the author."""
+        return self._books_by_author.get(author, [])
+
+    def load(self):
+        """Load the file if it was changed since the last load.
+
+        This method must be run in the executor.
+        """
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                mtime = None
+            if mtime == self._mtime:
+                return
+            all_books = []
+            if mtime is not None:
+                try:
+                    with open(self.path) as file:
+                        all_books = json.loads(file.read())
+                except ValueError as e:
+                    _LOGGER.error("Can't load books list: " + str(e))
+            self._index(all_books)
+            self._mtime = mtime
+
+    def _index(self, all_books):
+        """Build the indexes of the books."""
+        books_by_author = {}
+        for item in all_books:
+            books_by_author.setdefault(item["author"], []).append(item)
+        self._books_by_author = books_by_author
+        self._authors = sorted(books_by_author, key=_sort_key)
@@ -5,7 +5,7 @@ import uuid
 import json
 from homeassistant.core import callback
 from homeassistant.helpers import intent
-from homeassistant.util.json import load_json, save_json
+from homeassistant.helpers.storage import JournalStore, async_migrator
 import homeassistant.components.ais_dom.ais_global as ais_global
 
 DOMAIN = "ais_bookmarks"
@@ -17,6 +17,10 @@ INTENT_LAST_BOOKMARKS = "AisBookmarksLastBookmarks"
 INTENT_PLAY_LAST_BOOKMARK = "AisBookmarkPlayLastBookmark"
 PERSISTENCE_BOOKMARKS = ".dom/.ais_bookmarks.json"
 PERSISTENCE_FAVORITES = ".dom/.ais_favorites.json"
+STORAGE_VERSION = 1
+STORAGE_KEY_BOOKMARKS = f"{DOMAIN}.bookmarks"
+STORAGE_KEY_FAVORITES = f"{DOMAIN}.favorites"
+MAX_ITEMS = 50
 
 SERVICE_ADD_BOOKMARK = "add_bookmark"
 SERVICE_ADD_FAVORITE = "add_favorite"
@@ -323,8 +327,24 @@ class BookmarksData:
     def __init__(self, hass):
         """Initialize the bookmarks list."""
         self.hass = hass
-        self.bookmarks = []
-        self.favorites = []
+        self._stores = {
+            True: JournalStore(
+                hass, STORAGE_VERSION, STORAGE_KEY_BOOKMARKS, compact=True
+            ),
+            False: JournalStore(
+                hass, STORAGE_VERSION, STORAGE_KEY_FAVORITES, compact=True
+            ),
+        }
+
+    @property
+    def bookmarks(self):
+        """Return the bookmarks."""
+        return self._stores[True].items
+
+    @property
+    def favorites(self):
+        """Return the favorites."""
+        return self._stores[False].items
 
     @callback
     def async_add(self, call, bookmark):
@@ -425,8 +445,7 @@ class BookmarksData:
                 "media_content_id": media_content_id,
                 "media_stream_image": media_stream_image,
             }
-            self.bookmarks.append(item)
-            self.hass.async_add_job(self.save, True)
+            self._async_add_item(item, True)
             if voice_call:
                 self.hass.async_add_job(
                     self.hass.services.async_call(
@@ -478,8 +497,7 @@ class BookmarksData:
                 "media_content_id": media_content_id,
                 "media_stream_image": media_stream_image,
             }
-            self.favorites.append(item)
-            self.hass.async_add_job(self.save, False)
+            self._async_add_item(item, False)
             message = "Dobrze zapamiętam - dodaje {} {} do Twoich ulubionych".format(
                 audio_type_pl, name
             )
@@ -499,53 +517,50 @@ class BookmarksData:
             raise KeyError
 
         item.update(info)
-        self.hass.async_add_job(self.save)
+        self._stores[True].async_replace(self.bookmarks)
+        self._async_refresh(True)
         return item
 
     @callback
     def async_remove_bookmark(self, item_id, bookmark):
-        if bookmark:
-            """Reemove bookmark """
-            self.bookmarks = [itm for itm in self.bookmarks if not itm["id"] == item_id]
-            self.hass.async_add_job(self.save, True)
+        """Remove the bookmark or the favorite."""
+        store = self._stores[bookmark]
+        store.async_replace([itm for itm in store.items if not itm["id"] == item_id])
+        self._async_refresh(bookmark)
+
+    @callback
+    def _async_add_item(self, item, bookmark):
+        """Add the bookmark or the favorite, only the last ones are kept."""
+        store = self._stores[bookmark]
+        if len(store.items) < MAX_ITEMS:
+            # only the item is appended to the journal
+            store.async_append(item)
         else:
-            """Reemove favorites """
-            self.favorites = [itm for itm in self.favorites if not itm["id"] == item_id]
-            self.hass.async_add_job(self.save, False)
+            store.async_replace(store.items[1 - MAX_ITEMS :] + [item])
+        self._async_refresh(bookmark)
 
-    @asyncio.coroutine
-    def async_load(self):
-        """Load bookmarks."""
+    @callback
+    def _async_refresh(self, bookmark):
+        """Refresh the list of the bookmarks or of the favorites in the app."""
+        self.hass.async_create_task(
+            self.hass.services.async_call(
+                DOMAIN, SERVICE_GET_BOOKMARKS if bookmark else SERVICE_GET_FAVORITES
+            )
+        )
 
-        def load():
-            """Load the bookmarks synchronously."""
+    async def async_load(self):
+        """Load bookmarks, moving the old files to the storage."""
+        for bookmark, path in (
+            (True, PERSISTENCE_BOOKMARKS),
+            (False, PERSISTENCE_FAVORITES),
+        ):
             try:
-                self.bookmarks = load_json(
-                    self.hass.config.path(PERSISTENCE_BOOKMARKS), default=[]
-                )
-                self.favorites = load_json(
-                    self.hass.config.path(PERSISTENCE_FAVORITES), default=[]
+                await async_migrator(
+                    self.hass, self.hass.config.path(path), self._stores[bookmark]
                 )
             except Exception as e:
                 _LOGGER.error("Can't load bookmarks data: " + str(e))
 
-        yield from self.hass.async_add_job(load)
-
-    def save(self, bookmark):
-        """Save the bookmarks and favorites."""
-        if bookmark:
-            self.bookmarks = self.bookmarks[-50:]
-            save_json(self.hass.config.path(PERSISTENCE_BOOKMARKS), self.bookmarks)
-            self.hass.async_add_job(
-                self.hass.services.async_call(DOMAIN, SERVICE_GET_BOOKMARKS)
-            )
-        else:
-            self.favorites = self.favorites[-50:]
-            save_json(self.hass.config.path(PERSISTENCE_FAVORITES), self.favorites)
-            self.hass.async_add_job(
-                self.hass.services.async_call(DOMAIN, SERVICE_GET_FAVORITES)
-            )
-
 
 class AddFavoriteIntent(intent.IntentHandler):
     """Handle AddItem intents."""
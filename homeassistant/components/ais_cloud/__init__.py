@@ -1,8 +1,11 @@
 """Component to manage the AIS Cloud."""
+import asyncio
+from functools import partial
 import json
 import logging
 import os
 
+import aiohttp
 import async_timeout
 import requests
 import voluptuous as vol
@@ -14,16 +17,42 @@ from homeassistant.const import (
     CONF_IP_ADDRESS,
     CONF_NAME,
     EVENT_PLATFORM_DISCOVERED,
-    EVENT_STATE_CHANGED,
     STATE_UNAVAILABLE,
 )
+from homeassistant.core import callback
 from homeassistant.helpers import aiohttp_client
 from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.util import slugify
+from homeassistant.util.async_ import run_callback_threadsafe
+
+from .cloud_cache import CloudCache
 
 DOMAIN = "ais_cloud"
+DATA_CLOUD_CACHE = "ais_cloud_cache"
 _LOGGER = logging.getLogger(__name__)
 CLOUD_APP_URL = "https://powiedz.co/ords/f?p=100:1&x01=TOKEN:"
+CLOUD_WS_TIMEOUT = 5
+# the backups are big, only the pauses in the transfer are limited
+BACKUP_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=60)
+BACKUP_ENDPOINTS = {"ha": "backup", "zigbee": "backup_zigbee", "zwave": "backup_zwave"}
+BACKUP_CHUNK_SIZE = 64 * 1024
+# how long the cloud responses are fresh, in seconds
+AUDIO_TYPE_TTL = 12 * 3600
+AUDIO_NAME_TTL = 3600
+KEY_TTL = 600
+# the TTS voices of the assistant voice options
+TTS_VOICES = {
+    "Jola online": "pl-pl-x-oda-network",
+    "Jola lokalnie": "pl-pl-x-oda-local",
+    "Celina": "pl-pl-x-oda#female_1-local",
+    "Anżela": "pl-pl-x-oda#female_2-local",
+    "Asia": "pl-pl-x-oda#female_3-local",
+    "Sebastian": "pl-pl-x-oda#male_1-local",
+    "Bartek": "pl-pl-x-oda#male_2-local",
+    "Andrzej": "pl-pl-x-oda#male_3-local",
+}
+DEFAULT_TTS_VOICE = "pl-pl-x-oda-local"
 G_PLAYERS = []
 
 
@@ -205,82 +234,89 @@ async def async_setup(hass, config):
 
     hass.bus.async_listen(EVENT_PLATFORM_DISCOVERED, device_discovered)
 
-    def state_changed(state_event):
-        """ Called on state change """
-        if ais_global.G_AIS_START_IS_DONE is False:
-            return
+    async_track_assistant_settings(hass)
+    return True
 
-        entity_id = state_event.data.get("entity_id")
-        if entity_id == "input_select.assistant_voice":
-            # old_voice = state_event.data["old_state"].state
-            new_voice = state_event.data["new_state"].state
-            if new_voice == "Jola online":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda-network"
-            elif new_voice == "Jola lokalnie":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda-local"
-            elif new_voice == "Celina":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#female_1-local"
-            elif new_voice == "Anżela":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#female_2-local"
-            elif new_voice == "Asia":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#female_3-local"
-            elif new_voice == "Sebastian":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#male_1-local"
-            elif new_voice == "Bartek":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#male_2-local"
-            elif new_voice == "Andrzej":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#male_3-local"
-            else:
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda-local"
-            # publish to frame
-            if ais_global.G_AIS_START_IS_DONE:
-                hass.services.call("ais_ai_service", "say_it", {"text": new_voice})
-            hass.services.call(
+
+@callback
+def async_track_assistant_settings(hass):
+    """Follow the changes of the assistant settings entities."""
+
+    @callback
+    def assistant_voice_changed(new_state, old_state):
+        new_voice = new_state.state
+        ais_global.GLOBAL_TTS_VOICE = TTS_VOICES.get(new_voice, DEFAULT_TTS_VOICE)
+        # publish to frame
+        hass.async_create_task(
+            hass.services.async_call("ais_ai_service", "say_it", {"text": new_voice})
+        )
+        hass.async_create_task(
+            hass.services.async_call(
                 "ais_ai_service",
                 "publish_command_to_frame",
                 {"key": "setTtsVoice", "val": ais_global.GLOBAL_TTS_VOICE},
             )
-        elif entity_id == "input_number.assistant_rate":
-            try:
-                ais_global.GLOBAL_TTS_RATE = float(hass.states.get(entity_id).state)
-            except Exception:
-                ais_global.GLOBAL_TTS_RATE = 1
-        elif entity_id == "input_number.assistant_tone":
-            try:
-                ais_global.GLOBAL_TTS_PITCH = float(hass.states.get(entity_id).state)
-            except Exception:
-                ais_global.GLOBAL_TTS_PITCH = 1
-        elif entity_id == "input_select.ais_android_wifi_network":
-            # take the password for wifi if value changed
-            if state_event.data["old_state"] is not None:
-                _old_state = state_event.data["old_state"].state
-                _new_state = state_event.data["new_state"].state
-                if _old_state != _new_state:
-                    ssid = hass.states.get(
-                        "input_select.ais_android_wifi_network"
-                    ).state.split(";")[0]
-                    password = ais_global.get_pass_for_ssid(ssid)
-                    hass.services.call(
-                        "input_text",
-                        "set_value",
-                        {
-                            "value": password,
-                            "entity_id": "input_text.ais_iot_device_wifi_password",
-                        },
-                    )
-        elif entity_id in (
-            "input_boolean.ais_quiet_mode",
-            "input_datetime.ais_quiet_mode_start",
-            "input_datetime.ais_quiet_mode_stop",
-        ):
-            hass.async_add_job(
-                hass.services.async_call(
-                    "ais_ai_service", "check_night_mode", {"timer": False}
-                )
+        )
+
+    @callback
+    def assistant_rate_changed(new_state, old_state):
+        try:
+            ais_global.GLOBAL_TTS_RATE = float(new_state.state)
+        except ValueError:
+            ais_global.GLOBAL_TTS_RATE = 1
+
+    @callback
+    def assistant_tone_changed(new_state, old_state):
+        try:
+            ais_global.GLOBAL_TTS_PITCH = float(new_state.state)
+        except ValueError:
+            ais_global.GLOBAL_TTS_PITCH = 1
+
+    @callback
+    def wifi_network_changed(new_state, old_state):
+        # take the password for wifi if value changed
+        if old_state is None or old_state.state == new_state.state:
+            return
+        ssid = new_state.state.split(";")[0]
+        password = ais_global.get_pass_for_ssid(ssid)
+        hass.async_create_task(
+            hass.services.async_call(
+                "input_text",
+                "set_value",
+                {
+                    "value": password,
+                    "entity_id": "input_text.ais_iot_device_wifi_password",
+                },
             )
+        )
 
-    hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
-    return True
+    @callback
+    def quiet_mode_changed(new_state, old_state):
+        hass.async_create_task(
+            hass.services.async_call(
+                "ais_ai_service", "check_night_mode", {"timer": False}
+            )
+        )
+
+    handlers = {
+        "input_select.assistant_voice": assistant_voice_changed,
+        "input_number.assistant_rate": assistant_rate_changed,
+        "input_number.assistant_tone": assistant_tone_changed,
+        "input_select.ais_android_wifi_network": wifi_network_changed,
+        "input_boolean.ais_quiet_mode": quiet_mode_changed,
+        "input_datetime.ais_quiet_mode_start": quiet_mode_changed,
+        "input_datetime.ais_quiet_mode_stop": quiet_mode_changed,
+    }
+
+    @callback
+    def state_changed(event):
+        """ Called on state change of the settings entities """
+        new_state = event.data.get("new_state")
+        if ais_global.G_AIS_START_IS_DONE is False or new_state is None:
+            return
+        handlers[event.data["entity_id"]](new_state, event.data.get("old_state"))
+
+    return async_track_state_change_event(hass, list(handlers), state_changed)
 
 
 @websocket_api.websocket_command(
@@ -474,42 +510,38 @@ class AisCloudWS:
         self.cloud_ws_token = ais_global.get_sercure_android_id_dom()
         self.cloud_ws_header = {"Authorization": f"{self.cloud_ws_token}"}
         self.cache_key_path = "/data/data/pl.sviete.dom/files/home/AIS/.dom/"
+        self.cloud_cache = hass.data.get(DATA_CLOUD_CACHE)
+        if self.cloud_cache is None:
+            self.cloud_cache = hass.data[DATA_CLOUD_CACHE] = CloudCache(hass)
 
-    def gh_ais_add_device(self, oauth_json):
+    async def _async_post_json(self, url, payload, timeout=CLOUD_WS_TIMEOUT):
+        """Post the payload to the cloud endpoint, return the JSON response."""
+        web_session = aiohttp_client.async_get_clientsession(self.hass)
+        with async_timeout.timeout(timeout):
+            async with web_session.post(
+                url, json=payload, headers=self.cloud_ws_header
+            ) as ws_resp:
+                return await ws_resp.json(content_type=None)
+
+    async def async_gh_ais_add_device(self, oauth_json):
         payload = {
             "user": ais_global.get_sercure_android_id_dom(),
             "oauthJson": oauth_json,
         }
-        ws_resp = requests.post(
-            self.url_gh + "ais_add_device",
-            json=payload,
-            headers=self.cloud_ws_header,
-            timeout=5,
-        )
-        return ws_resp
+        return await self._async_post_json(self.url_gh + "ais_add_device", payload)
 
-    def gh_ais_add_token(self, oauth_code):
+    async def async_gh_ais_add_token(self, oauth_code):
         payload = {
             "user": ais_global.get_sercure_android_id_dom(),
             "oauthCode": oauth_code,
         }
-        ws_resp = requests.post(
-            self.url_gh + "ais_add_token",
-            json=payload,
-            headers=self.cloud_ws_header,
-            timeout=5,
-        )
-        return ws_resp
+        return await self._async_post_json(self.url_gh + "ais_add_token", payload)
 
-    def gh_ais_remove_integration(self):
+    async def async_gh_ais_remove_integration(self):
         payload = {"user": ais_global.get_sercure_android_id_dom()}
-        ws_resp = requests.post(
-            self.url_gh + "ais_remove_integration",
-            json=payload,
-            headers=self.cloud_ws_header,
-            timeout=5,
+        return await self._async_post_json(
+            self.url_gh + "ais_remove_integration", payload
         )
-        return ws_resp
 
     async def async_ask_json_gh(self, question, hass):
         web_session = aiohttp_client.async_get_clientsession(hass)
@@ -525,56 +557,79 @@ class AisCloudWS:
             )
             return await ws_resp.json()
 
-    def ask(self, question, org_answer):
+    async def _async_get_json(self, endpoint, params, timeout=CLOUD_WS_TIMEOUT):
+        """Get the JSON response of the cloud endpoint."""
+        web_session = aiohttp_client.async_get_clientsession(self.hass)
+        with async_timeout.timeout(timeout):
+            async with web_session.get(
+                self.url + endpoint, headers=self.cloud_ws_header, params=params
+            ) as ws_resp:
+                ws_resp.raise_for_status()
+                return await ws_resp.json(content_type=None)
+
+    async def async_ask(self, question, org_answer):
+        """Ask the cloud, return the text of the answer."""
+        web_session = aiohttp_client.async_get_clientsession(self.hass)
         payload = {"question": question, "org_answer": org_answer}
-        ws_resp = requests.get(
-            self.url + "ask", headers=self.cloud_ws_header, params=payload, timeout=5
-        )
-        return ws_resp
-
-    def audio_type(self, nature):
+        with async_timeout.timeout(CLOUD_WS_TIMEOUT):
+            async with web_session.get(
+                self.url + "ask", headers=self.cloud_ws_header, params=payload
+            ) as ws_resp:
+                return await ws_resp.text()
+
+    async def async_audio_type(self, nature):
+        """Return the audio types, from the local store when offline."""
         try:
-            rest_url = self.url + "audio_type?nature=" + nature
-            ws_resp = requests.get(rest_url, headers=self.cloud_ws_header, timeout=5)
-            return ws_resp
-        except:
-            _LOGGER.error("Can't connect to AIS WS!!! " + rest_url)
+            return await self.cloud_cache.async_get(
+                ("audio_type", nature),
+                partial(self._async_fetch_audio_type, nature),
+                AUDIO_TYPE_TTL,
+            )
+        except Exception as e:
+            _LOGGER.error("Can't connect to AIS WS!!! audio_type " + str(e))
             ais_global.G_OFFLINE_MODE = True
+        return await self.hass.async_add_executor_job(
+            AisCacheData(self.hass).audio_type, nature
+        )
 
-    def audio_name(self, nature, a_type):
-        rest_url = self.url + "audio_name?nature=" + nature
-        rest_url += "&type=" + a_type
-        ws_resp = requests.get(rest_url, headers=self.cloud_ws_header, timeout=5)
-        return ws_resp
+    async def _async_fetch_audio_type(self, nature):
+        json_resp = await self._async_get_json("audio_type", {"nature": nature})
+        if nature in (
+            ais_global.G_AN_RADIO,
+            ais_global.G_AN_PODCAST,
+            ais_global.G_AN_NEWS,
+        ):
+            await self.hass.async_add_executor_job(
+                AisCacheData(self.hass).store_audio_type, nature, json_resp
+            )
+        return json_resp
+
+    async def async_audio_name(self, nature, a_type):
+        return await self.cloud_cache.async_get(
+            ("audio_name", nature, a_type),
+            partial(
+                self._async_get_json, "audio_name", {"nature": nature, "type": a_type}
+            ),
+            AUDIO_NAME_TTL,
+        )
 
-    def audio(self, item, a_type, text_input):
-        rest_url = self.url + "audio?item=" + item + "&type="
-        rest_url += a_type + "&text_input=" + text_input
-        ws_resp = requests.get(rest_url, headers=self.cloud_ws_header, timeout=5)
-        return ws_resp
+    async def async_audio(self, item, a_type, text_input):
+        return await self._async_get_json(
+            "audio", {"item": item, "type": a_type, "text_input": text_input}
+        )
 
-    def key(self, service):
-        rest_url = self.url + "key?service=" + service
+    def _store_key(self, service, json_resp):
+        with open(self.cache_key_path + "." + service + ".json", "w") as outfile:
+            json.dump(json_resp, outfile)
+
+    def _load_key(self, service):
         try:
-            ws_resp = requests.get(rest_url, headers=self.cloud_ws_header, timeout=5)
-            # store in cache file
-            json_resp = ws_resp.json()
-            with open(self.cache_key_path + "." + service + ".json", "w") as outfile:
-                json.dump(json_resp, outfile)
-            return json_resp
+            with open(self.cache_key_path + "." + service + ".json") as file:
+                return json.loads(file.read())
         except Exception as e:
-            _LOGGER.warning("Couldn't fetch data for: " + service + " " + str(e))
-            try:
-                with open(self.cache_key_path + "." + service + ".json") as file:
-                    data = json.loads(file.read())
-                    return data
-            except Exception as e:
-                _LOGGER.error(
-                    "Couldn't fetch data from local store for : "
-                    + service
-                    + " "
-                    + str(e)
-                )
+            _LOGGER.error(
+                "Couldn't fetch data from local store for : " + service + " " + str(e)
+            )
 
     async def async_check_ais_media(self, name, source, current_url):
         web_session = aiohttp_client.async_get_clientsession(self.hass)
@@ -628,39 +683,26 @@ class AisCloudWS:
             return {"error": True, "message": str(e)}
 
     async def async_key(self, service):
-        web_session = aiohttp_client.async_get_clientsession(self.hass)
-        rest_url = self.url + "key?service=" + service
         try:
-            # during the system start lot of things is done 300 sec should be enough
-            with async_timeout.timeout(300):
-                ws_resp = await web_session.get(rest_url, headers=self.cloud_ws_header)
-                # store in cache file
-                json_resp = await ws_resp.json()
-                with open(
-                    self.cache_key_path + "." + service + ".json", "w"
-                ) as outfile:
-                    json.dump(json_resp, outfile)
-                return json_resp
-        except Exception as e:
+            return await self.cloud_cache.async_get(
+                ("key", service), partial(self._async_fetch_key, service), KEY_TTL
+            )
+        except Exception:
             _LOGGER.warning("Couldn't fetch online data for: " + service)
             # try to get from local store
-            try:
-                with open(self.cache_key_path + "." + service + ".json") as file:
-                    data = json.loads(file.read())
-                    return data
-            except Exception as e:
-                _LOGGER.error(
-                    "Couldn't fetch data from local store for : "
-                    + service
-                    + " "
-                    + str(e)
-                )
-            # import traceback
-            # traceback.print_exc()
+            return await self.hass.async_add_executor_job(self._load_key, service)
+
+    async def _async_fetch_key(self, service):
+        # during the system start lot of things is done 300 sec should be enough
+        json_resp = await self._async_get_json("key", {"service": service}, 300)
+        # store in cache file
+        await self.hass.async_add_executor_job(self._store_key, service, json_resp)
+        return json_resp
 
     async def async_new_key(self, service, old_key):
         web_session = aiohttp_client.async_get_clientsession(self.hass)
         rest_url = self.url + "new_key?service=" + service + "&old_key=" + old_key
+        self.cloud_cache.async_invalidate(("key", service))
         with async_timeout.timeout(10):
             ws_resp = await web_session.get(rest_url, headers=self.cloud_ws_header)
             return await ws_resp.json()
@@ -673,60 +715,60 @@ class AisCloudWS:
             ws_resp = await web_session.delete(rest_url, headers=self.cloud_ws_header)
             return await ws_resp.json()
 
-    def extract_media(self, url, local_extractor_version):
-        rest_url = (
-            self.url
-            + "extract_media?url="
-            + url
-            + "&extractor_version="
-            + local_extractor_version
+    async def async_extract_media(self, url, local_extractor_version):
+        return await self._async_get_json(
+            "extract_media",
+            {"url": url, "extractor_version": local_extractor_version},
+            10,
         )
-        ws_resp = requests.get(rest_url, headers=self.cloud_ws_header, timeout=10)
-        return ws_resp
 
-    def delete_key(self, service):
+    async def async_delete_key(self, service):
+        web_session = aiohttp_client.async_get_clientsession(self.hass)
         rest_url = self.url + "key?service=" + service
-        ws_resp = requests.delete(rest_url, headers=self.cloud_ws_header, timeout=5)
-        return ws_resp
-
-    def get_backup_info(self):
-        rest_url = self.url + "backup_info"
-        ws_resp = requests.get(rest_url, headers=self.cloud_ws_header, timeout=5)
-        return ws_resp
-
-    def post_backup(self, file, backup_type):
-        if backup_type == "ha":
-            rest_url = self.url + "backup"
-        elif backup_type == "zigbee":
-            rest_url = self.url + "backup_zigbee"
-        elif backup_type == "zwave":
-            rest_url = self.url + "backup_zwave"
-        with open(file, "rb") as payload:
-            ws_resp = requests.post(
-                rest_url, headers=self.cloud_ws_header, data=payload, timeout=60
-            )
-        return ws_resp
-
-    def download_backup(self, file, backup_type):
-        if backup_type == "ha":
-            rest_url = self.url + "backup"
-        elif backup_type == "zigbee":
-            rest_url = self.url + "backup_zigbee"
-        elif backup_type == "zwave":
-            rest_url = self.url + "backup_zwave"
-        ws_resp = requests.get(rest_url, headers=self.cloud_ws_header, timeout=60)
-        with open(file, "wb") as f:
-            for chunk in ws_resp.iter_content(1024):
-                f.write(chunk)
-        return ws_resp
-
-    def get_gate_parring_pin(self, user_id):
-        rest_url = self.url + "gate_id_from_pin"
-        payload = {"user_id": user_id}
-        ws_resp = requests.post(
-            rest_url, headers=self.cloud_ws_header, json=payload, timeout=5
+        self.cloud_cache.async_invalidate(("key", service))
+        with async_timeout.timeout(CLOUD_WS_TIMEOUT):
+            ws_resp = await web_session.delete(rest_url, headers=self.cloud_ws_header)
+            return await ws_resp.json()
+
+    async def async_get_backup_info(self):
+        return await self._async_get_json("backup_info", None)
+
+    async def async_post_backup(self, file, backup_type):
+        """Upload the backup file, return the response status and text."""
+        web_session = aiohttp_client.async_get_clientsession(self.hass)
+        rest_url = self.url + BACKUP_ENDPOINTS[backup_type]
+        payload = await self.hass.async_add_executor_job(open, file, "rb")
+        try:
+            # aiohttp reads the file in the executor
+            async with web_session.post(
+                rest_url,
+                headers=self.cloud_ws_header,
+                data=payload,
+                timeout=BACKUP_TIMEOUT,
+            ) as ws_resp:
+                return ws_resp.status, await ws_resp.text()
+        finally:
+            await self.hass.async_add_executor_job(payload.close)
+
+    async def async_download_backup(self, file, backup_type):
+        """Download the backup to the file."""
+        web_session = aiohttp_client.async_get_clientsession(self.hass)
+        rest_url = self.url + BACKUP_ENDPOINTS[backup_type]
+        async with web_session.get(
+            rest_url, headers=self.cloud_ws_header, timeout=BACKUP_TIMEOUT
+        ) as ws_resp:
+            ws_resp.raise_for_status()
+            backup_file = await self.hass.async_add_executor_job(open, file, "wb")
+            try:
+                async for chunk in ws_resp.content.iter_chunked(BACKUP_CHUNK_SIZE):
+                    await self.hass.async_add_executor_job(backup_file.write, chunk)
+            finally:
+                await self.hass.async_add_executor_job(backup_file.close)
+
+    async def async_get_gate_parring_pin(self, user_id):
+        return await self._async_post_json(
+            self.url + "gate_id_from_pin", {"user_id": user_id}
         )
-        return ws_resp
 
 
 class AisCacheData:
@@ -778,51 +820,25 @@ class AisColudData:
         self.news_channels = []
 
     async def async_get_types(self):
-        # check if we have data stored in local files
-        # otherwise we should work in online mode and get data from cloud
-        # ----------------
-        # ----- RADIO ----
-        # ----------------
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_RADIO)
-        try:
-            json_ws_resp = ws_resp.json()
-            self.cache.store_audio_type(ais_global.G_AN_RADIO, json_ws_resp)
-            types = [ais_global.G_EMPTY_OPTION]
-        except Exception as e:
-            _LOGGER.warning("RADIO WS resp " + str(ws_resp) + " " + str(e))
-
-        # ----------------
-        # --- PODCASTS ---
-        # ----------------
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_PODCAST)
-        try:
-            json_ws_resp = ws_resp.json()
-            self.cache.store_audio_type(ais_global.G_AN_PODCAST, json_ws_resp)
-            types = [ais_global.G_EMPTY_OPTION]
-        except Exception as e:
-            _LOGGER.warning("PODCASTS WS resp " + str(ws_resp) + " " + str(e))
+        # get the types from cloud, they are also stored in the local files
+        # to work in the offline mode
+        await asyncio.gather(
+            self.cloud.async_audio_type(ais_global.G_AN_RADIO),
+            self.cloud.async_audio_type(ais_global.G_AN_PODCAST),
+            self.cloud.async_audio_type(ais_global.G_AN_NEWS),
+        )
 
-        # ----------------
-        # ----- NEWS -----
-        # ----------------
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_NEWS)
-        try:
-            json_ws_resp = ws_resp.json()
-            self.cache.store_audio_type(ais_global.G_AN_NEWS, json_ws_resp)
-            types = [ais_global.G_EMPTY_OPTION]
-        except Exception as e:
-            _LOGGER.error("NEWS WS resp " + str(ws_resp) + " " + str(e))
+    def _cloud_call(self, coro):
+        """Run the cloud coroutine from the service thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.hass.loop).result()
 
     def get_radio_types(self, call):
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_RADIO)
-        try:
-            json_ws_resp = ws_resp.json()
-            types = [ais_global.G_FAVORITE_OPTION]
-            for item in json_ws_resp["data"]:
-                types.append(item)
-        except Exception as e:
-            _LOGGER.warning("get_radio_types from cache")
-            types = self.cache.audio_type(ais_global.G_AN_RADIO)["data"]
+        json_ws_resp = self._cloud_call(
+            self.cloud.async_audio_type(ais_global.G_AN_RADIO)
+        )
+        types = [ais_global.G_FAVORITE_OPTION]
+        for item in json_ws_resp["data"]:
+            types.append(item)
 
         # populate list with all stations from selected type
         self.hass.services.call(
@@ -845,9 +861,12 @@ class AisColudData:
             )
             return
 
-        ws_resp = self.cloud.audio_name(ais_global.G_AN_RADIO, call.data["radio_type"])
         try:
-            json_ws_resp = ws_resp.json()
+            json_ws_resp = self._cloud_call(
+                self.cloud.async_audio_name(
+                    ais_global.G_AN_RADIO, call.data["radio_type"]
+                )
+            )
         except Exception as e:
             _LOGGER.warning("get_radio_names error " + str(e))
             return
@@ -881,15 +900,12 @@ class AisColudData:
             )
 
     def get_podcast_types(self, call):
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_PODCAST)
-        try:
-            json_ws_resp = ws_resp.json()
-            types = [ais_global.G_FAVORITE_OPTION]
-            for item in json_ws_resp["data"]:
-                types.append(item)
-        except Exception as e:
-            _LOGGER.warning("get_podcast_types from cache")
-            types = self.cache.audio_type(ais_global.G_AN_PODCAST)["data"]
+        json_ws_resp = self._cloud_call(
+            self.cloud.async_audio_type(ais_global.G_AN_PODCAST)
+        )
+        types = [ais_global.G_FAVORITE_OPTION]
+        for item in json_ws_resp["data"]:
+            types.append(item)
         # populate list with all podcast types
         self.hass.services.call(
             "input_select",
@@ -909,11 +925,12 @@ class AisColudData:
                 {"audio_source": ais_global.G_AN_PODCAST},
             )
             return
-        ws_resp = self.cloud.audio_name(
-            ais_global.G_AN_PODCAST, call.data["podcast_type"]
-        )
         try:
-            json_ws_resp = ws_resp.json()
+            json_ws_resp = self._cloud_call(
+                self.cloud.async_audio_name(
+                    ais_global.G_AN_PODCAST, call.data["podcast_type"]
+                )
+            )
         except Exception as e:
             _LOGGER.warning("get_podcast_names problem " + str(e))
             return
@@ -1522,23 +1539,18 @@ class AisColudData:
                         },
                     )
                 )
-        # rebuild the groups
+        # rebuild the groups, the menu is changed by the loop only
         import homeassistant.components.ais_ai_service as ais_ai
 
-        ais_ai.get_groups(hass)
+        run_callback_threadsafe(hass.loop, ais_ai.get_groups, hass).result()
 
     def get_rss_news_category(self, call):
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_NEWS)
-        try:
-            json_ws_resp = ws_resp.json()
-            self.cache.store_audio_type(ais_global.G_AN_NEWS, json_ws_resp)
-            types = [ais_global.G_EMPTY_OPTION]
-            for item in json_ws_resp["data"]:
-                types.append(item)
-
-        except Exception as e:
-            _LOGGER.warning("get_rss_news_category from cache")
-            types = self.cache.audio_type(ais_global.G_AN_NEWS)["data"]
+        json_ws_resp = self._cloud_call(
+            self.cloud.async_audio_type(ais_global.G_AN_NEWS)
+        )
+        types = [ais_global.G_EMPTY_OPTION]
+        for item in json_ws_resp["data"]:
+            types.append(item)
 
         self.hass.services.call(
             "input_select",
@@ -1561,11 +1573,12 @@ class AisColudData:
                 },
             )
             return
-        ws_resp = self.cloud.audio_name(
-            ais_global.G_AN_NEWS, call.data["rss_news_category"]
-        )
         try:
-            json_ws_resp = ws_resp.json()
+            json_ws_resp = self._cloud_call(
+                self.cloud.async_audio_name(
+                    ais_global.G_AN_NEWS, call.data["rss_news_category"]
+                )
+            )
         except Exception as e:
             _LOGGER.warning("get_rss_news_channels problem " + str(e))
             return
@@ -1824,8 +1837,7 @@ class AisColudData:
         restore_error=None,
         restore_info=None,
     ):
-        ws_resp = self.cloud.get_backup_info()
-        json_ws_resp = ws_resp.json()
+        json_ws_resp = self._cloud_call(self.cloud.async_get_backup_info())
         if backup_error is not None:
             json_ws_resp["backup_error"] = backup_error
         if backup_info is not None:
@@ -1955,18 +1967,20 @@ class AisColudData:
                 None,
             )
             try:
-                ws_resp = self.cloud.post_backup(home_dir + "backup.zip", "ha")
+                status, text = self._cloud_call(
+                    self.cloud.async_post_backup(home_dir + "backup.zip", "ha")
+                )
             except Exception as e:
                 self.get_backup_info(call, 0, str(e))
                 _LOGGER.error("post_backup ha: " + str(e))
                 return
 
-            if ws_resp.status_code != 200:
+            if status != 200:
                 self.get_backup_info(
                     call,
                     0,
                     "Podczas wysyłania kopii konfiguracji Home Assistant wystąpił problem "
-                    + ws_resp.text,
+                    + text,
                 )
                 return
 
@@ -2041,20 +2055,22 @@ class AisColudData:
                 None,
             )
             try:
-                ws_resp = self.cloud.post_backup(
-                    home_dir + "zigbee_backup.zip", "zigbee"
+                status, text = self._cloud_call(
+                    self.cloud.async_post_backup(
+                        home_dir + "zigbee_backup.zip", "zigbee"
+                    )
                 )
             except Exception as e:
                 self.get_backup_info(call, 0, str(e))
                 _LOGGER.error("post_backup zigbee: " + str(e))
                 return
 
-            if ws_resp.status_code != 200:
+            if status != 200:
                 self.get_backup_info(
                     call,
                     0,
                     "Podczas wysyłania kopii konfiguracji zigbee wystąpił problem "
-                    + ws_resp.text,
+                    + text,
                 )
                 return
             # clean up
@@ -2091,7 +2107,9 @@ class AisColudData:
                 call, 1, None, None, None, "Pobieram kopie konfiguracji"
             )
             try:
-                ws_resp = self.cloud.download_backup(home_dir + "backup.zip", "ha")
+                self._cloud_call(
+                    self.cloud.async_download_backup(home_dir + "backup.zip", "ha")
+                )
             except Exception as e:
                 self.get_backup_info(call, 0, str(e))
                 return
@@ -2140,8 +2158,10 @@ class AisColudData:
                 call, 1, None, None, None, "Pobieram kopie konfiguracji zigbee"
             )
             try:
-                ws_resp = self.cloud.download_backup(
-                    home_dir + "zigbee_backup.zip", "zigbee"
+                self._cloud_call(
+                    self.cloud.async_download_backup(
+                        home_dir + "zigbee_backup.zip", "zigbee"
+                    )
                 )
             except Exception as e:
                 self.get_backup_info(call, 0, str(e))
@@ -2196,8 +2216,7 @@ class AisColudData:
         # create token
         user_id = call.context.user_id
         # send token to cloud and get the pin
-        ws_resp = self.cloud.get_gate_parring_pin(user_id)
-        json_ws_resp = ws_resp.json()
+        json_ws_resp = self._cloud_call(self.cloud.async_get_gate_parring_pin(user_id))
         pin = json_ws_resp["pin"]
         # remember pin in session to compare
         ais_global.G_AIS_DOM_PIN = pin
@@ -0,0 +1,64 @@
+"""Cache of the AIS cloud responses."""
+import asyncio
+import logging
+import time
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CloudCache:
+    """Cache the cloud responses shared by all the AisCloudWS instances.
+
+    The same requests made while the first one is still in flight wait for
+    its response instead of asking the cloud again. An expired response is
+    still returned, and refreshed in the background. When the refresh fails
+    the expired response is kept.
+    """
+
+    def __init__(self, hass):
+        """Initialize the cache."""
+        self.hass = hass
+        self._responses = {}
+        self._pending = {}
+
+    async def async_get(self, key, fetch, ttl):
+        """Return the response cached under the key, fetch it when missing."""
+        entry = self._responses.get(key)
+        if entry is None:
+            return await asyncio.shield(self._async_fetch(key, fetch))
+        fetched_at, response = entry
+        if time.monotonic() - fetched_at >= ttl:
+            self._async_fetch(key, fetch)
+        return response
+
+    @callback
+    def async_invalidate(self, key):
+        """Forget the response cached under the key."""
+        self._responses.pop(key, None)
+
+    @callback
+    def _async_fetch(self, key, fetch):
+        """Return the task fetching the response, start it if needed."""
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = self.hass.async_create_task(
+                self._async_store(key, fetch)
+            )
+        return task
+
+    async def _async_store(self, key, fetch):
+        """Fetch the response and cache it."""
+        try:
+            response = await fetch()
+        except Exception as err:  # pylint: disable=broad-except
+            entry = self._responses.get(key)
+            if entry is None:
+                raise
+            _LOGGER.debug("Can't refresh %s, keeping the old response: %s", key, err)
+            return entry[1]
+        finally:
+            del self._pending[key]
+        self._responses[key] = (time.monotonic(), response)
+        return response
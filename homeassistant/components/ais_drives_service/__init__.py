@@ -15,6 +15,7 @@ import time
 from homeassistant.components.ais_dom import ais_global
 
 from .config_flow import configured_drivers
+from .media_index import MediaIndex, is_media_file
 
 DOMAIN = "ais_drives_service"
 G_LOCAL_FILES_ROOT = "/data/data/pl.sviete.dom/files/home/dom"
@@ -28,7 +29,14 @@ G_RCLONE_CONF = "--config=" + G_RCLONE_CONF_FILE
 G_RCLONE_URL_TO_STREAM = "http://127.0.0.1:8080/"
 G_DRIVE_CLIENT_ID = None
 G_DRIVE_SECRET = None
-G_COVER_FILE = "/data/data/pl.sviete.dom/files/home/AIS/www/cover.jpg"
+G_MEDIA_INDEX_DB = "/data/data/pl.sviete.dom/files/home/AIS/.dom/.ais_media_index.db"
+G_COVER_DIR = "/data/data/pl.sviete.dom/files/home/AIS/www/covers"
+G_COVER_URL = "/local/covers"
+# the drives with the media index, the remote drives are browsed directly
+G_INDEXED_ROOTS = (
+    G_LOCAL_FILES_ROOT + "/dysk-wewnętrzny",
+    G_LOCAL_FILES_ROOT + "/dyski-wymienne",
+)
 G_RCLONE_REMOTES_LONG = []
 _LOGGER = logging.getLogger(__name__)
 
@@ -110,6 +118,10 @@ async def async_setup(hass, config):
     def rclone_mount_drives(call):
         data.rclone_mount_drives()
 
+    def index_media(call):
+        _LOGGER.debug("index_media")
+        data.index_media(call.data.get("path"))
+
     hass.services.async_register(DOMAIN, "rclone_mount_drives", rclone_mount_drives)
     hass.services.async_register(DOMAIN, "rclone_mount_drive", rclone_mount_drive)
     hass.services.async_register(DOMAIN, "rclone_remove_drive", rclone_remove_drive)
@@ -122,6 +134,10 @@ async def async_setup(hass, config):
     hass.services.async_register(DOMAIN, "remote_select_item", remote_select_item)
     hass.services.async_register(DOMAIN, "remote_cancel_item", remote_cancel_item)
     hass.services.async_register(DOMAIN, "remote_delete_item", remote_delete_item)
+    hass.services.async_register(DOMAIN, "index_media", index_media)
+
+    # update the media index in the background
+    hass.async_add_executor_job(data.index_media, None)
 
     return True
 
@@ -440,50 +456,6 @@ def rclone_set_auth_ftp(drive_name, host, port, user_name, password):
         return "ERROR: " + str(e)
 
 
-def file_tags_extract(path):
-    import mutagen.flac
-    import mutagen.id3
-    import mutagen.mp4
-
-    global G_COVER_FILE
-    dir_www = "/data/data/pl.sviete.dom/files/home/AIS/www/"
-    dir_name = os.path.basename(os.path.dirname(path)).replace(" ", "")
-    ret_path = "/local/" + dir_name + "_cover.jpg"
-    f_length = 0
-    # file info
-    try:
-        fi = mutagen.File(path)
-        f_length = str(fi.info.length)
-    except Exception as e:
-        _LOGGER.error("Error " + str(e))
-
-    if G_COVER_FILE == dir_www + dir_name + "_cover.jpg":
-        return ret_path, f_length
-    # remove all .jpg
-    jpgs = os.listdir(dir_www)
-    for jpg in jpgs:
-        if jpg.endswith("_cover.jpg"):
-            os.remove(os.path.join(dir_www, jpg))
-
-    # generate the cover
-    G_COVER_FILE = dir_www + dir_name + "_cover.jpg"
-    try:
-        id3 = mutagen.id3.ID3(path)
-        open(G_COVER_FILE, "wb").write(id3.getall("APIC")[0].data)
-    except Exception:
-        try:
-            flac = mutagen.flac.FLAC(path)
-            open(G_COVER_FILE, "wb").write(flac.pictures[0].data)
-        except Exception:
-            try:
-                mp4 = mutagen.mp4.MP4(path)
-                open(G_COVER_FILE, "wb").write(mp4["covr"][0])
-            except Exception as e:
-                _LOGGER.info("Error " + str(e))
-
-    return ret_path, f_length
-
-
 class LocalData:
     """Class to hold local folders and files data."""
 
@@ -497,6 +469,7 @@ class LocalData:
         self.rclone_pexpect_stream = None
         self.file_path = None
         self.seek_position = 0
+        self.media_index = MediaIndex(G_MEDIA_INDEX_DB, G_COVER_DIR, G_COVER_URL)
 
     def beep(self):
         self.hass.services.call(
@@ -518,18 +491,26 @@ class LocalData:
             _url = self.current_path
             if _url.startswith("/data/data/pl.sviete.dom/files/home/dom/dyski-zdalne/"):
                 self.say("Pobieram i odtwarzam")
-            # TODO search the album and title ...
-            album_cover_path, file_length = file_tags_extract(self.current_path)
             _audio_info = {
                 "NAME": os.path.basename(self.current_path),
                 "MEDIA_SOURCE": ais_global.G_AN_LOCAL,
                 "ALBUM_NAME": os.path.basename(os.path.dirname(self.current_path)),
-                "IMAGE_URL": album_cover_path,
-                "DURATION": file_length,
                 "media_content_id": _url,
                 "lookup_url": self.current_path,
+                "DURATION": 0,
                 "media_position_ms": self.seek_position,
             }
+            # the remote drives are not indexed, their tags are not read
+            track = None
+            if self.is_indexed(self.current_path):
+                track = self.media_index.track(self.current_path)
+            if track is not None:
+                if track["cover"]:
+                    _audio_info["IMAGE_URL"] = self.media_index.cover_path(
+                        track["cover"]
+                    )
+                if track["duration"] is not None:
+                    _audio_info["DURATION"] = str(track["duration"])
             _audio_info = json.dumps(_audio_info)
 
             if _url is not None:
@@ -593,19 +574,28 @@ class LocalData:
 
     # browse files on local folder
     def display_current_items(self, say):
-        local_items = []
-        try:
-            local_items = os.scandir(self.current_path)
-        except Exception as e:
-            _LOGGER.error("list_dir error: " + str(e))
-        si = sorted(local_items, key=lambda en: en.name)
+        if self.is_indexed(self.current_path):
+            si = [
+                (row["name"], bool(row["is_dir"]), row["path"])
+                for row in self.media_index.list_folder(self.current_path)
+            ]
+        else:
+            local_items = []
+            try:
+                local_items = os.scandir(self.current_path)
+            except Exception as e:
+                _LOGGER.error("list_dir error: " + str(e))
+            si = sorted(
+                ((en.name, en.is_dir(), en.path) for en in local_items),
+                key=lambda item: item[0],
+            )
         items_info = [
             {"name": ".", "icon": "", "path": G_LOCAL_FILES_ROOT},
             {"name": "..", "icon": "", "path": ".."},
         ]
-        for i in si:
+        for name, is_dir, path in si:
             items_info.append(
-                {"name": i.name, "icon": self.get_icon(i), "path": i.path}
+                {"name": name, "icon": self.get_icon(name, is_dir), "path": path}
             )
         self.hass.states.set(
             "sensor.ais_drives",
@@ -624,14 +614,40 @@ class LocalData:
                 {"path": self.file_path, "seek_position": self.seek_position},
             )
 
-    def get_icon(self, entry):
-        if entry.is_dir():
+    def get_icon(self, name, is_dir):
+        if is_dir:
             return "folder"
-        elif entry.name.lower().endswith(".txt"):
+        elif name.lower().endswith(".txt"):
             return "file-document-outline"
-        elif entry.name.lower().endswith((".mp3", ".wav", ".mp4", ".flv")):
+        elif is_media_file(name):
             return "music-circle"
 
+    def is_indexed(self, path):
+        return path.startswith(G_INDEXED_ROOTS)
+
+    def play_search(self, query):
+        """Play the media file best matching the query, return its entry."""
+        found = self.media_index.search(query, 1)
+        if not found:
+            return None
+        track = found[0]
+        # list the folder first, the next and previous files are taken from it
+        self._browse_path(track["folder"], False)
+        self._browse_path(track["path"], False)
+        return track
+
+    def index_media(self, path):
+        """Update the media index of the drive, or of all the indexed drives."""
+        roots = G_INDEXED_ROOTS if path is None else (path,)
+        for root in roots:
+            if not self.is_indexed(root):
+                _LOGGER.error("The media on %s are not indexed", root)
+                continue
+            try:
+                self.media_index.scan(root)
+            except Exception as e:
+                _LOGGER.error("Error indexing the media in " + root + ": " + str(e))
+
     def browse_path(self, call):
         """Load subfolders for the selected folder."""
         if "path" not in call.data:
@@ -0,0 +1,352 @@
+"""Index of the media files on the local and the removable drives."""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+
+from .media_search import MediaSearchIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+MEDIA_EXTENSIONS = (
+    ".aac",
+    ".flac",
+    ".flv",
+    ".m4a",
+    ".mp3",
+    ".mp4",
+    ".ogg",
+    ".opus",
+    ".wav",
+    ".wma",
+)
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY, mtime REAL)",
+    "CREATE TABLE IF NOT EXISTS entries ("
+    "path TEXT PRIMARY KEY, folder TEXT NOT NULL, name TEXT NOT NULL, "
+    "is_dir INTEGER NOT NULL, mtime REAL, size INTEGER, duration REAL, "
+    "artist TEXT, album TEXT, title TEXT, cover TEXT)",
+    "CREATE INDEX IF NOT EXISTS entries_folder ON entries (folder)",
+    "CREATE INDEX IF NOT EXISTS entries_artist ON entries (artist COLLATE NOCASE)",
+)
+ENTRY_COLUMNS = (
+    "path",
+    "folder",
+    "name",
+    "is_dir",
+    "mtime",
+    "size",
+    "duration",
+    "artist",
+    "album",
+    "title",
+    "cover",
+)
+
+
+def is_media_file(name):
+    """Return True if the file has the extension of an audio or video file."""
+    return name.lower().endswith(MEDIA_EXTENSIONS)
+
+
+def _first_tag(tags, *keys):
+    """Return the first value of the first of the tags found."""
+    for key in keys:
+        try:
+            value = tags[key]
+        except (KeyError, ValueError, TypeError):
+            continue
+        value = getattr(value, "text", value)
+        if isinstance(value, list):
+            if not value:
+                continue
+            value = value[0]
+        return str(value)
+    return None
+
+
+def read_tags(path):
+    """Return the duration, the artist, album and title and the cover image."""
+    import mutagen  # pylint: disable=import-outside-toplevel
+    import mutagen.id3  # pylint: disable=import-outside-toplevel
+
+    try:
+        media = mutagen.File(path)
+    except Exception as e:  # pylint: disable=broad-except
+        _LOGGER.info("Can't read the tags of %s: %s", path, e)
+        return None, None, None, None, None
+    if media is None:
+        return None, None, None, None, None
+
+    duration = getattr(media.info, "length", None)
+    tags = media.tags
+    if tags is None:
+        return duration, None, None, None, None
+
+    artist = _first_tag(tags, "TPE1", "artist", "\xa9ART")
+    album = _first_tag(tags, "TALB", "album", "\xa9alb")
+    title = _first_tag(tags, "TIT2", "title", "\xa9nam")
+    cover = None
+    if isinstance(tags, mutagen.id3.ID3):
+        pictures = tags.getall("APIC")
+        if pictures:
+            cover = pictures[0].data
+    elif getattr(media, "pictures", None):
+        cover = media.pictures[0].data
+    elif "covr" in tags and tags["covr"]:
+        cover = bytes(tags["covr"][0])
+    return duration, artist, album, title, cover
+
+
+class MediaIndex:
+    """SQLite index of the folders and the media files on the drives.
+
+    A folder is scanned again only after its modification time changes,
+    and the tags of a file are read again only after its modification time
+    or size changes. The cover images are kept in the cover folder under
+    the hash of their content, so a cover shared by the album tracks is
+    written once and is not written again when the tracks are played.
+
+    The methods must be run in the executor.
+    """
+
+    def __init__(self, db_path, cover_dir, cover_url):
+        """Initialize the index."""
+        self.db_path = db_path
+        self.cover_dir = cover_dir
+        self.cover_url = cover_url
+        self._lock = threading.RLock()
+        self._db = None
+        # rebuilt on the first search after the index was changed
+        self._search_index = None
+
+    @property
+    def db(self):
+        """Return the connection to the database, create it if needed."""
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            for statement in SCHEMA:
+                self._db.execute(statement)
+        return self._db
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def cover_path(self, cover):
+        """Return the URL of the cover image."""
+        return f"{self.cover_url}/{cover}.jpg"
+
+    def list_folder(self, folder):
+        """Return the entries of the folder sorted by name.
+
+        The folder is scanned if it was changed since the last scan.
+        """
+        with self._lock:
+            self._refresh_folder(folder, force=False)
+            return self.db.execute(
+                "SELECT * FROM entries WHERE folder = ? ORDER BY name", (folder,)
+            ).fetchall()
+
+    def track(self, path):
+        """Return the entry of the media file, read its tags if needed."""
+        with self._lock:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            row = self.db.execute(
+                "SELECT * FROM entries WHERE path = ?", (path,)
+            ).fetchone()
+            if (
+                row is not None
+                and row["mtime"] == stat.st_mtime
+                and row["size"] == stat.st_size
+            ):
+                return row
+            self._index_file(path, os.path.dirname(path), os.path.basename(path), stat)
+            self.db.commit()
+            return self.db.execute(
+                "SELECT * FROM entries WHERE path = ?", (path,)
+            ).fetchone()
+
+    def artists(self, offset=0, limit=-1):
+        """Return the artists of the media files sorted by name."""
+        with self._lock:
+            return [
+                row["artist"]
+                for row in self.db.execute(
+                    "SELECT artist FROM entries "
+                    "WHERE is_dir = 0 AND artist IS NOT NULL "
+                    "GROUP BY artist COLLATE NOCASE ORDER BY artist COLLATE NOCASE "
+                    "LIMIT ? OFFSET ?",
+                    (limit, offset),
+                )
+            ]
+
+    def artist_tracks(self, artist, offset=0, limit=-1):
+        """Return the media files of the artist sorted by album and file."""
+        with self._lock:
+            return self.db.execute(
+                "SELECT * FROM entries "
+                "WHERE is_dir = 0 AND artist = ? COLLATE NOCASE "
+                "ORDER BY album COLLATE NOCASE, folder, name LIMIT ? OFFSET ?",
+                (artist, limit, offset),
+            ).fetchall()
+
+    def search(self, query, limit=50):
+        """Return the media files best matching the query."""
+        with self._lock:
+            return self.search_index.search(query, limit)
+
+    @property
+    def search_index(self):
+        """Return the search index of the media files, build it if needed."""
+        with self._lock:
+            if self._search_index is None:
+                self._search_index = MediaSearchIndex(
+                    row
+                    for row in self.db.execute("SELECT * FROM entries WHERE is_dir = 0")
+                    if is_media_file(row["name"])
+                )
+            return self._search_index
+
+    def scan(self, root):
+        """Scan the folders under the root, read the tags of the changed files."""
+        _LOGGER.info("Indexing the media in %s", root)
+        folders = [root]
+        while folders:
+            folder = folders.pop()
+            with self._lock:
+                self._refresh_folder(folder, force=True)
+                folders.extend(
+                    row["path"]
+                    for row in self.db.execute(
+                        "SELECT path FROM entries WHERE folder = ? AND is_dir = 1",
+                        (folder,),
+                    )
+                )
+        _LOGGER.info("Indexed the media in %s", root)
+
+    def _refresh_folder(self, folder, force):
+        """Scan the folder if it was changed, or always if forced."""
+        try:
+            mtime = os.stat(folder).st_mtime
+        except OSError:
+            self._remove_tree(folder)
+            self.db.commit()
+            return
+        row = self.db.execute(
+            "SELECT mtime FROM folders WHERE path = ?", (folder,)
+        ).fetchone()
+        if not force and row is not None and row["mtime"] == mtime:
+            return
+
+        indexed = {
+            row["path"]: row
+            for row in self.db.execute(
+                "SELECT path, is_dir, mtime, size FROM entries WHERE folder = ?",
+                (folder,),
+            )
+        }
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    old = indexed.pop(entry.path, None)
+                    try:
+                        is_dir = entry.is_dir()
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    if (
+                        old is not None
+                        and old["is_dir"] == is_dir
+                        and old["mtime"] == stat.st_mtime
+                        and old["size"] == stat.st_size
+                    ):
+                        continue
+                    if is_dir:
+                        self._upsert(
+                            path=entry.path,
+                            folder=folder,
+                            name=entry.name,
+                            is_dir=True,
+                            mtime=stat.st_mtime,
+                            size=stat.st_size,
+                        )
+                    else:
+                        self._index_file(entry.path, folder, entry.name, stat)
+        except OSError as e:
+            _LOGGER.error("Can't index the folder %s: %s", folder, e)
+            return
+
+        for path in indexed:
+            self._remove_tree(path)
+        self.db.execute(
+            "INSERT OR REPLACE INTO folders (path, mtime) VALUES (?, ?)",
+            (folder, mtime),
+        )
+        self.db.commit()
+
+    def _index_file(self, path, folder, name, stat):
+        """Add the file to the index with its tags."""
+        duration = artist = album = title = cover = None
+        if is_media_file(name):
+            duration, artist, album, title, image = read_tags(path)
+            if image:
+                cover = self._store_cover(image)
+        self._upsert(
+            path=path,
+            folder=folder,
+            name=name,
+            is_dir=False,
+            mtime=stat.st_mtime,
+            size=stat.st_size,
+            duration=duration,
+            artist=artist,
+            album=album,
+            title=title,
+            cover=cover,
+        )
+
+    def _store_cover(self, image):
+        """Write the cover image if it is not in the cache, return its hash."""
+        cover = hashlib.sha1(image).hexdigest()  # nosec
+        path = os.path.join(self.cover_dir, cover + ".jpg")
+        if not os.path.isfile(path):
+            try:
+                os.makedirs(self.cover_dir, exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as file:
+                    file.write(image)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                _LOGGER.error("Can't write the cover %s: %s", path, e)
+                return None
+        return cover
+
+    def _upsert(self, **entry):
+        """Add or replace the entry."""
+        self._search_index = None
+        self.db.execute(
+            f"INSERT OR REPLACE INTO entries ({', '.join(ENTRY_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(ENTRY_COLUMNS))})",
+            tuple(entry.get(column) for column in ENTRY_COLUMNS),
+        )
+
+    def _remove_tree(self, path):
+        """Remove the entry and everything under it."""
+        self._search_index = None
+        # '0' is the character after '/', this selects the paths under the path
+        for table in ("entries", "folders"):
+            self.db.execute(
+                f"DELETE FROM {table} WHERE path = ? OR (path > ? AND path < ?)",
+                (path, path + "/", path + "0"),
+            )
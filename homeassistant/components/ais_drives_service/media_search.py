@@ -0,0 +1,76 @@
+"""Full text search of the indexed media files."""
+import bisect
+import os
+import re
+
+POLISH_CHARS = str.maketrans("ąćęłńóśźż", "acelnoszz")
+NON_WORD_CHARS = re.compile(r"[\W_]+")
+
+
+def fold_words(text):
+    """Return the words of the text in lower case and without Polish diacritics."""
+    if not text:
+        return []
+    return NON_WORD_CHARS.sub(" ", text.lower().translate(POLISH_CHARS)).split()
+
+
+class MediaSearchIndex:
+    """In-memory word index of the media files.
+
+    The artist, album, title, file name and folder name of each file are
+    split into folded words. A query word matches the indexed words it is
+    a prefix of, found by bisecting the sorted words. The files matching
+    the most query words are returned, the files matching whole words
+    first, then in the folder and name order.
+    """
+
+    def __init__(self, rows):
+        """Build the index from the media file entries."""
+        self._rows = sorted(rows, key=lambda row: (row["folder"], row["name"]))
+        postings = {}
+        for idx, row in enumerate(self._rows):
+            words = fold_words(
+                " ".join(
+                    text
+                    for text in (
+                        row["artist"],
+                        row["album"],
+                        row["title"],
+                        os.path.splitext(row["name"])[0],
+                        os.path.basename(row["folder"]),
+                    )
+                    if text
+                )
+            )
+            for word in set(words):
+                postings.setdefault(word, []).append(idx)
+        self._postings = postings
+        self._words = sorted(postings)
+
+    def __len__(self):
+        """Return the number of the indexed files."""
+        return len(self._rows)
+
+    def search(self, query, limit=50):
+        """Return the files best matching the query."""
+        matched = {}
+        exact = {}
+        for query_word in set(fold_words(query)):
+            docs = set()
+            position = bisect.bisect_left(self._words, query_word)
+            while position < len(self._words) and self._words[position].startswith(
+                query_word
+            ):
+                docs.update(self._postings[self._words[position]])
+                position += 1
+            for idx in docs:
+                matched[idx] = matched.get(idx, 0) + 1
+            for idx in self._postings.get(query_word, ()):
+                exact[idx] = exact.get(idx, 0) + 1
+        if not matched:
+            return []
+
+        best = max(matched.values())
+        found = [idx for idx, count in matched.items() if count == best]
+        found.sort(key=lambda idx: (-exact.get(idx, 0), idx))
+        return [self._rows[idx] for idx in found[:limit]]
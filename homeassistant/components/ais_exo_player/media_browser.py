@@ -3,7 +3,12 @@ import logging
 
 import async_timeout
 
-from homeassistant.components import ais_audiobooks_service, ais_cloud, media_source
+from homeassistant.components import (
+    ais_audiobooks_service,
+    ais_cloud,
+    ais_drives_service,
+    media_source,
+)
 import homeassistant.components.ais_dom.ais_global as ais_global
 from homeassistant.components.media_player import BrowseMedia
 from homeassistant.components.media_player.const import (
@@ -34,6 +39,10 @@ from homeassistant.helpers import aiohttp_client
 
 MEDIA_TYPE_SHOW = "show"
 BROWSE_LIMIT = 48
+AUDIO_BOOKS_PAGE_SIZE = 100
+LOCAL_MEDIA_PAGE_SIZE = 100
+LOCAL_MEDIA_SEARCH = "ais_local_media/search/"
+PAGE_SEPARATOR = "?page="
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -148,7 +157,7 @@ async def browse_media(hass, media_content_type=None, media_content_id=None):
         return ais_bookmarks_library(hass)
 
     if media_content_id.startswith("ais_radio"):
-        return ais_radio_library(hass, media_content_id)
+        return await ais_radio_library(hass, media_content_id)
 
     if media_content_id.startswith("ais_tunein"):
         return await ais_tunein_library(hass, media_content_id)
@@ -159,6 +168,9 @@ async def browse_media(hass, media_content_type=None, media_content_id=None):
     if media_content_id.startswith("ais_audio_books"):
         return await ais_audio_books_library(hass, media_content_id)
 
+    if media_content_id.startswith("ais_local_media"):
+        return await ais_local_media_library(hass, media_content_id)
+
     response = None
 
     if response is None:
@@ -199,6 +211,16 @@ def ais_media_library() -> BrowseMedia:
             can_play=False,
         )
     )
+    ais_library_info.children.append(
+        BrowseMedia(
+            title="Muzyka na dyskach",
+            media_class=MEDIA_CLASS_MUSIC,
+            media_content_id="ais_local_media",
+            media_content_type=MEDIA_TYPE_APP,
+            can_expand=True,
+            can_play=False,
+        )
+    )
     ais_library_info.children.append(
         BrowseMedia(
             title="Ulubione",
@@ -284,27 +306,47 @@ def ais_media_library() -> BrowseMedia:
 
 
 async def get_books_lib(hass):
-    import json
-    import os
+    catalogue = ais_audiobooks_service.get_catalogue(hass)
+    await hass.async_add_executor_job(catalogue.load)
+    return catalogue
 
-    path = hass.config.path() + ais_audiobooks_service.PERSISTENCE_AUDIOBOOKS
-    if not os.path.isfile(path):
-        return json({})
-    with open(path) as file:
-        return json.loads(file.read())
+
+def _split_page(media_content_id):
+    """Return the media content id without the page and the page number."""
+    if PAGE_SEPARATOR not in media_content_id:
+        return media_content_id, 1
+    media_content_id, page = media_content_id.rsplit(PAGE_SEPARATOR, 1)
+    if not page.isdecimal() or int(page) < 1:
+        raise BrowseError(f"Invalid page: {page}")
+    return media_content_id, int(page)
+
+
+def _page_items(items, page):
+    """Return the items on the page and if there is a next page."""
+    start = (page - 1) * AUDIO_BOOKS_PAGE_SIZE
+    end = start + AUDIO_BOOKS_PAGE_SIZE
+    return items[start:end], len(items) > end
+
+
+def _next_page(media_content_id, page) -> BrowseMedia:
+    """Return the link to the next page."""
+    return BrowseMedia(
+        title="Następna strona",
+        media_class=MEDIA_CLASS_DIRECTORY,
+        media_content_id=media_content_id + PAGE_SEPARATOR + str(page + 1),
+        media_content_type=MEDIA_TYPE_APP,
+        can_play=False,
+        can_expand=True,
+    )
 
 
 async def ais_audio_books_library(hass, media_content_id) -> BrowseMedia:
-    ais_cloud_ws = ais_cloud.AisCloudWS(hass)
     # get all books
-    all_books = await get_books_lib(hass)
+    catalogue = await get_books_lib(hass)
+    media_content_id, page = _split_page(media_content_id)
     if media_content_id == "ais_audio_books":
         # get authors
-        authors = []
-        for item in all_books:
-            if item["author"] not in authors:
-                authors.append(item["author"])
-
+        authors, next_page = _page_items(catalogue.authors, page)
         ais_authors = []
         for author in authors:
             ais_authors.append(
@@ -317,6 +359,8 @@ async def ais_audio_books_library(hass, media_content_id) -> BrowseMedia:
                     can_expand=True,
                 )
             )
+        if next_page:
+            ais_authors.append(_next_page(media_content_id, page))
 
         root = BrowseMedia(
             title="Autorzy",
@@ -332,30 +376,33 @@ async def ais_audio_books_library(hass, media_content_id) -> BrowseMedia:
     elif media_content_id.count("/") == 1:
         # get books for author
         ais_books = []
-        for item in all_books:
-            if item["author"] == media_content_id.replace("ais_audio_books/", ""):
-                try:
-                    thumbnail = "https://wolnelektury.pl/media/" + item["cover_thumb"]
-                except Exception:
-                    thumbnail = item["simple_thumb"]
-
-                ais_books.append(
-                    BrowseMedia(
-                        title=item["title"],
-                        media_class=MEDIA_CLASS_DIRECTORY,
-                        media_content_id=media_content_id
-                        + "/"
-                        + item["title"]
-                        + "/"
-                        + item["href"],
-                        media_content_type=MEDIA_TYPE_APP,
-                        can_play=False,
-                        can_expand=True,
-                        thumbnail=thumbnail,
-                    )
+        author = media_content_id.replace("ais_audio_books/", "")
+        books, next_page = _page_items(catalogue.books(author), page)
+        for item in books:
+            try:
+                thumbnail = "https://wolnelektury.pl/media/" + item["cover_thumb"]
+            except Exception:
+                thumbnail = item["simple_thumb"]
+
+            ais_books.append(
+                BrowseMedia(
+                    title=item["title"],
+                    media_class=MEDIA_CLASS_DIRECTORY,
+                    media_content_id=media_content_id
+                    + "/"
+                    + item["title"]
+                    + "/"
+                    + item["href"],
+                    media_content_type=MEDIA_TYPE_APP,
+                    can_play=False,
+                    can_expand=True,
+                    thumbnail=thumbnail,
                 )
+            )
+        if next_page:
+            ais_books.append(_next_page(media_content_id, page))
         root = BrowseMedia(
-            title=media_content_id.replace("ais_audio_books/", ""),
+            title=author,
             media_class=MEDIA_CLASS_DIRECTORY,
             media_content_id=media_content_id,
             media_content_type=MEDIA_TYPE_APP,
@@ -412,12 +459,110 @@ async def ais_audio_books_library(hass, media_content_id) -> BrowseMedia:
             raise BrowseError("Can't load chapters: " + str(e))
 
 
+def _local_track(media_index, track) -> BrowseMedia:
+    """Return the indexed media file."""
+    return BrowseMedia(
+        title=track["title"] or track["name"],
+        media_class=MEDIA_CLASS_TRACK,
+        media_content_id=track["path"],
+        media_content_type=MEDIA_TYPE_MUSIC,
+        can_play=True,
+        can_expand=False,
+        thumbnail=media_index.cover_path(track["cover"]) if track["cover"] else None,
+    )
+
+
+async def ais_local_media_library(hass, media_content_id) -> BrowseMedia:
+    """Browse the artists of the media indexed on the drives, or search them."""
+    if ais_drives_service.DOMAIN not in hass.data:
+        raise BrowseError("Dyski nie są jeszcze gotowe")
+    media_index = hass.data[ais_drives_service.DOMAIN].media_index
+
+    if media_content_id.startswith(LOCAL_MEDIA_SEARCH):
+        query = media_content_id[len(LOCAL_MEDIA_SEARCH) :]
+        tracks = await hass.async_add_executor_job(
+            media_index.search, query, LOCAL_MEDIA_PAGE_SIZE
+        )
+        return BrowseMedia(
+            title=f"Szukaj: {query}" if query else "Szukaj",
+            media_class=MEDIA_CLASS_DIRECTORY,
+            media_content_id=media_content_id,
+            media_content_type=MEDIA_TYPE_APP,
+            can_expand=True,
+            can_play=False,
+            children=[_local_track(media_index, track) for track in tracks],
+        )
+
+    media_content_id, page = _split_page(media_content_id)
+    offset = (page - 1) * LOCAL_MEDIA_PAGE_SIZE
+
+    if media_content_id == "ais_local_media":
+        # one more than the page to know if there is a next page
+        artists = await hass.async_add_executor_job(
+            media_index.artists, offset, LOCAL_MEDIA_PAGE_SIZE + 1
+        )
+        children = []
+        if page == 1:
+            # the query is added to the id by the app
+            children.append(
+                BrowseMedia(
+                    title="Szukaj",
+                    media_class=MEDIA_CLASS_DIRECTORY,
+                    media_content_id=LOCAL_MEDIA_SEARCH,
+                    media_content_type=MEDIA_TYPE_APP,
+                    can_play=False,
+                    can_expand=True,
+                )
+            )
+        children.extend(
+            BrowseMedia(
+                title=artist,
+                media_class=MEDIA_CLASS_ARTIST,
+                media_content_id="ais_local_media/" + artist,
+                media_content_type=MEDIA_TYPE_APP,
+                can_play=False,
+                can_expand=True,
+            )
+            for artist in artists[:LOCAL_MEDIA_PAGE_SIZE]
+        )
+        if len(artists) > LOCAL_MEDIA_PAGE_SIZE:
+            children.append(_next_page(media_content_id, page))
+        return BrowseMedia(
+            title="Muzyka na dyskach",
+            media_class=MEDIA_CLASS_DIRECTORY,
+            media_content_id="ais_local_media",
+            media_content_type=MEDIA_TYPE_APP,
+            can_expand=True,
+            can_play=False,
+            children=children,
+        )
+
+    # the rest of the id is the artist
+    artist = media_content_id.replace("ais_local_media/", "", 1)
+    tracks = await hass.async_add_executor_job(
+        media_index.artist_tracks, artist, offset, LOCAL_MEDIA_PAGE_SIZE + 1
+    )
+    children = [
+        _local_track(media_index, track) for track in tracks[:LOCAL_MEDIA_PAGE_SIZE]
+    ]
+    if len(tracks) > LOCAL_MEDIA_PAGE_SIZE:
+        children.append(_next_page(media_content_id, page))
+    return BrowseMedia(
+        title=artist,
+        media_class=MEDIA_CLASS_ARTIST,
+        media_content_id=media_content_id,
+        media_content_type=MEDIA_TYPE_APP,
+        can_expand=True,
+        can_play=False,
+        children=children,
+    )
+
+
 async def ais_podcast_library(hass, media_content_id) -> BrowseMedia:
     ais_cloud_ws = ais_cloud.AisCloudWS(hass)
     if media_content_id == "ais_podcast":
         # get podcast types
-        ws_resp = ais_cloud_ws.audio_type(ais_global.G_AN_PODCAST)
-        json_ws_resp = ws_resp.json()
+        json_ws_resp = await ais_cloud_ws.async_audio_type(ais_global.G_AN_PODCAST)
         ais_podcast_types = []
         for item in json_ws_resp["data"]:
             media_class = MEDIA_CLASS_PODCAST
@@ -476,10 +621,9 @@ async def ais_podcast_library(hass, media_content_id) -> BrowseMedia:
         return root
     elif media_content_id.count("/") == 1:
         # get podcasts for types
-        ws_resp = ais_cloud_ws.audio_name(
+        json_ws_resp = await ais_cloud_ws.async_audio_name(
             ais_global.G_AN_PODCAST, media_content_id.replace("ais_podcast/", "")
         )
-        json_ws_resp = ws_resp.json()
         ais_radio_stations = []
         for item in json_ws_resp["data"]:
             ais_radio_stations.append(
@@ -553,12 +697,11 @@ async def ais_podcast_library(hass, media_content_id) -> BrowseMedia:
             raise BrowseError("Timeout when reading RSS %s", lookup_url)
 
 
-def ais_radio_library(hass, media_content_id) -> BrowseMedia:
+async def ais_radio_library(hass, media_content_id) -> BrowseMedia:
     ais_cloud_ws = ais_cloud.AisCloudWS(hass)
     if media_content_id == "ais_radio":
         # get
-        ws_resp = ais_cloud_ws.audio_type(ais_global.G_AN_RADIO)
-        json_ws_resp = ws_resp.json()
+        json_ws_resp = await ais_cloud_ws.async_audio_type(ais_global.G_AN_RADIO)
         # ais_radio_types = [ais_global.G_FAVORITE_OPTION]
         ais_radio_types = []
         for item in json_ws_resp["data"]:
@@ -617,10 +760,9 @@ def ais_radio_library(hass, media_content_id) -> BrowseMedia:
         return root
     else:
         # get radio station for type
-        ws_resp = ais_cloud_ws.audio_name(
+        json_ws_resp = await ais_cloud_ws.async_audio_name(
             ais_global.G_AN_RADIO, media_content_id.replace("ais_radio/", "")
         )
-        json_ws_resp = ws_resp.json()
         ais_radio_stations = []
         for item in json_ws_resp["data"]:
             ais_radio_stations.append(
@@ -8,6 +8,7 @@ import asyncio
 import json
 import logging
 import os
+import tempfile
 
 from PIL import Image
 from aiohttp.web import Request, Response
@@ -16,12 +17,16 @@ from sqlalchemy.pool import StaticPool
 
 import homeassistant.components.ais_dom.ais_global as ais_global
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.const import HTTP_BAD_REQUEST
 
 from . import sensor
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 IMG_PATH = "/data/data/pl.sviete.dom/files/home/AIS/www/img/"
+THUMBNAILS_PATH = "/data/data/pl.sviete.dom/files/home/AIS/www/img_thumbnails/"
+THUMBNAIL_SIZES = (256, 512)
+UPLOAD_CHUNK_SIZE = 256 * 1024
 G_LOG_SETTINGS_INFO_FILE = "/.dom/.ais_log_settings_info"
 G_DB_SETTINGS_INFO_FILE = "/.dom/.ais_db_settings_info"
 
@@ -121,6 +126,8 @@ async def _async_remove_file(hass, path):
             "/media/galeria/", "/data/data/pl.sviete.dom/files/home/AIS/www/img/"
         ).split("?authSig")[0]
         os.remove(path)
+        if path.startswith(IMG_PATH):
+            await hass.async_add_executor_job(remove_thumbnails, os.path.basename(path))
         await _async_refresh_files(hass)
         await _async_pick_file(hass, 0)
 
@@ -447,7 +454,6 @@ def resize_image(file_name):
     original_size = max(image.size[0], image.size[1])
 
     if original_size >= max_size:
-        resized_file = open(IMG_PATH + "1024_" + file_name, "wb")
         if image.size[0] > image.size[1]:
             resized_width = max_size
             resized_height = int(
@@ -459,10 +465,82 @@ def resize_image(file_name):
                 round((max_size / float(image.size[1])) * image.size[0])
             )
 
+        image_format = image.format
         image = image.resize((resized_width, resized_height), Image.ANTIALIAS)
-        image.save(resized_file)
-        os.remove(IMG_PATH + file_name)
-        os.rename(IMG_PATH + "1024_" + file_name, IMG_PATH + file_name)
+        resized_file = IMG_PATH + ".1024_" + file_name
+        image.save(resized_file, image_format)
+        os.replace(resized_file, IMG_PATH + file_name)
+    return image
+
+
+def create_thumbnails(file_name, image):
+    """Save the WebP thumbnails of the image in each size."""
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    name = os.path.splitext(file_name)[0] + ".webp"
+    for size in THUMBNAIL_SIZES:
+        os.makedirs(THUMBNAILS_PATH + str(size), exist_ok=True)
+        thumbnail = image.copy()
+        thumbnail.thumbnail((size, size), Image.ANTIALIAS)
+        thumbnail.save(os.path.join(THUMBNAILS_PATH + str(size), name), "WEBP")
+
+
+def remove_thumbnails(file_name):
+    """Remove the thumbnails of the image."""
+    name = os.path.splitext(file_name)[0] + ".webp"
+    for size in THUMBNAIL_SIZES:
+        try:
+            os.remove(os.path.join(THUMBNAILS_PATH + str(size), name))
+        except FileNotFoundError:
+            pass
+
+
+def process_image(file_name):
+    """Resize the uploaded image and create its thumbnails.
+
+    This method must be run in the executor.
+    """
+    try:
+        image = resize_image(file_name)
+        create_thumbnails(file_name, image)
+    except Exception as e:
+        _LOGGER.error("Error processing the image " + file_name + ": " + str(e))
+
+
+def _discard_file(file):
+    """Close and remove the partly written file."""
+    file.close()
+    try:
+        os.remove(file.name)
+    except FileNotFoundError:
+        pass
+
+
+async def async_save_upload(hass, field, path):
+    """Write the uploaded file chunk by chunk and return its size.
+
+    The chunks are written to a hidden temporary file next to the path,
+    which replaces the path once the whole file was received.
+    """
+    file = await hass.async_add_executor_job(
+        lambda: tempfile.NamedTemporaryFile(
+            "wb", dir=os.path.dirname(path), prefix=".upload_", delete=False
+        )
+    )
+    size = 0
+    try:
+        while True:
+            chunk = await field.read_chunk(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            await hass.async_add_executor_job(file.write, chunk)
+        await hass.async_add_executor_job(file.close)
+        await hass.async_add_executor_job(os.replace, file.name, path)
+    except BaseException:
+        await hass.async_add_executor_job(_discard_file, file)
+        raise
+    return size
 
 
 class FileUpladView(HomeAssistantView):
@@ -473,16 +551,18 @@ class FileUpladView(HomeAssistantView):
 
     async def post(self, request: Request) -> Response:
         """Handle the POST request for upload file."""
-        data = await request.post()
-        file = data["file"]
-        file_name = file.filename
-        file_data = file.file.read()
-        with open(IMG_PATH + file_name, "wb") as f:
-            f.write(file_data)
-            f.close()
-        # resize the file
-        if file_name.endswith(".svg") is False:
-            resize_image(file_name)
         hass = request.app["hass"]
+        reader = await request.multipart()
+        field = await reader.next()
+        while field is not None and field.name != "file":
+            field = await reader.next()
+        if field is None or not field.filename:
+            return self.json_message("No file", HTTP_BAD_REQUEST)
+
+        file_name = os.path.basename(field.filename)
+        await async_save_upload(hass, field, IMG_PATH + file_name)
+        # resize the file and create the thumbnails
+        if file_name.endswith(".svg") is False:
+            await hass.async_add_executor_job(process_image, file_name)
         hass.async_add_job(hass.services.async_call(DOMAIN, "refresh_files"))
         hass.async_add_job(hass.services.async_call(DOMAIN, "pick_file", {"idx": 0}))
@@ -96,8 +96,7 @@ async def async_setup_entry(hass, config_entry):
 async def async_unload_entry(hass, config_entry):
     """Unload a config entry."""
     # remove from cloud
-    ws_ret = aisCloudWS.gh_ais_remove_integration()
-    response = ws_ret.json()
+    response = await aisCloudWS.async_gh_ais_remove_integration()
     _LOGGER.info(response["message"])
     #
     await hass.config_entries.async_forward_entry_unload(config_entry, "sensor")
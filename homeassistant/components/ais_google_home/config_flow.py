@@ -67,8 +67,7 @@ class GoogleHomeFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             if errors == {}:
                 try:
                     ais_cloud_ws = ais_cloud.AisCloudWS(self.hass)
-                    ws_ret = ais_cloud_ws.gh_ais_add_device(oauth_json)
-                    response = ws_ret.json()
+                    response = await ais_cloud_ws.async_gh_ais_add_device(oauth_json)
                     AUTH_URL = response["message"]
                 except Exception as e:
                     errors = {CONF_OAUTH_JSON: "oauth_error"}
@@ -93,9 +92,10 @@ class GoogleHomeFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None and CONF_ACCESS_TOKEN in user_input:
             # save token
             ais_cloud_ws = ais_cloud.AisCloudWS(self.hass)
-            ws_ret = ais_cloud_ws.gh_ais_add_token(user_input[CONF_ACCESS_TOKEN])
             try:
-                response = ws_ret.json()
+                response = await ais_cloud_ws.async_gh_ais_add_token(
+                    user_input[CONF_ACCESS_TOKEN]
+                )
                 ret = response["message"]
                 return self.async_create_entry(title="Google Home", data=user_input)
             except Exception as e:
@@ -5,21 +5,37 @@ For more details about this platform, please refer to the documentation at
 https://home-assistant.io/components/shell_command/
 """
 import asyncio
+from functools import partial
 import logging
 import multiprocessing
 import os
 import platform
 
+import voluptuous as vol
+
 import homeassistant.components.ais_dom.ais_global as ais_global
 from homeassistant.const import CONF_IP_ADDRESS, CONF_MAC
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .network_scanner import (
+    AIS_DEVICE_URL,
+    TASMOTA_STATUS_URL,
+    async_probe_hosts,
+    network_hosts,
+    valid_network,
+)
 
 DOMAIN = "ais_shell_command"
-GLOBAL_X = 0
+DATA_SCAN_IN_PROGRESS = "ais_shell_command_scan_in_progress"
 _LOGGER = logging.getLogger(__name__)
 G_LT_PATH = "/data/data/pl.sviete.dom/files/usr/bin/lt"
 if platform.machine() == "x86_64":
     G_LT_PATH = "/usr/local/bin/lt"
 
+ATTR_NETWORK = "network"
+SCAN_NETWORK_SCHEMA = vol.Schema({vol.Optional(ATTR_NETWORK): valid_network})
+
 
 async def async_setup(hass, config):
     """Register the service."""
@@ -99,10 +115,16 @@ async def async_setup(hass, config):
     hass.services.async_register(DOMAIN, "execute_stop", execute_stop)
     hass.services.async_register(DOMAIN, "key_event", key_event)
     hass.services.async_register(
-        DOMAIN, "scan_network_for_devices", scan_network_for_devices
+        DOMAIN,
+        "scan_network_for_devices",
+        scan_network_for_devices,
+        schema=SCAN_NETWORK_SCHEMA,
     )
     hass.services.async_register(
-        DOMAIN, "scan_network_for_ais_players", scan_network_for_ais_players
+        DOMAIN,
+        "scan_network_for_ais_players",
+        scan_network_for_ais_players,
+        schema=SCAN_NETWORK_SCHEMA,
     )
 
     hass.services.async_register(DOMAIN, "scan_device", scan_device)
@@ -482,140 +504,120 @@ async def _show_network_devices_info(hass, call):
     hass.states.async_set("sensor.network_devices_info_value", "ok", {"text": info})
 
 
-async def _scan_device(hass, call):
-    url = None
-    if "url" in call.data:
-        url = call.data["url"]
-    url_a = None
-    if "url_a" in call.data:
-        url_a = call.data["url_a"]
-    from urllib.parse import urlparse
+@callback
+def _add_net_device(hass, host, status):
+    """Add the Tasmota device which responded to the status command."""
+    import homeassistant.components.ais_device_search_mqtt.sensor as dsm
 
-    from requests_futures.sessions import FuturesSession
+    name = status["Status"]["FriendlyName"][0]
+    dsm.NET_DEVICES.append("- " + name + ", http://" + host)
+    hass.states.async_set(
+        "sensor.network_devices_info_value", "", {"text": dsm.get_text()}
+    )
 
-    import homeassistant.components.ais_device_search_mqtt.sensor as dsm
 
-    session = FuturesSession()
-
-    if url is not None:
-
-        def bg_cb(resp, *args, **kwargs):
-            try:
-                # parse the json storing the result on the response object
-                json_ws_resp = resp.json()
-                hostname = urlparse(resp.url).hostname
-                name = json_ws_resp["Status"]["FriendlyName"][0]
-                # ip = json_ws_resp["StatusNET"]["IPAddress"]
-                dsm.NET_DEVICES.append("- " + name + ", http://" + hostname)
-                info = dsm.get_text()
-                hass.states.async_set(
-                    "sensor.network_devices_info_value", "", {"text": info}
-                )
-            except Exception:
-                pass
-
-    if url_a is not None:
-
-        def bg_cb_a(resp, *args, **kwargs):
-            try:
-                # parse the json storing the result on the response object
-                json_ws_resp = resp.json()
-                model = json_ws_resp["Model"]
-                manufacturer = json_ws_resp["Manufacturer"]
-                ip = json_ws_resp["IPAddressIPv4"]
-                mac = json_ws_resp["MacWlan0"]
-                dsm.DOM_DEVICES.append(
-                    "- " + model + " " + manufacturer + ", http://" + ip + ":8180"
-                )
-                info = dsm.get_text()
-                hass.states.async_set(
-                    "sensor.network_devices_info_value", "", {"text": info}
-                )
-                # add the device to the speakers lists
-                hass.async_add_job(
-                    hass.services.async_call(
-                        "ais_cloud",
-                        "get_players",
-                        {
-                            "device_name": model + " " + manufacturer + "(" + ip + ")",
-                            CONF_IP_ADDRESS: ip,
-                            CONF_MAC: mac,
-                        },
-                    )
-                )
-            except Exception:
-                pass
-
-    if url is not None:
-        session.get(url, hooks={"response": bg_cb})
-    if url_a is not None:
-        session.get(url_a, hooks={"response": bg_cb_a})
-
-    if url is not None:
-        await hass.services.async_call("ais_shell_command", "scan_network_for_devices")
+@callback
+def _add_dom_device(hass, host, info):
+    """Add the AIS dom device found during the network devices scan."""
+    import homeassistant.components.ais_device_search_mqtt.sensor as dsm
 
+    model = info["Model"]
+    manufacturer = info["Manufacturer"]
+    ip = info["IPAddressIPv4"]
+    mac = info["MacWlan0"]
+    dsm.DOM_DEVICES.append(
+        "- " + model + " " + manufacturer + ", http://" + ip + ":8180"
+    )
+    hass.states.async_set(
+        "sensor.network_devices_info_value", "", {"text": dsm.get_text()}
+    )
+    # add the device to the speakers lists
+    hass.async_create_task(
+        hass.services.async_call(
+            "ais_cloud",
+            "get_players",
+            {
+                "device_name": model + " " + manufacturer + "(" + ip + ")",
+                CONF_IP_ADDRESS: ip,
+                CONF_MAC: mac,
+            },
+        )
+    )
 
-async def _scan_ais_player(hass, call):
-    url = call.data["url"]
-    from requests_futures.sessions import FuturesSession
 
+@callback
+def _add_ais_player(hass, host, info):
+    """Add the AIS dom player found during the players scan."""
     import homeassistant.components.ais_device_search_mqtt.sensor as dsm
 
-    session = FuturesSession()
-
-    def bg_cb(resp, *args, **kwargs):
-        try:
-            # parse the json storing the result on the response object
-            json_ws_resp = resp.json()
-            model = json_ws_resp["Model"]
-            manufacturer = json_ws_resp["Manufacturer"]
-            ip = json_ws_resp["IPAddressIPv4"]
-            ais_gate_client_id = None
-            if "ais_gate_client_id" in json_ws_resp:
-                ais_gate_client_id = json_ws_resp.get("ais_gate_client_id")
-            if ais_gate_client_id is None and "gate_id" in json_ws_resp:
-                ais_gate_client_id = json_ws_resp.get("gate_id")
-            elif ais_gate_client_id is None and "MacWlan0" in json_ws_resp:
-                ais_gate_client_id = json_ws_resp.get("MacWlan0")
-            elif ais_gate_client_id is None and "MacEth0" in json_ws_resp:
-                ais_gate_client_id = json_ws_resp.get("MacEth0")
-            if ais_gate_client_id is None:
-                return
-            if ais_gate_client_id == ais_global.G_AIS_SECURE_ANDROID_ID_DOM:
-                return
-            dsm.DOM_DEVICES.append(
-                "- " + model + " " + manufacturer + ", http://" + ip + ":8122"
-            )
-            # add the device to the speakers lists
-            hass.async_add_job(
-                hass.services.async_call(
-                    "ais_cloud",
-                    "get_players",
-                    {
-                        "device_name": model + " " + manufacturer,
-                        CONF_IP_ADDRESS: ip,
-                        "ais_gate_client_id": ais_gate_client_id,
-                    },
-                )
-            )
+    model = info["Model"]
+    manufacturer = info["Manufacturer"]
+    ip = info["IPAddressIPv4"]
+    ais_gate_client_id = info.get("ais_gate_client_id")
+    if ais_gate_client_id is None and "gate_id" in info:
+        ais_gate_client_id = info.get("gate_id")
+    elif ais_gate_client_id is None and "MacWlan0" in info:
+        ais_gate_client_id = info.get("MacWlan0")
+    elif ais_gate_client_id is None and "MacEth0" in info:
+        ais_gate_client_id = info.get("MacEth0")
+    if ais_gate_client_id is None:
+        return
+    if ais_gate_client_id == ais_global.G_AIS_SECURE_ANDROID_ID_DOM:
+        return
+    dsm.DOM_DEVICES.append(
+        "- " + model + " " + manufacturer + ", http://" + ip + ":8122"
+    )
+    # add the device to the speakers lists
+    hass.async_create_task(
+        hass.services.async_call(
+            "ais_cloud",
+            "get_players",
+            {
+                "device_name": model + " " + manufacturer,
+                CONF_IP_ADDRESS: ip,
+                "ais_gate_client_id": ais_gate_client_id,
+            },
+        )
+    )
 
-        except Exception as e2:
-            _LOGGER.error("Exception " + str(e2))
 
+def _scan_hosts(call):
+    """Return the hosts to scan, the /24 network of this device by default."""
     try:
-        session.get(url, hooks={"response": bg_cb}, timeout=2, verify=False)
-    except Exception:
-        pass
-    await hass.services.async_call("ais_shell_command", "scan_network_for_ais_players")
+        return network_hosts(ais_global.get_my_global_ip(), call.data.get(ATTR_NETWORK))
+    except ValueError as err:
+        _LOGGER.error("Can't scan the network: %s", err)
+        return []
+
+
+async def _scan_device(hass, call):
+    session = async_get_clientsession(hass)
+    host = call.data["host"]
+    await asyncio.gather(
+        async_probe_hosts(
+            session, [host], TASMOTA_STATUS_URL, partial(_add_net_device, hass)
+        ),
+        async_probe_hosts(
+            session, [host], AIS_DEVICE_URL, partial(_add_dom_device, hass)
+        ),
+    )
+
+
+async def _scan_ais_player(hass, call):
+    session = async_get_clientsession(hass)
+    await async_probe_hosts(
+        session, [call.data["host"]], AIS_DEVICE_URL, partial(_add_ais_player, hass)
+    )
 
 
 async def _scan_network_for_ais_players(hass, call):
     import homeassistant.components.ais_device_search_mqtt.sensor as dsm
 
-    global GLOBAL_X
-    my_ip = ais_global.get_my_global_ip()
-    if GLOBAL_X == 0:
-        GLOBAL_X += 1
+    if hass.data.get(DATA_SCAN_IN_PROGRESS):
+        _LOGGER.info("The network scan is already in progress")
+        return
+    hass.data[DATA_SCAN_IN_PROGRESS] = True
+    try:
         # clear the value
         dsm.MQTT_DEVICES = []
         dsm.NET_DEVICES = []
@@ -625,32 +627,25 @@ async def _scan_network_for_ais_players(hass, call):
             await hass.services.async_call(
                 "ais_ai_service", "say_it", {"text": "Wykrywam, to potrwa chwilę..."}
             )
-        await hass.services.async_call(
-            "ais_shell_command", "scan_network_for_ais_players"
-        )
-    # 256
-    elif 0 < GLOBAL_X < 256:
-        GLOBAL_X += 1
         # search android devices
-        rest_url = "http://{}.{}:8122"
-        url = rest_url.format(my_ip.rsplit(".", 1)[0], str(GLOBAL_X))
-
-        await hass.services.async_call(
-            "ais_shell_command", "scan_ais_player", {"url": url}
+        await async_probe_hosts(
+            async_get_clientsession(hass),
+            _scan_hosts(call),
+            AIS_DEVICE_URL,
+            partial(_add_ais_player, hass),
         )
-    else:
-        GLOBAL_X = 0
-        # the search is done
+    finally:
+        hass.data[DATA_SCAN_IN_PROGRESS] = False
 
 
 async def _scan_network_for_devices(hass, call):
     import homeassistant.components.ais_device_search_mqtt.sensor as dsm
 
-    global GLOBAL_X
-    my_ip = ais_global.get_my_global_ip()
-    info = ""
-    if GLOBAL_X == 0:
-        GLOBAL_X += 1
+    if hass.data.get(DATA_SCAN_IN_PROGRESS):
+        _LOGGER.info("The network scan is already in progress")
+        return
+    hass.data[DATA_SCAN_IN_PROGRESS] = True
+    try:
         # clear the value
         dsm.MQTT_DEVICES = []
         dsm.NET_DEVICES = []
@@ -658,7 +653,7 @@ async def _scan_network_for_devices(hass, call):
         hass.states.async_set(
             "sensor.network_devices_info_value",
             "",
-            {"text": "wykrywam, to może potrwać minutę..."},
+            {"text": "wykrywam, to może potrwać chwilę..."},
         )
 
         # send the message to all robots in network
@@ -674,33 +669,26 @@ async def _scan_network_for_devices(hass, call):
             "mqtt", "publish", {"topic": "dom/cmnd/SetOption19", "payload": 1}
         )
 
-        await hass.services.async_call("ais_shell_command", "scan_network_for_devices")
-    # 256
-    elif 0 < GLOBAL_X < 256:
-        GLOBAL_X += 1
-        rest_url = "http://{}.{}/cm?cmnd=status"
-        url = rest_url.format(my_ip.rsplit(".", 1)[0], str(GLOBAL_X))
-        info = "Sprawdzam " + my_ip.rsplit(".", 1)[0]
-        info += "." + str(GLOBAL_X) + "\n"
-        info += dsm.get_text()
-        hass.states.async_set("sensor.network_devices_info_value", "", {"text": info})
-
-        # search android devices
-        rest_url_a = "http://{}.{}:8122"
-        url_a = rest_url_a.format(my_ip.rsplit(".", 1)[0], str(GLOBAL_X))
-
-        await hass.services.async_call(
-            "ais_shell_command", "scan_device", {"url": url, "url_a": url_a}
+        # search the http robots and the android devices at once
+        session = async_get_clientsession(hass)
+        hosts = _scan_hosts(call)
+        await asyncio.gather(
+            async_probe_hosts(
+                session, hosts, TASMOTA_STATUS_URL, partial(_add_net_device, hass)
+            ),
+            async_probe_hosts(
+                session, hosts, AIS_DEVICE_URL, partial(_add_dom_device, hass)
+            ),
         )
+    finally:
+        hass.data[DATA_SCAN_IN_PROGRESS] = False
 
-    else:
-        GLOBAL_X = 0
-        hass.states.async_set(
-            "sensor.network_devices_info_value", "", {"text": dsm.get_text()}
-        )
-        await hass.services.async_call(
-            "ais_ai_service", "say_it", {"text": dsm.get_text_to_say()}
-        )
+    hass.states.async_set(
+        "sensor.network_devices_info_value", "", {"text": dsm.get_text()}
+    )
+    await hass.services.async_call(
+        "ais_ai_service", "say_it", {"text": dsm.get_text_to_say()}
+    )
 
 
 async def _flush_logs(hass, call):
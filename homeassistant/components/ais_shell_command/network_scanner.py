@@ -0,0 +1,82 @@
+"""Scanner probing the local network hosts for the devices."""
+import asyncio
+import ipaddress
+import logging
+
+import aiohttp
+import async_timeout
+import voluptuous as vol
+
+_LOGGER = logging.getLogger(__name__)
+
+TASMOTA_STATUS_URL = "http://{}/cm?cmnd=status"
+AIS_DEVICE_URL = "http://{}:8122"
+
+DEFAULT_MAX_CONCURRENT = 128
+DEFAULT_PROBE_TIMEOUT = 2
+# the biggest network which can be scanned, /20
+MAX_NETWORK_ADDRESSES = 4096
+
+
+def valid_network(value):
+    """Validate the network to scan."""
+    try:
+        network = ipaddress.ip_network(value, strict=False)
+    except ValueError as err:
+        raise vol.Invalid(f"Invalid network: {err}") from err
+    if network.num_addresses > MAX_NETWORK_ADDRESSES:
+        raise vol.Invalid(f"Network {network} is too big to scan, the biggest is /20")
+    return str(network)
+
+
+def network_hosts(ip, network=None):
+    """Return the addresses of the hosts in the network, /24 of the ip by default."""
+    if network is None:
+        network = f"{ip}/24"
+    network = ipaddress.ip_network(network, strict=False)
+    if network.num_addresses > MAX_NETWORK_ADDRESSES:
+        raise ValueError(f"Network {network} is too big to scan")
+    return [str(host) for host in network.hosts()]
+
+
+async def async_probe_hosts(
+    session,
+    hosts,
+    url,
+    result_callback,
+    max_concurrent=DEFAULT_MAX_CONCURRENT,
+    timeout=DEFAULT_PROBE_TIMEOUT,
+):
+    """Get the url from all the hosts at once.
+
+    The JSON response of each host is passed to the result_callback as soon
+    as it arrives. The hosts whose response the callback can't read are
+    skipped. Return the number of the hosts which responded as expected.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    found = 0
+
+    async def probe(host):
+        """Get the url from one host."""
+        nonlocal found
+        async with semaphore:
+            try:
+                with async_timeout.timeout(timeout):
+                    async with session.get(url.format(host)) as response:
+                        response.raise_for_status()
+                        result = await response.json(content_type=None)
+            except (asyncio.TimeoutError, aiohttp.ClientError, ValueError):
+                return
+        try:
+            result_callback(host, result)
+        except (KeyError, IndexError, TypeError):
+            # some other device answering with JSON
+            _LOGGER.debug("Unexpected response from %s: %s", host, result)
+            return
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error processing the response from %s", host)
+            return
+        found += 1
+
+    await asyncio.gather(*(probe(host) for host in hosts))
+    return found
@@ -160,8 +160,8 @@ async def async_unload_entry(hass, config_entry):
     except Exception as e:
         _LOGGER.error("Error removing token cache file " + str(e))
     try:
-        ws_resp = aisCloud.delete_key("spotify_token")
-        key = ws_resp.json()["key"]
+        json_ws_resp = await aisCloud.async_delete_key("spotify_token")
+        key = json_ws_resp["key"]
         _LOGGER.info("Token from AIS cloud removed " + str(key))
     except Exception as e:
         _LOGGER.error("Error removing token from cloud " + str(e))
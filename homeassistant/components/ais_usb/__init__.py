@@ -159,6 +159,19 @@ async def async_setup(hass, config):
                     hass.async_add_job(
                         hass.services.async_call("ais_usb", "ls_flash_drives")
                     )
+                    # index the media on the drive
+                    if hass.services.has_service("ais_drives_service", "index_media"):
+                        hass.async_add_job(
+                            hass.services.async_call(
+                                "ais_drives_service",
+                                "index_media",
+                                {
+                                    "path": ais_global.G_REMOTE_DRIVES_DOM_PATH
+                                    + "/dysk_"
+                                    + str(drive_id)
+                                },
+                            )
+                        )
                 except Exception as e:
                     _LOGGER.error("mount_external_drives" + str(e))
 
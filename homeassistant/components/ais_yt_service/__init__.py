@@ -5,13 +5,18 @@ import asyncio
 import json
 import logging
 
-import requests
+import async_timeout
 
 from homeassistant.components import ais_cloud, ais_updater
 from homeassistant.components.ais_dom import ais_global
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.async_ import run_callback_threadsafe
+
+from .search_cache import YouTubeCache
 
 aisCloud = None
 URL_BASE = "https://www.googleapis.com/youtube/v3/search"
+SEARCH_TIMEOUT = 10
 DEFAULT_ACTION = "No video"
 
 DOMAIN = "ais_yt_service"
@@ -27,6 +32,7 @@ async def async_setup(hass, config):
     aisCloud = ais_cloud.AisCloudWS(hass)
     """Register the service."""
     data = hass.data[DOMAIN] = YouTubeData(hass)
+    await data.cache.async_load()
     await data.async_get_key(hass)
 
     async def async_search(service):
@@ -51,6 +57,7 @@ class YouTubeData:
         """Initialize the radio stations."""
         self.hass = hass
         self.yt_key = None
+        self.cache = YouTubeCache(hass)
 
     async def async_get_key(self, hass):
         try:
@@ -114,12 +121,26 @@ class YouTubeData:
             )
             return
 
-        if self.yt_key is None:
+        page_token = next_page_token or prev_page_token
+        data = self.cache.async_get_page(query, page_token)
+        if data is None:
+            if self.yt_key is None:
+                try:
+                    json_ws_resp = await aisCloud.async_key("ytsearch")
+                    self.yt_key = json_ws_resp["key"]
+                except Exception as e:
+                    ais_global.G_OFFLINE_MODE = True
+                    await self.hass.services.async_call(
+                        "ais_ai_service",
+                        "say_it",
+                        {"text": "Brak odpowiedzi, sprawdź połączenie z Intenetem"},
+                    )
+                    _LOGGER.error("process_search_async " + str(e))
+                    return
+
             try:
-                json_ws_resp = await aisCloud.async_key("ytsearch")
-                self.yt_key = json_ws_resp["key"]
+                data = await self.async_fetch_page(query, page_token)
             except Exception as e:
-                ais_global.G_OFFLINE_MODE = True
                 await self.hass.services.async_call(
                     "ais_ai_service",
                     "say_it",
@@ -127,22 +148,8 @@ class YouTubeData:
                 )
                 _LOGGER.error("process_search_async " + str(e))
                 return
-
-        params = dict(
-            order="relevance",
-            part="snippet",
-            key=self.yt_key,
-            maxResults=10,
-            type="video",
-            fields="items/id/videoId, items/snippet/title, items/snippet/thumbnails/medium/url, "
-            "pageInfo/totalResults, nextPageToken, prevPageToken",
-        )
-        params.update({"q": query})
-        if prev_page_token is not None:
-            params.update({"pageToken": prev_page_token})
-        if next_page_token is not None:
-            params.update({"pageToken": next_page_token})
-        data = requests.get(URL_BASE, params=params).json()
+            if "error" not in data:
+                self.cache.async_set_page(query, page_token, data)
 
         # check if error
         if "error" in data:
@@ -163,6 +170,14 @@ class YouTubeData:
             )
             return
 
+        # get the next page while the user listens
+        if "nextPageToken" in data and not self.cache.async_has_page(
+            query, data["nextPageToken"]
+        ):
+            self.hass.async_create_task(
+                self.async_prefetch_page(query, data["nextPageToken"])
+            )
+
         list_info = {}
         list_idx = 0
 
@@ -266,6 +281,35 @@ class YouTubeData:
                 "ais_ai_service", "say_it", {"text": text}
             )
 
+    async def async_fetch_page(self, query, page_token):
+        """Get the search page from YouTube."""
+        params = dict(
+            order="relevance",
+            part="snippet",
+            key=self.yt_key,
+            maxResults=10,
+            type="video",
+            fields="items/id/videoId, items/snippet/title, items/snippet/thumbnails/medium/url, "
+            "pageInfo/totalResults, nextPageToken, prevPageToken",
+        )
+        params.update({"q": query})
+        if page_token is not None:
+            params.update({"pageToken": page_token})
+        web_session = async_get_clientsession(self.hass)
+        with async_timeout.timeout(SEARCH_TIMEOUT):
+            ws_resp = await web_session.get(URL_BASE, params=params)
+            return await ws_resp.json()
+
+    async def async_prefetch_page(self, query, page_token):
+        """Get the search page to the cache."""
+        try:
+            data = await self.async_fetch_page(query, page_token)
+        except Exception as e:
+            _LOGGER.debug("Can't prefetch the search page: " + str(e))
+            return
+        if "error" not in data:
+            self.cache.async_set_page(query, page_token, data)
+
     def process_select_track_uri(self, call):
         _LOGGER.debug("process_select_track_uri")
         # """play track by id on sensor list."""
@@ -303,37 +347,27 @@ class YouTubeData:
             )
             return
 
-        # try to get media url from AIS cloud
-        media_url = None
-        try:
-            local_extractor_version = ais_updater.get_package_version("youtube_dl")
-            ws_resp = aisCloud.extract_media(
-                url + track["uri"], local_extractor_version
-            )
-            json_ws_resp = ws_resp.json()
-            cloud_extractor_version = json_ws_resp["extractor_version"]
-            if "youtube_dl==" + cloud_extractor_version != local_extractor_version:
-                self.hass.services.call(
-                    "ais_updater",
-                    "upgrade_package",
-                    {"package": "youtube_dl", "version": cloud_extractor_version},
-                )
-            media_url = json_ws_resp["url"]
-        except Exception as e:
-            # currently this is normal case
-            _LOGGER.debug("extract_media Exception: " + str(e))
-
-        all_ok = False
-        if media_url is not None and len(media_url) > 0:
-            # check 403
-            import requests
-
-            try:
-                r = requests.head(media_url, allow_redirects=True, timeout=1)
-                if r.status_code < 400:
-                    all_ok = True
-            except Exception as e:
-                _LOGGER.warning("Request to youtube error " + str(e))
+        # the stream url resolved when the track was played before
+        media_url = run_callback_threadsafe(
+            self.hass.loop, self.cache.async_get_stream, track["uri"]
+        ).result()
+        all_ok = media_url is not None
+        if not all_ok:
+            media_url = self.extract_media_url(url + track["uri"])
+            if media_url is not None and len(media_url) > 0:
+                # check 403
+                import requests
+
+                try:
+                    r = requests.head(media_url, allow_redirects=True, timeout=1)
+                    if r.status_code < 400:
+                        all_ok = True
+                except Exception as e:
+                    _LOGGER.warning("Request to youtube error " + str(e))
+            if all_ok:
+                run_callback_threadsafe(
+                    self.hass.loop, self.cache.async_set_stream, track["uri"], media_url
+                ).result()
 
         if all_ok:
             # set stream url, image and title
@@ -386,3 +420,25 @@ class YouTubeData:
                     "media_content_id": _audio_info,
                 },
             )
+
+    def extract_media_url(self, video_url):
+        """Return the stream url of the video from AIS cloud."""
+        media_url = None
+        try:
+            local_extractor_version = ais_updater.get_package_version("youtube_dl")
+            json_ws_resp = asyncio.run_coroutine_threadsafe(
+                aisCloud.async_extract_media(video_url, local_extractor_version),
+                self.hass.loop,
+            ).result()
+            cloud_extractor_version = json_ws_resp["extractor_version"]
+            if "youtube_dl==" + cloud_extractor_version != local_extractor_version:
+                self.hass.services.call(
+                    "ais_updater",
+                    "upgrade_package",
+                    {"package": "youtube_dl", "version": cloud_extractor_version},
+                )
+            media_url = json_ws_resp["url"]
+        except Exception as e:
+            # currently this is normal case
+            _LOGGER.debug("extract_media Exception: " + str(e))
+        return media_url
@@ -0,0 +1,127 @@
+"""Persistent cache of the YouTube search pages and stream URLs."""
+from collections import OrderedDict
+import time
+from urllib.parse import parse_qs, urlparse
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+STORAGE_KEY = "ais_yt_service.cache"
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+MAX_PAGES = 200
+PAGE_TTL = 24 * 3600
+MAX_STREAMS = 200
+# used when the stream URL does not say when it expires
+STREAM_TTL = 3600
+# the stream URL is not used this close to its expiry
+STREAM_EXPIRY_MARGIN = 600
+
+
+def _page_key(query, page_token):
+    """Return the key of the search page."""
+    return f"{(query or '').strip().casefold()}\n{page_token or ''}"
+
+
+def _stream_expires(url):
+    """Return when the stream URL expires."""
+    expire = parse_qs(urlparse(url).query).get("expire")
+    try:
+        return float(expire[0]) - STREAM_EXPIRY_MARGIN
+    except (TypeError, ValueError):
+        return time.time() + STREAM_TTL
+
+
+class YouTubeCache:
+    """LRU caches of the search pages and the stream URLs of the videos.
+
+    The search pages are kept by the query and the page token for a day,
+    the stream URLs until they expire. The least recently used entries are
+    dropped when a cache is full. Both caches are saved in the storage.
+    """
+
+    def __init__(self, hass):
+        """Initialize the cache."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY, compact=True)
+        self._pages = OrderedDict()
+        self._streams = OrderedDict()
+
+    async def async_load(self):
+        """Load the cached entries which did not expire."""
+        data = await self._store.async_load()
+        if data is None:
+            return
+        now = time.time()
+        for key, entry in data.get("pages", []):
+            if entry["expires"] > now:
+                self._pages[key] = entry
+        for video_id, entry in data.get("streams", []):
+            if entry["expires"] > now:
+                self._streams[video_id] = entry
+
+    @callback
+    def async_get_page(self, query, page_token):
+        """Return the cached search page, or None."""
+        return self._async_get(self._pages, _page_key(query, page_token))
+
+    @callback
+    def async_set_page(self, query, page_token, data):
+        """Cache the search page."""
+        self._async_set(
+            self._pages,
+            MAX_PAGES,
+            _page_key(query, page_token),
+            {"data": data, "expires": time.time() + PAGE_TTL},
+        )
+
+    @callback
+    def async_has_page(self, query, page_token):
+        """Return True if the search page is cached, without using it."""
+        entry = self._pages.get(_page_key(query, page_token))
+        return entry is not None and entry["expires"] > time.time()
+
+    @callback
+    def async_get_stream(self, video_id):
+        """Return the cached stream URL of the video, or None."""
+        return self._async_get(self._streams, video_id)
+
+    @callback
+    def async_set_stream(self, video_id, url):
+        """Cache the stream URL of the video."""
+        self._async_set(
+            self._streams,
+            MAX_STREAMS,
+            video_id,
+            {"data": url, "expires": _stream_expires(url)},
+        )
+
+    @callback
+    def _async_get(self, entries, key):
+        """Return the data of the entry and mark it as recently used."""
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires"] <= time.time():
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return entry["data"]
+
+    @callback
+    def _async_set(self, entries, max_entries, key, entry):
+        """Add the entry, drop the least recently used ones over the limit."""
+        entries[key] = entry
+        entries.move_to_end(key)
+        while len(entries) > max_entries:
+            entries.popitem(last=False)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self):
+        """Return the entries to save, from the least recently used."""
+        return {
+            "pages": list(self._pages.items()),
+            "streams": list(self._streams.items()),
+        }
@@ -16,9 +16,12 @@ from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
     States,
+    Statistics,
+    StatisticsShortTerm,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.statistics import statistics_during_period
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     CONF_DOMAINS,
@@ -26,12 +29,15 @@ from homeassistant.const import (
     CONF_EXCLUDE,
     CONF_INCLUDE,
     HTTP_BAD_REQUEST,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
 )
 from homeassistant.core import Context, State, split_entity_id
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
+    generate_filter,
 )
 from homeassistant.helpers.typing import HomeAssistantType
 import homeassistant.util.dt as dt_util
@@ -60,6 +66,8 @@ CONFIG_SCHEMA = vol.Schema(
     extra=vol.ALLOW_EXTRA,
 )
 
+# the states kept between the statistics of a sensor
+OUTAGE_STATES = (STATE_UNAVAILABLE, STATE_UNKNOWN)
 SIGNIFICANT_DOMAINS = (
     "climate",
     "device_tracker",
@@ -86,6 +94,10 @@ QUERY_STATES = [
 
 HISTORY_BAKERY = "history_bakery"
 
+# the longer periods are served from the statistics of the numeric sensors
+STATISTICS_SHORT_TERM_RANGE = timedelta(days=1)
+STATISTICS_RANGE = timedelta(days=7)
+
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
@@ -103,6 +115,7 @@ def _get_significant_states(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    statistics_table=None,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -110,9 +123,23 @@ def _get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    With a statistics table the numeric sensors are given by the means
+    of the statistics periods instead of their states.
     """
     timer_start = time.perf_counter()
 
+    statistics = {}
+    if statistics_table is not None:
+        statistics = _get_statistics(
+            session,
+            statistics_table,
+            start_time,
+            end_time or dt_util.utcnow(),
+            entity_ids,
+            filters,
+        )
+
     baked_query = hass.data[HISTORY_BAKERY](
         lambda session: session.query(*QUERY_STATES)
     )
@@ -140,11 +167,33 @@ def _get_significant_states(
     if end_time is not None:
         baked_query += lambda q: q.filter(States.last_updated < bindparam("end_time"))
 
+    if statistics:
+        # the states of each entity are replaced by its statistics up to the
+        # end of its last period, except for the outages
+        cutoffs = defaultdict(list)
+        for entity_id, rows in statistics.items():
+            cutoff = process_timestamp(rows[-1].start) + statistics_table.period
+            cutoffs[cutoff].append(entity_id)
+        # the cutoffs are not cached, the steps before are
+        baked_query.spoil()
+        baked_query += lambda q: q.filter(
+            States.state.in_(OUTAGE_STATES)
+            | ~or_(
+                *(
+                    States.entity_id.in_(cutoff_entity_ids)
+                    & (States.last_updated < cutoff)
+                    for cutoff, cutoff_entity_ids in cutoffs.items()
+                )
+            )
+        )
+
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
     states = execute(
         baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
+            start_time=start_time,
+            end_time=end_time,
+            entity_ids=entity_ids,
         )
     )
 
@@ -152,7 +201,7 @@ def _get_significant_states(
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("get_significant_states took %fs", elapsed)
 
-    return _sorted_states_to_json(
+    result = _sorted_states_to_json(
         hass,
         session,
         states,
@@ -162,6 +211,90 @@ def _get_significant_states(
         include_start_time_state,
         minimal_response,
     )
+    if statistics:
+        result = _add_statistics(
+            hass, result, statistics, start_time, entity_ids, minimal_response
+        )
+    return result
+
+
+def _get_statistics(session, table, start_time, end_time, entity_ids, filters):
+    """Return the statistics of the entities passing the filters."""
+    statistics = statistics_during_period(
+        session, table, start_time, end_time, entity_ids
+    )
+    if entity_ids is None and filters:
+        entity_filter = filters.entity_matcher()
+        statistics = {
+            entity_id: rows
+            for entity_id, rows in statistics.items()
+            if entity_filter(entity_id)
+        }
+    return statistics
+
+
+def _add_statistics(hass, result, statistics, start_time, entity_ids, minimal_response):
+    """Merge the statistics of the entities into their states.
+
+    The states of the entities were queried only after their statistics,
+    except for the outages, which are put between the statistics.
+    """
+    for entity_id, rows in statistics.items():
+        states = result.get(entity_id, [])
+        full_state = next(
+            (state for state in states if isinstance(state, State)),
+            hass.states.get(entity_id),
+        )
+        attributes = full_state.attributes if full_state is not None else {}
+
+        points = [(_point_time(state), state) for state in states]
+        for row in rows:
+            start = process_timestamp(row.start)
+            points.append(
+                (start, State(entity_id, f"{row.mean:g}", attributes, start, start))
+            )
+        # the states go before the statistics starting at the same time
+        points.sort(key=lambda point: point[0])
+
+        states = [
+            _full_state(entity_id, point, changed, attributes)
+            for changed, point in points
+        ]
+        if minimal_response:
+            # only the first and the last state are full states
+            states[1:-1] = [_minimal_state(state) for state in states[1:-1]]
+        result[entity_id] = states
+
+    if entity_ids is not None:
+        # Keep the order of the requested entities
+        result = {
+            entity_id: result[entity_id]
+            for entity_id in entity_ids
+            if entity_id in result
+        }
+    return result
+
+
+def _point_time(point):
+    """Return when the state or the minimal state changed."""
+    if isinstance(point, State):
+        return point.last_changed
+    return dt_util.parse_datetime(point[LAST_CHANGED_KEY])
+
+
+def _full_state(entity_id, point, changed, attributes):
+    """Return the state or the minimal state as a state."""
+    if isinstance(point, State):
+        return point
+    return State(entity_id, point[STATE_KEY], attributes, changed, changed)
+
+
+def _minimal_state(state):
+    """Return the state as a minimal state."""
+    return {
+        STATE_KEY: state.state,
+        LAST_CHANGED_KEY: process_timestamp_to_utc_isoformat(state.last_changed),
+    }
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
@@ -503,6 +636,13 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app["hass"]
 
+        statistics_table = None
+        if significant_changes_only:
+            if end_time - start_time > STATISTICS_RANGE:
+                statistics_table = Statistics
+            elif end_time - start_time > STATISTICS_SHORT_TERM_RANGE:
+                statistics_table = StatisticsShortTerm
+
         if (
             not include_start_time_state
             and entity_ids
@@ -521,6 +661,7 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                statistics_table,
             ),
         )
 
@@ -533,6 +674,7 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        statistics_table,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
@@ -548,6 +690,7 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                statistics_table,
             )
 
         result = list(result.values())
@@ -623,6 +766,17 @@ class Filters:
 
         return False
 
+    def entity_matcher(self):
+        """Return a function matching the entity ids passing the filter."""
+        return generate_filter(
+            self.included_domains,
+            self.included_entities,
+            self.excluded_domains,
+            self.excluded_entities,
+            self.included_entity_globs,
+            self.excluded_entity_globs,
+        )
+
     def bake(self, baked_query):
         """Update a baked query.
 
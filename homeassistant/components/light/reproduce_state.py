@@ -1,8 +1,7 @@
 """Reproduce an Light state."""
-import asyncio
 import logging
 from types import MappingProxyType
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -70,25 +69,23 @@ DEPRECATION_WARNING = (
 )
 
 
-async def _async_reproduce_state(
+def _reproduce_service_call(
     hass: HomeAssistantType,
     state: State,
-    *,
-    context: Optional[Context] = None,
     reproduce_options: Optional[Dict[str, Any]] = None,
-) -> None:
-    """Reproduce a single state."""
+) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+    """Return the service call reproducing a single state."""
     cur_state = hass.states.get(state.entity_id)
 
     if cur_state is None:
         _LOGGER.warning("Unable to find entity %s", state.entity_id)
-        return
+        return None
 
     if state.state not in VALID_STATES:
         _LOGGER.warning(
             "Invalid state specified for %s: %s", state.entity_id, state.state
         )
-        return
+        return None
 
     # Warn if deprecated attributes are used
     deprecated_attrs = [attr for attr in state.attributes if attr in DEPRECATED_GROUP]
@@ -100,7 +97,7 @@ async def _async_reproduce_state(
         check_attr_equal(cur_state.attributes, state.attributes, attr)
         for attr in ATTR_GROUP + COLOR_GROUP
     ):
-        return
+        return None
 
     service_data: Dict[str, Any] = {ATTR_ENTITY_ID: state.entity_id}
 
@@ -123,9 +120,7 @@ async def _async_reproduce_state(
     elif state.state == STATE_OFF:
         service = SERVICE_TURN_OFF
 
-    await hass.services.async_call(
-        DOMAIN, service, service_data, context=context, blocking=True
-    )
+    return DOMAIN, service, service_data
 
 
 async def async_reproduce_states(
@@ -136,13 +131,11 @@ async def async_reproduce_states(
     reproduce_options: Optional[Dict[str, Any]] = None,
 ) -> None:
     """Reproduce Light states."""
-    await asyncio.gather(
-        *(
-            _async_reproduce_state(
-                hass, state, context=context, reproduce_options=reproduce_options
-            )
-            for state in states
-        )
+    calls = [
+        _reproduce_service_call(hass, state, reproduce_options) for state in states
+    ]
+    await hass.services.async_call_many(
+        [call for call in calls if call is not None], blocking=True, context=context
     )
 
 
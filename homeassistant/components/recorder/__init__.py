@@ -17,12 +17,16 @@ import voluptuous as vol
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
+    ATTR_UNIT_OF_MEASUREMENT,
     CONF_EXCLUDE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_STATE_CHANGED,
     EVENT_TIME_CHANGED,
     MATCH_ALL,
+    TIME_MILLISECONDS,
 )
 from homeassistant.core import CoreState, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
@@ -36,8 +40,10 @@ import homeassistant.util.dt as dt_util
 
 from . import migration, purge
 from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, RecorderRuns
+from .statistics import StatisticsCompiler
 from .util import session_scope, validate_or_move_away_sqlite_database
+from .writer import BatchWriter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,6 +71,18 @@ KEEPALIVE_TIME = 30
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# Commit before the batch of rows grows larger
+MAX_BATCH_ROWS = 5000
+# The commit window is stretched to keep the commits
+# under this share of the recorder time
+COMMIT_TIME_SHARE = 0.1
+MAX_COMMIT_INTERVAL = 300
+
+ENTITY_ID_QUEUE_LENGTH = "sensor.recorder_queue_length"
+ENTITY_ID_COMMIT_LATENCY = "sensor.recorder_commit_latency"
+RECORDER_SENSORS = (ENTITY_ID_QUEUE_LENGTH, ENTITY_ID_COMMIT_LATENCY)
+SENSORS_UPDATE_INTERVAL = 10
+
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -280,10 +298,12 @@ class Recorder(threading.Thread):
         self.exclude_t = exclude_t
 
         self._timechanges_seen = 0
+        self._commit_window = commit_interval
         self._commits_without_expire = 0
         self._keepalive_count = 0
-        self._old_states = {}
-        self._pending_expunge = []
+        self._sensors_updated = None
+        self._writer = BatchWriter()
+        self._statistics = StatisticsCompiler()
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -392,9 +412,14 @@ class Recorder(threading.Thread):
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
         # Use a session for the event read loop
-        # with a commit every time the event time
-        # has changed. This reduces the disk io.
+        # with a commit every time the commit window
+        # has passed. This reduces the disk io.
         while True:
+            # If they do not have a commit interval
+            # than we commit as soon as the queue is empty,
+            # the events arriving meanwhile are batched
+            if not self.commit_interval and self._writer and self.queue.empty():
+                self._commit_event_session_or_retry()
             event = self.queue.get()
             if event is None:
                 self._close_run()
@@ -406,6 +431,8 @@ class Recorder(threading.Thread):
                     self.queue.put(PurgeTask(event.keep_days, event.repack))
                 continue
             if isinstance(event, WaitTask):
+                if not self.commit_interval:
+                    self._commit_event_session_or_retry()
                 self._queue_watch.set()
                 continue
             if event.event_type == EVENT_TIME_CHANGED:
@@ -415,8 +442,7 @@ class Recorder(threading.Thread):
                     self._send_keep_alive()
                 if self.commit_interval:
                     self._timechanges_seen += 1
-                    if self._timechanges_seen >= self.commit_interval:
-                        self._timechanges_seen = 0
+                    if self._timechanges_seen >= self._commit_window:
                         self._commit_event_session_or_retry()
                 continue
             if event.event_type in self.exclude_t:
@@ -426,38 +452,28 @@ class Recorder(threading.Thread):
             if entity_id is not None:
                 if not self.entity_filter(entity_id):
                     continue
+                # The recorder sensors would be recorded on every commit
+                if entity_id in RECORDER_SENSORS:
+                    continue
 
+            event_index = None
             try:
                 if event.event_type == EVENT_STATE_CHANGED:
-                    dbevent = Events.from_event(event, event_data="{}")
+                    event_index = self._writer.add_event(event, event_data="{}")
                 else:
-                    dbevent = Events.from_event(event)
-                dbevent.created = event.time_fired
-                self.event_session.add(dbevent)
+                    event_index = self._writer.add_event(event)
             except (TypeError, ValueError):
                 _LOGGER.warning("Event is not JSON serializable: %s", event)
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error adding event: %s", err)
 
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
+            if event_index is not None and event.event_type == EVENT_STATE_CHANGED:
                 try:
-                    dbstate = States.from_event(event)
-                    has_new_state = event.data.get("new_state")
-                    if dbstate.entity_id in self._old_states:
-                        old_state = self._old_states.pop(dbstate.entity_id)
-                        if old_state.state_id:
-                            dbstate.old_state_id = old_state.state_id
-                        else:
-                            dbstate.old_state = old_state
-                    if not has_new_state:
-                        dbstate.state = None
-                    dbstate.event = dbevent
-                    dbstate.created = event.time_fired
-                    self.event_session.add(dbstate)
-                    if has_new_state:
-                        self._old_states[dbstate.entity_id] = dbstate
-                        self._pending_expunge.append(dbstate)
+                    self._writer.add_state(event, event_index)
+                    self._statistics.add_state(
+                        entity_id, event.data.get("new_state"), event.time_fired
+                    )
                 except (TypeError, ValueError):
                     _LOGGER.warning(
                         "State is not JSON serializable: %s",
@@ -467,9 +483,7 @@ class Recorder(threading.Thread):
                     # Must catch the exception to prevent the loop from collapsing
                     _LOGGER.exception("Error adding state change: %s", err)
 
-            # If they do not have a commit interval
-            # than we commit right away
-            if not self.commit_interval:
+            if len(self._writer) >= MAX_BATCH_ROWS:
                 self._commit_event_session_or_retry()
 
     def _send_keep_alive(self):
@@ -541,22 +555,36 @@ class Recorder(threading.Thread):
 
     def _commit_event_session(self):
         self._commits_without_expire += 1
+        self._timechanges_seen = 0
+        commit_start = time.monotonic()
 
         try:
-            if self._pending_expunge:
-                self.event_session.flush()
-                for dbstate in self._pending_expunge:
-                    # Expunge the state so its not expired
-                    # until we use it later for dbstate.old_state
-                    if dbstate in self.event_session:
-                        self.event_session.expunge(dbstate)
-                self._pending_expunge = []
+            self.event_session.add_all(self._statistics.compile(dt_util.utcnow()))
+            self._writer.flush(self.event_session)
             self.event_session.commit()
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            # The rows are rolled back like the objects of the session
+            self._writer.discard()
             raise
 
+        self._writer.clear()
+        commit_latency = time.monotonic() - commit_start
+        if self.commit_interval:
+            self._commit_window = min(
+                MAX_COMMIT_INTERVAL,
+                max(self.commit_interval, commit_latency / COMMIT_TIME_SHARE),
+            )
+        if (
+            self._sensors_updated is None
+            or commit_start - self._sensors_updated >= SENSORS_UPDATE_INTERVAL
+        ):
+            self._sensors_updated = commit_start
+            self.hass.add_job(
+                self._async_update_sensors, self.queue.qsize(), commit_latency
+            )
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -564,6 +592,29 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    @callback
+    def _async_update_sensors(self, queue_length, commit_latency):
+        """Update the sensors of the recorder load."""
+        self.hass.states.async_set(
+            ENTITY_ID_QUEUE_LENGTH,
+            queue_length,
+            {
+                ATTR_FRIENDLY_NAME: "Recorder queue length",
+                ATTR_UNIT_OF_MEASUREMENT: "events",
+                ATTR_ICON: "mdi:tray-full",
+            },
+        )
+        self.hass.states.async_set(
+            ENTITY_ID_COMMIT_LATENCY,
+            round(commit_latency * 1000),
+            {
+                ATTR_FRIENDLY_NAME: "Recorder commit latency",
+                ATTR_UNIT_OF_MEASUREMENT: TIME_MILLISECONDS,
+                ATTR_ICON: "mdi:database-clock",
+                "commit_window": round(self._commit_window, 1),
+            },
+        )
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
@@ -7,7 +7,8 @@ from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
+from .models import Events, RecorderRuns, States, Statistics, StatisticsShortTerm
+from .statistics import SHORT_TERM_KEEP_DAYS, STATISTICS_KEEP_DAYS
 from .util import execute, session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -72,6 +73,21 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             )
             _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
+            # Statistics have a row per period, no need to batch them either
+            for table, keep_days in (
+                (StatisticsShortTerm, SHORT_TERM_KEEP_DAYS),
+                (Statistics, STATISTICS_KEEP_DAYS),
+            ):
+                keep_before = dt_util.utcnow() - timedelta(
+                    days=max(purge_days, keep_days)
+                )
+                deleted_rows = (
+                    session.query(table)
+                    .filter(table.start < keep_before)
+                    .delete(synchronize_session=False)
+                )
+                _LOGGER.debug("Deleted %s %s", deleted_rows, table.__tablename__)
+
         if repack:
             # Execute sqlite or postgresql vacuum command to free up space on disk
             if instance.engine.driver in ("pysqlite", "postgresql"):
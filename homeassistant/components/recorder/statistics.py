@@ -0,0 +1,152 @@
+"""Downsampled statistics of the numeric sensors."""
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+import homeassistant.util.dt as dt_util
+
+from .models import Statistics, StatisticsShortTerm
+
+STATISTICS_DOMAINS = ("sensor",)
+# the statistics are kept longer than the states they were compiled from
+SHORT_TERM_KEEP_DAYS = 10
+STATISTICS_KEEP_DAYS = 365
+
+
+def numeric_state(state):
+    """Return the numeric value of the sensor state, None if it has none."""
+    if state is None or state.domain not in STATISTICS_DOMAINS:
+        return None
+    if ATTR_UNIT_OF_MEASUREMENT not in state.attributes:
+        return None
+    try:
+        return float(state.state)
+    except ValueError:
+        return None
+
+
+class PeriodStatistics:
+    """Time-weighted statistics of one sensor in one period."""
+
+    __slots__ = ("start", "end", "min", "max", "area", "duration", "value", "time")
+
+    def __init__(self, start, end, value, time):
+        """Start the period, the value is the sensor value at the time."""
+        self.start = start
+        self.end = end
+        self.min = value
+        self.max = value
+        self.area = 0.0
+        self.duration = 0.0
+        self.value = value
+        self.time = time
+
+    def add(self, value, time):
+        """Add the sensor value from the time, None ends the value."""
+        self._close(time)
+        if value is not None:
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+        self.value = value
+
+    def _close(self, time):
+        """Count the current value up to the time."""
+        if self.value is not None and time > self.time:
+            self.area += self.value * (time - self.time)
+            self.duration += time - self.time
+        self.time = max(time, self.time)
+
+    def finish(self):
+        """Count the current value up to the end of the period."""
+        self._close(self.end)
+
+    @property
+    def mean(self):
+        """Return the time-weighted mean of the period."""
+        if self.duration:
+            return self.area / self.duration
+        return self.value
+
+
+class StatisticsCompiler:
+    """Compile the statistics of the numeric sensors from their states.
+
+    The statistics of the periods in progress are kept in memory. The rows
+    of the periods which ended are returned by compile, to be committed
+    together with the states.
+    """
+
+    def __init__(self, tables=(StatisticsShortTerm, Statistics)):
+        """Initialize the compiler."""
+        self._tables = [(table, table.period.total_seconds(), {}) for table in tables]
+        self._finished = []
+
+    def add_state(self, entity_id, state, time):
+        """Add the state of the entity, the state is None when it was removed."""
+        value = numeric_state(state)
+        timestamp = time.timestamp()
+        for table, period, periods in self._tables:
+            current = periods.get(entity_id)
+            if current is not None:
+                self._roll(table, period, periods, entity_id, timestamp)
+                current = periods.get(entity_id)
+            if current is not None:
+                current.add(value, timestamp)
+                if value is None and not current.duration:
+                    # the sensor had no numeric value in the period
+                    del periods[entity_id]
+            elif value is not None:
+                start = timestamp - timestamp % period
+                periods[entity_id] = PeriodStatistics(
+                    start, start + period, value, timestamp
+                )
+
+    def compile(self, now):
+        """Return the rows of the periods which ended before now."""
+        timestamp = now.timestamp()
+        for table, period, periods in self._tables:
+            for entity_id in list(periods):
+                self._roll(table, period, periods, entity_id, timestamp)
+        finished = self._finished
+        self._finished = []
+        return finished
+
+    def _roll(self, table, period, periods, entity_id, timestamp):
+        """Finish the periods of the entity which ended before the timestamp."""
+        current = periods[entity_id]
+        while current.end <= timestamp:
+            current.finish()
+            if current.duration:
+                self._finished.append(
+                    table(
+                        entity_id=entity_id,
+                        start=dt_util.utc_from_timestamp(current.start),
+                        mean=current.mean,
+                        min=current.min,
+                        max=current.max,
+                    )
+                )
+            if current.value is None:
+                del periods[entity_id]
+                return
+            # the sensor keeps its value in the next period
+            current = periods[entity_id] = PeriodStatistics(
+                current.end, current.end + period, current.value, current.end
+            )
+
+
+def statistics_during_period(session, table, start_time, end_time, entity_ids=None):
+    """Return the statistics of the periods starting in start_time - end_time.
+
+    The statistics are grouped by the entity_id and sorted by the start.
+    """
+    query = session.query(table).filter(
+        (table.start >= start_time) & (table.start < end_time)
+    )
+    if entity_ids is not None:
+        query = query.filter(table.entity_id.in_(entity_ids))
+    query = query.order_by(table.entity_id, table.start)
+
+    result = {}
+    for row in query:
+        result.setdefault(row.entity_id, []).append(row)
+    return result
@@ -0,0 +1,124 @@
+"""Batched writes of the recorded events and states."""
+from sqlalchemy import bindparam, func
+
+from .models import Events, States
+
+# the old states in the batch are linked after the states are inserted
+_LINK_OLD_STATES = (
+    States.__table__.update()
+    .where(States.state_id == bindparam("b_state_id"))
+    .values(old_state_id=bindparam("b_old_state_id"))
+)
+
+
+def _insert_rows(session, id_column, rows):
+    """Insert the rows with a single executemany and read back their ids.
+
+    The ids are given by the database, they are read back in the order of
+    the rows, the recorder being the only writer of its tables.
+    """
+    last_id = session.query(func.max(id_column)).scalar() or 0
+    session.execute(id_column.table.insert(), rows)
+    ids = [
+        row_id
+        for (row_id,) in session.query(id_column)
+        .filter(id_column > last_id)
+        .order_by(id_column)
+    ]
+    if len(ids) != len(rows):
+        raise RuntimeError(
+            f"Inserted {len(rows)} rows in {id_column.table}, found {len(ids)}"
+        )
+    for row, row_id in zip(rows, ids):
+        row[id_column.key] = row_id
+
+
+class BatchWriter:
+    """Rows of the events and states waiting for the commit.
+
+    The rows of each table are inserted with a single executemany, the ids
+    are given by the database and read back after the insert. The states
+    refer to the events inserted before them, the old states inserted in
+    the same batch are linked by a single executemany update.
+    """
+
+    def __init__(self):
+        """Initialize the writer."""
+        self.events = []
+        self.states = []
+        # the indexes of the event and of the old state of each state row
+        self._state_refs = []
+        # the ids of the last committed states, by entity
+        self._old_state_ids = {}
+        # the index of the last state of each entity, None if it was removed
+        self._pending_old_states = {}
+
+    def __len__(self):
+        """Return the number of rows waiting for the commit."""
+        return len(self.events) + len(self.states)
+
+    def add_event(self, event, event_data=None):
+        """Add the event and return its index in the batch."""
+        row = Events.row_from_event(event, event_data)
+        row["created"] = event.time_fired
+        self.events.append(row)
+        return len(self.events) - 1
+
+    def add_state(self, event, event_index):
+        """Add the state of the state_changed event."""
+        row = States.row_from_event(event)
+        entity_id = row["entity_id"]
+        row["created"] = event.time_fired
+        if entity_id in self._pending_old_states:
+            old_state_index = self._pending_old_states[entity_id]
+            row["old_state_id"] = None
+        else:
+            old_state_index = None
+            row["old_state_id"] = self._old_state_ids.get(entity_id)
+        self._state_refs.append((event_index, old_state_index))
+        if event.data.get("new_state"):
+            self._pending_old_states[entity_id] = len(self.states)
+        else:
+            row["state"] = None
+            self._pending_old_states[entity_id] = None
+        self.states.append(row)
+
+    def flush(self, session):
+        """Insert the rows in the session, they are kept until cleared."""
+        if self.events:
+            _insert_rows(session, Events.event_id, self.events)
+        if not self.states:
+            return
+
+        for row, (event_index, _) in zip(self.states, self._state_refs):
+            row["event_id"] = self.events[event_index]["event_id"]
+        _insert_rows(session, States.state_id, self.states)
+
+        links = []
+        for row, (_, old_state_index) in zip(self.states, self._state_refs):
+            if old_state_index is not None:
+                row["old_state_id"] = self.states[old_state_index]["state_id"]
+                links.append(
+                    {
+                        "b_state_id": row["state_id"],
+                        "b_old_state_id": row["old_state_id"],
+                    }
+                )
+        if links:
+            session.execute(_LINK_OLD_STATES, links)
+
+    def clear(self):
+        """Forget the rows after they were committed."""
+        for entity_id, state_index in self._pending_old_states.items():
+            if state_index is None:
+                self._old_state_ids.pop(entity_id, None)
+            else:
+                self._old_state_ids[entity_id] = self.states[state_index]["state_id"]
+        self.discard()
+
+    def discard(self):
+        """Forget the rows which could not be committed."""
+        self.events = []
+        self.states = []
+        self._state_refs = []
+        self._pending_old_states = {}
@@ -1,7 +1,6 @@
 """Reproduce an Switch state."""
-import asyncio
 import logging
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -20,29 +19,27 @@ _LOGGER = logging.getLogger(__name__)
 VALID_STATES = {STATE_ON, STATE_OFF}
 
 
-async def _async_reproduce_state(
+def _reproduce_service_call(
     hass: HomeAssistantType,
     state: State,
-    *,
-    context: Optional[Context] = None,
     reproduce_options: Optional[Dict[str, Any]] = None,
-) -> None:
-    """Reproduce a single state."""
+) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+    """Return the service call reproducing a single state."""
     cur_state = hass.states.get(state.entity_id)
 
     if cur_state is None:
         _LOGGER.warning("Unable to find entity %s", state.entity_id)
-        return
+        return None
 
     if state.state not in VALID_STATES:
         _LOGGER.warning(
             "Invalid state specified for %s: %s", state.entity_id, state.state
         )
-        return
+        return None
 
     # Return if we are already at the right state.
     if cur_state.state == state.state:
-        return
+        return None
 
     service_data = {ATTR_ENTITY_ID: state.entity_id}
 
@@ -51,9 +48,7 @@ async def _async_reproduce_state(
     elif state.state == STATE_OFF:
         service = SERVICE_TURN_OFF
 
-    await hass.services.async_call(
-        DOMAIN, service, service_data, context=context, blocking=True
-    )
+    return DOMAIN, service, service_data
 
 
 async def async_reproduce_states(
@@ -64,11 +59,9 @@ async def async_reproduce_states(
     reproduce_options: Optional[Dict[str, Any]] = None,
 ) -> None:
     """Reproduce Switch states."""
-    await asyncio.gather(
-        *(
-            _async_reproduce_state(
-                hass, state, context=context, reproduce_options=reproduce_options
-            )
-            for state in states
-        )
+    calls = [
+        _reproduce_service_call(hass, state, reproduce_options) for state in states
+    ]
+    await hass.services.async_call_many(
+        [call for call in calls if call is not None], blocking=True, context=context
     )
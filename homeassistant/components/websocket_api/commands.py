@@ -16,6 +16,7 @@ from homeassistant.exceptions import (
 from homeassistant.helpers import config_validation as cv, entity
 from homeassistant.helpers.event import TrackTemplate, async_track_template_result
 from homeassistant.helpers.service import async_get_all_descriptions
+from homeassistant.helpers.startup_trace import DATA_STARTUP_TRACE
 from homeassistant.helpers.template import Template
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 
@@ -40,6 +41,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_startup_trace)
 
 
 def pong_message(iden):
@@ -181,7 +183,7 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.states_result_message(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -409,3 +411,18 @@ async def handle_test_condition(hass, connection, msg):
     connection.send_result(
         msg["id"], {"result": check_condition(hass, msg.get("variables"))}
     )
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "startup_trace"})
+@decorators.require_admin
+def handle_startup_trace(hass, connection, msg):
+    """Handle the startup trace summary command."""
+    trace = hass.data.get(DATA_STARTUP_TRACE)
+    if trace is None:
+        connection.send_error(
+            msg["id"], const.ERR_NOT_FOUND, "The startup is not traced"
+        )
+        return
+
+    connection.send_result(msg["id"], trace.summary())
@@ -2,11 +2,11 @@
 
 from functools import lru_cache
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -71,7 +71,26 @@ def _cached_event_message(event: Event) -> str:
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
-    return message_to_json(event_message(IDEN_TEMPLATE, event))
+    try:
+        event_json = event.as_json()
+    except (ValueError, TypeError):
+        return message_to_json(event_message(IDEN_TEMPLATE, event))
+    return f'{{"id": {IDEN_JSON_TEMPLATE}, "type": "event", "event": {event_json}}}'
+
+
+def states_result_message(iden: int, states: List[State]) -> str:
+    """Return a success result message with the states.
+
+    The message is spliced from the JSON cached by the states.
+    """
+    try:
+        states_json = ", ".join(state.as_json() for state in states)
+    except (ValueError, TypeError):
+        return message_to_json(result_message(iden, states))
+    return (
+        f'{{"id": {iden}, "type": "{const.TYPE_RESULT}", "success": true, '
+        f'"result": [{states_json}]}}'
+    )
 
 
 def message_to_json(message: Any) -> str:
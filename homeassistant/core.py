@@ -13,6 +13,7 @@ import logging
 import os
 import pathlib
 import re
+import sys
 import threading
 from time import monotonic
 from types import MappingProxyType
@@ -29,6 +30,7 @@ from typing import (
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -41,12 +43,15 @@ import yarl
 from homeassistant import block_async_io, loader, util
 from homeassistant.const import (
     ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_NOW,
     ATTR_SECONDS,
     ATTR_SERVICE,
     ATTR_SERVICE_DATA,
     CONF_UNIT_SYSTEM_IMPERIAL,
+    ENTITY_MATCH_ALL,
+    ENTITY_MATCH_NONE,
     EVENT_CALL_SERVICE,
     EVENT_CORE_CONFIG_UPDATE,
     EVENT_HOMEASSISTANT_CLOSE,
@@ -70,6 +75,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.util import location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
@@ -106,6 +112,9 @@ BLOCK_LOG_TIMEOUT = 60
 # How long we wait for the result of a service call
 SERVICE_CALL_LIMIT = 10  # seconds
 
+# How many services are executed at the same time by async_call_many
+MAX_PARALLEL_SERVICE_CALLS = 10
+
 # Source of core configuration
 SOURCE_DISCOVERED = "discovered"
 SOURCE_STORAGE = "storage"
@@ -621,7 +630,7 @@ class EventOrigin(enum.Enum):
 class Event:
     """Representation of an event within the bus."""
 
-    __slots__ = ["event_type", "data", "origin", "time_fired", "context"]
+    __slots__ = ["event_type", "data", "origin", "time_fired", "context", "_as_json"]
 
     def __init__(
         self,
@@ -637,6 +646,7 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context: Context = context or Context()
+        self._as_json: Optional[str] = None
 
     def __hash__(self) -> int:
         """Make hashable."""
@@ -656,6 +666,36 @@ class Event:
             "context": self.context.as_dict(),
         }
 
+    def as_json(self) -> str:
+        """Return the JSON of the dict representation of this Event.
+
+        The JSON is encoded once, the states in the data are spliced
+        from their own JSON.
+
+        Async friendly.
+        """
+        if self._as_json is None:
+            if all(isinstance(key, str) for key in self.data):
+                data = ", ".join(
+                    f"{json_dumps(key)}: "
+                    + (
+                        value.as_json()
+                        if isinstance(value, State)
+                        else json_dumps(value)
+                    )
+                    for key, value in self.data.items()
+                )
+                data = f"{{{data}}}"
+            else:
+                data = json_dumps(self.data)
+            self._as_json = (
+                f'{{"event_type": {json_dumps(self.event_type)}, "data": {data}, '
+                f'"origin": {json_dumps(str(self.origin.value))}, '
+                f'"time_fired": "{self.time_fired.isoformat()}", '
+                f'"context": {json_dumps(self.context.as_dict())}}}'
+            )
+        return self._as_json
+
     def __repr__(self) -> str:
         """Return the representation."""
         # pylint: disable=maybe-no-member
@@ -682,6 +722,10 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: Dict[str, List[HassJob]] = {}
+        # The jobs to run for each event type with the listeners of all the
+        # events included, rebuilt when a listener is added or removed.
+        self._match_all_jobs: Tuple[HassJob, ...] = ()
+        self._jobs: Dict[str, Tuple[HassJob, ...]] = {EVENT_HOMEASSISTANT_CLOSE: ()}
         self._hass = hass
 
     @callback
@@ -722,22 +766,20 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
-
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
-
-        event = Event(event_type, event_data, origin, time_fired, context)
+        jobs = self._jobs.get(event_type, self._match_all_jobs)
 
-        if event_type != EVENT_TIME_CHANGED:
-            _LOGGER.debug("Bus:Handling %s", event)
+        if event_type != EVENT_TIME_CHANGED and _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Bus:Handling %s",
+                Event(event_type, event_data, origin, time_fired, context),
+            )
 
-        if not listeners:
+        if not jobs:
             return
 
-        for job in listeners:
+        event = Event(event_type, event_data, origin, time_fired, context)
+
+        for job in jobs:
             self._hass.async_add_hass_job(job, event)
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
@@ -770,6 +812,7 @@ class EventBus:
     @callback
     def _async_listen_job(self, event_type: str, hassjob: HassJob) -> CALLBACK_TYPE:
         self._listeners.setdefault(event_type, []).append(hassjob)
+        self._async_update_jobs(event_type)
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -844,6 +887,30 @@ class EventBus:
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
             _LOGGER.warning("Unable to remove unknown job listener %s", hassjob)
+            return
+
+        self._async_update_jobs(event_type)
+
+    @callback
+    def _async_update_jobs(self, event_type: str) -> None:
+        """Rebuild the jobs run for the events of the type.
+
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            self._match_all_jobs = tuple(self._listeners.get(MATCH_ALL, ()))
+            for key in list(self._jobs):
+                self._async_update_jobs(key)
+            return
+
+        listeners = self._listeners.get(event_type)
+        if event_type == EVENT_HOMEASSISTANT_CLOSE:
+            # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+            self._jobs[event_type] = tuple(listeners or ())
+        elif listeners:
+            self._jobs[event_type] = self._match_all_jobs + tuple(listeners)
+        else:
+            self._jobs.pop(event_type, None)
 
 
 class State:
@@ -869,6 +936,8 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_json",
+        "_attributes_json",
     ]
 
     def __init__(
@@ -898,12 +967,18 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        if isinstance(attributes, MappingProxyType):
+            self.attributes = attributes
+        else:
+            self.attributes = MappingProxyType(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
-        self.domain, self.object_id = split_entity_id(self.entity_id)
+        domain, self.object_id = split_entity_id(self.entity_id)
+        self.domain = sys.intern(domain)
         self._as_dict: Optional[Dict[str, Collection[Any]]] = None
+        self._as_json: Optional[str] = None
+        self._attributes_json: Optional[str] = None
 
     @property
     def name(self) -> str:
@@ -936,6 +1011,34 @@ class State:
             }
         return self._as_dict
 
+    def as_json(self) -> str:
+        """Return the JSON of the dict representation of the State.
+
+        The JSON is encoded once and shared by all the connections.
+
+        Async friendly.
+        """
+        if self._as_json is None:
+            as_dict = self.as_dict()
+            self._as_json = (
+                f'{{"entity_id": {json_dumps(self.entity_id)}, '
+                f'"state": {json_dumps(self.state)}, '
+                f'"attributes": {self.attributes_as_json()}, '
+                f'"last_changed": "{as_dict["last_changed"]}", '
+                f'"last_updated": "{as_dict["last_updated"]}", '
+                f'"context": {json_dumps(as_dict["context"])}}}'
+            )
+        return self._as_json
+
+    def attributes_as_json(self) -> str:
+        """Return the JSON of the attributes, encoded once.
+
+        Async friendly.
+        """
+        if self._attributes_json is None:
+            self._attributes_json = json_dumps(dict(self.attributes))
+        return self._attributes_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -996,6 +1099,7 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: Dict[str, State] = {}
+        self._domain_index: Dict[str, Dict[str, State]] = {}
         self._reservations: Set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1019,12 +1123,12 @@ class StateMachine:
             return list(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), ()))
 
         return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
+            entity_id
+            for domain_states in self._async_domain_states(domain_filter)
+            for entity_id in domain_states
         ]
 
     @callback
@@ -1039,10 +1143,11 @@ class StateMachine:
             return len(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return len(self._domain_index.get(domain_filter.lower(), ()))
 
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
+        return sum(
+            len(domain_states)
+            for domain_states in self._async_domain_states(domain_filter)
         )
 
     def all(self, domain_filter: Optional[Union[str, Iterable]] = None) -> List[State]:
@@ -1063,10 +1168,25 @@ class StateMachine:
             return list(self._states.values())
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            domain_states = self._domain_index.get(domain_filter.lower())
+            return list(domain_states.values()) if domain_states else []
+
+        return [
+            state
+            for domain_states in self._async_domain_states(domain_filter)
+            for state in domain_states.values()
+        ]
+
+    @callback
+    def _async_domain_states(self, domains: Iterable) -> List[Dict[str, State]]:
+        """Return the states of each of the domains which have states.
 
+        This method must be run in the event loop.
+        """
         return [
-            state for state in self._states.values() if state.domain in domain_filter
+            self._domain_index[domain]
+            for domain in dict.fromkeys(domains)
+            if domain in self._domain_index
         ]
 
     def get(self, entity_id: str) -> Optional[State]:
@@ -1110,6 +1230,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._domain_index[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domain_index[old_state.domain]
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1196,6 +1321,9 @@ class StateMachine:
             same_state = old_state.state == new_state and not force_update
             same_attr = old_state.attributes == MappingProxyType(attributes)
             last_changed = old_state.last_changed if same_state else None
+            if same_attr:
+                # Keep a single copy of the attributes which are not changed
+                attributes = old_state.attributes  # type: ignore
 
         if same_state and same_attr:
             return
@@ -1212,7 +1340,11 @@ class StateMachine:
             context,
             old_state is None,
         )
+        if old_state is not None and same_attr:
+            # pylint: disable=protected-access
+            state._attributes_json = old_state._attributes_json
         self._states[entity_id] = state
+        self._domain_index.setdefault(state.domain, {})[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -1266,6 +1398,44 @@ class ServiceCall:
         return f"<ServiceCall {self.domain}.{self.service} (c:{self.context.id})>"
 
 
+def _merge_service_calls(
+    calls: Iterable[Tuple[str, str, Optional[Dict]]]
+) -> List[Tuple[str, str, Dict]]:
+    """Merge the calls of a service which differ only by their entity ids."""
+    merged: List[Tuple[str, str, Dict]] = []
+    # the calls with entity ids for each service, as their data without the
+    # entity ids and their entity ids, and the index of the merged call
+    targets: Dict[Tuple[str, str], List[Tuple[Dict, List[str], int]]] = {}
+
+    for domain, service, service_data in calls:
+        domain = domain.lower()
+        service = service.lower()
+        service_data = service_data or {}
+        entity_ids = service_data.get(ATTR_ENTITY_ID)
+
+        if isinstance(entity_ids, str) and entity_ids not in (
+            ENTITY_MATCH_ALL,
+            ENTITY_MATCH_NONE,
+        ):
+            entity_ids = [entity_id.strip() for entity_id in entity_ids.split(",")]
+        elif not isinstance(entity_ids, list):
+            merged.append((domain, service, service_data))
+            continue
+
+        data = {key: val for key, val in service_data.items() if key != ATTR_ENTITY_ID}
+        service_targets = targets.setdefault((domain, service), [])
+        for target_data, target_ids, index in service_targets:
+            if target_data == data:
+                target_ids.extend(entity_ids)
+                merged[index] = (domain, service, {**data, ATTR_ENTITY_ID: target_ids})
+                break
+        else:
+            service_targets.append((data, list(entity_ids), len(merged)))
+            merged.append((domain, service, service_data))
+
+    return merged
+
+
 class ServiceRegistry:
     """Offer the services over the eventbus."""
 
@@ -1410,10 +1580,68 @@ class ServiceRegistry:
 
         This method is a coroutine.
         """
-        domain = domain.lower()
-        service = service.lower()
         context = context or Context()
         service_data = service_data or {}
+        handler, service_call = self._async_prepare_call(
+            domain, service, service_data, context
+        )
+        return await self._async_run_call(
+            handler, service_call, service_data, blocking, limit
+        )
+
+    async def async_call_many(
+        self,
+        calls: Iterable[Tuple[str, str, Optional[Dict]]],
+        blocking: bool = False,
+        context: Optional[Context] = None,
+        limit: Optional[float] = SERVICE_CALL_LIMIT,
+    ) -> Optional[bool]:
+        """
+        Call many services at once.
+
+        The calls are (domain, service, service_data) tuples. The calls of a
+        service which differ only by their entity ids are merged into one
+        call for all the entities, so the data is validated and the call is
+        fired on the event bus once. All the calls are validated before any
+        is executed, they run concurrently with the same context and at most
+        MAX_PARALLEL_SERVICE_CALLS at a time.
+
+        If blocking = True, will return boolean if all the services executed
+        successfully within limit.
+
+        This method is a coroutine.
+        """
+        context = context or Context()
+        prepared = [
+            (
+                self._async_prepare_call(domain, service, service_data, context),
+                service_data,
+            )
+            for domain, service, service_data in _merge_service_calls(calls)
+        ]
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_SERVICE_CALLS)
+
+        async def run_call(
+            call: Tuple[Service, ServiceCall], service_data: Dict
+        ) -> Optional[bool]:
+            async with semaphore:
+                return await self._async_run_call(*call, service_data, blocking, limit)
+
+        results = await asyncio.gather(*(run_call(*call) for call in prepared))
+        if not blocking:
+            return None
+        return all(results)
+
+    @callback
+    def _async_prepare_call(
+        self, domain: str, service: str, service_data: Dict, context: Context
+    ) -> Tuple[Service, ServiceCall]:
+        """Find the service and validate the data of the call.
+
+        This method must be run in the event loop.
+        """
+        domain = domain.lower()
+        service = service.lower()
 
         try:
             handler = self._services[domain][service]
@@ -1434,16 +1662,25 @@ class ServiceRegistry:
         else:
             processed_data = service_data
 
-        service_call = ServiceCall(domain, service, processed_data, context)
+        return handler, ServiceCall(domain, service, processed_data, context)
 
+    async def _async_run_call(
+        self,
+        handler: Service,
+        service_call: ServiceCall,
+        service_data: Dict,
+        blocking: bool,
+        limit: Optional[float],
+    ) -> Optional[bool]:
+        """Fire the call on the event bus and execute the service."""
         self._hass.bus.async_fire(
             EVENT_CALL_SERVICE,
             {
-                ATTR_DOMAIN: domain.lower(),
-                ATTR_SERVICE: service.lower(),
+                ATTR_DOMAIN: service_call.domain,
+                ATTR_SERVICE: service_call.service,
                 ATTR_SERVICE_DATA: service_data,
             },
-            context=context,
+            context=service_call.context,
         )
 
         coro = self._execute_service(handler, service_call)
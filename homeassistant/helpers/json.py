@@ -20,3 +20,11 @@ class JSONEncoder(json.JSONEncoder):
             return o.as_dict()
 
         return json.JSONEncoder.default(self, o)
+
+
+_STRICT_ENCODER = JSONEncoder(allow_nan=False)
+
+
+def json_dumps(data: Any) -> str:
+    """Dump the data to strict JSON, as sent to the browsers."""
+    return _STRICT_ENCODER.encode(data)
@@ -18,7 +18,7 @@ from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.singleton import singleton
-from homeassistant.helpers.storage import Store
+from homeassistant.helpers.storage import JournalStore
 import homeassistant.util.dt as dt_util
 
 DATA_RESTORE_STATE_TASK = "restore_state_task"
@@ -28,9 +28,16 @@ _LOGGER = logging.getLogger(__name__)
 STORAGE_KEY = "core.restore_state"
 STORAGE_VERSION = 1
 
-# How long between periodically saving the current states to disk
+# How long between periodically saving the changed states to disk
 STATE_DUMP_INTERVAL = timedelta(minutes=15)
 
+# How long between saving all the states, the states changed in between are
+# appended to the journal of the store
+STATE_SNAPSHOT_INTERVAL = timedelta(days=1)
+
+# How many changed states the journal holds before all the states are saved
+STATE_JOURNAL_MAX = 5000
+
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
@@ -80,11 +87,9 @@ class RestoreStateData:
                 _LOGGER.debug("Not creating cache - no saved states found")
                 data.last_states = {}
             else:
-                data.last_states = {
-                    item["state"]["entity_id"]: StoredState.from_dict(item)
-                    for item in stored_states
-                    if valid_entity_id(item["state"]["entity_id"])
-                }
+                data.last_states = await hass.async_add_executor_job(
+                    _last_states_from_dicts, stored_states
+                )
                 _LOGGER.debug("Created cache with %s", list(data.last_states))
 
             if hass.state == CoreState.running:
@@ -101,11 +106,19 @@ class RestoreStateData:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the restore state data class."""
         self.hass: HomeAssistant = hass
-        self.store: Store = Store(
-            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
+        self.store: JournalStore = JournalStore(
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY,
+            encoder=JSONEncoder,
+            compact=True,
+            max_journal=STATE_JOURNAL_MAX,
         )
         self.last_states: Dict[str, StoredState] = {}
         self.entity_ids: Set[str] = set()
+        # The states as they were last saved, to find the changed states
+        self._saved_states: Dict[str, State] = {}
+        self._last_snapshot: Optional[datetime] = None
 
     @callback
     def async_get_stored_states(self) -> List[StoredState]:
@@ -152,33 +165,71 @@ class RestoreStateData:
     async def async_dump_states(self) -> None:
         """Save the current state machine to storage."""
         _LOGGER.debug("Dumping states")
+        stored_states = self.async_get_stored_states()
         try:
             await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+                [stored_state.as_dict() for stored_state in stored_states]
             )
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
+            return
+
+        self._saved_states = {
+            stored_state.state.entity_id: stored_state.state
+            for stored_state in stored_states
+        }
+        self._last_snapshot = dt_util.utcnow()
+
+    async def async_dump_changed_states(self) -> None:
+        """Append the states changed since the last save to the journal.
+
+        All the states are saved once in a while and when the journal is long,
+        which also drops the expired states from the storage.
+        """
+        if (
+            self._last_snapshot is None
+            or dt_util.utcnow() - self._last_snapshot >= STATE_SNAPSHOT_INTERVAL
+        ):
+            await self.async_dump_states()
+            return
+
+        # The states are immutable, a changed state is a new object
+        changed_states = [
+            stored_state
+            for stored_state in self.async_get_stored_states()
+            if self._saved_states.get(stored_state.state.entity_id)
+            is not stored_state.state
+        ]
+        if self.store.journal_length + len(changed_states) >= STATE_JOURNAL_MAX:
+            await self.async_dump_states()
+            return
+
+        _LOGGER.debug("Dumping %s changed states", len(changed_states))
+        for stored_state in changed_states:
+            self.store.async_append(stored_state.as_dict())
+            self._saved_states[stored_state.state.entity_id] = stored_state.state
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
         """Set up the restore state listeners."""
 
-        async def _async_dump_states(*_: Any) -> None:
-            await self.async_dump_states()
+        async def _async_dump_changed_states(*_: Any) -> None:
+            await self.async_dump_changed_states()
 
         # Dump the initial states now. This helps minimize the risk of having
         # old states loaded by overwriting the last states once Home Assistant
         # has started and the old states have been read.
-        self.hass.async_create_task(_async_dump_states())
+        self.hass.async_create_task(self.async_dump_states())
 
-        # Dump states periodically
-        async_track_time_interval(self.hass, _async_dump_states, STATE_DUMP_INTERVAL)
+        # Dump the changed states periodically
+        async_track_time_interval(
+            self.hass, _async_dump_changed_states, STATE_DUMP_INTERVAL
+        )
 
-        # Dump states when stopping hass
-        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_dump_states)
+        # Dump the changed states when stopping hass
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, _async_dump_changed_states
+        )
 
     @callback
     def async_restore_entity_added(self, entity_id: str) -> None:
@@ -202,6 +253,15 @@ class RestoreStateData:
         self.entity_ids.remove(entity_id)
 
 
+def _last_states_from_dicts(stored_states: List[Dict]) -> Dict[str, StoredState]:
+    """Return the stored states by entity id, the later ones win."""
+    return {
+        item["state"]["entity_id"]: StoredState.from_dict(item)
+        for item in stored_states
+        if valid_entity_id(item["state"]["entity_id"])
+    }
+
+
 def _encode(value: Any) -> Any:
     """Little helper to JSON encode a value."""
     try:
@@ -0,0 +1,111 @@
+"""Trace the time spent setting up the integrations during the startup."""
+from contextlib import contextmanager
+from timeit import default_timer as timer
+from typing import Any, Dict, Iterator, List, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util.json import save_json
+
+DATA_STARTUP_TRACE = "startup_trace"
+TRACE_FILE = "startup_trace.json"
+
+STEP_INTEGRATION = "integration"
+STEP_REQUIREMENTS = "requirements"
+STEP_IMPORT = "import"
+STEP_SETUP = "setup"
+
+
+class StartupTrace:
+    """The time spent in each step of the setup of the integrations."""
+
+    def __init__(self) -> None:
+        """Initialize the trace."""
+        self.start = timer()
+        # (name, step, start, end) of the steps in the order they ended
+        self.spans: List[Tuple[str, str, float, float]] = []
+
+    def add(self, name: str, step: str, start: float, end: float) -> None:
+        """Add a step of the setup of an integration or of a platform."""
+        self.spans.append((name, step, start, end))
+
+    def as_chrome_trace(self) -> Dict[str, Any]:
+        """Return the trace in the Chrome trace event format.
+
+        Each integration and platform gets its own row, named after it.
+        """
+        rows: Dict[str, int] = {}
+        events: List[Dict[str, Any]] = []
+        for name, step, start, end in sorted(self.spans, key=lambda span: span[2]):
+            if name not in rows:
+                rows[name] = len(rows) + 1
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": 1,
+                        "tid": rows[name],
+                        "args": {"name": name},
+                    }
+                )
+            events.append(
+                {
+                    "name": f"{name} {step}",
+                    "cat": step,
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": rows[name],
+                    "ts": round((start - self.start) * 1e6),
+                    "dur": round((end - start) * 1e6),
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the seconds spent in each step, slowest integrations first."""
+        steps: Dict[str, Dict[str, float]] = {}
+        for name, step, start, end in self.spans:
+            name_steps = steps.setdefault(name, {})
+            name_steps[step] = name_steps.get(step, 0) + end - start
+
+        return {
+            "duration": max((span[3] for span in self.spans), default=self.start)
+            - self.start,
+            "integrations": [
+                {"name": name, **name_steps}
+                for name, name_steps in sorted(
+                    steps.items(), key=lambda item: -sum(item[1].values())
+                )
+            ],
+        }
+
+
+def add_step(
+    hass: HomeAssistant, name: str, step: str, start: float, end: float
+) -> None:
+    """Add a step timed by the caller when the startup is traced."""
+    trace = hass.data.get(DATA_STARTUP_TRACE)
+    if trace is not None:
+        trace.add(name, step, start, end)
+
+
+@contextmanager
+def trace_step(hass: HomeAssistant, name: str, step: str) -> Iterator[None]:
+    """Trace a step of the setup when the startup is traced."""
+    trace = hass.data.get(DATA_STARTUP_TRACE)
+    if trace is None:
+        yield
+        return
+
+    start = timer()
+    try:
+        yield
+    finally:
+        trace.add(name, step, start, timer())
+
+
+async def async_save_trace(hass: HomeAssistant) -> None:
+    """Save the trace in the Chrome trace event format to the config dir."""
+    trace = hass.data[DATA_STARTUP_TRACE]
+    await hass.async_add_executor_job(
+        save_json, hass.config.path(TRACE_FILE), trace.as_chrome_trace()
+    )
@@ -1,9 +1,11 @@
 """Helper to help store data."""
 import asyncio
+from contextlib import AsyncExitStack
+import json
 from json import JSONEncoder
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Type, Union
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
@@ -15,6 +17,8 @@ from homeassistant.util import json as json_util
 # mypy: no-check-untyped-defs
 
 STORAGE_DIR = ".storage"
+DATA_STORE_FLUSHER = "storage_flusher"
+JOURNAL_MAX_ITEMS = 100
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -72,8 +76,14 @@ class Store:
         private: bool = False,
         *,
         encoder: Optional[Type[JSONEncoder]] = None,
+        compact: bool = False,
+        coalesce: bool = False,
     ):
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        A compact store is written without indentation. The delayed saves of
+        the coalescing stores are written together, see _StoreFlusher.
+        """
         self.version = version
         self.key = key
         self.hass = hass
@@ -84,6 +94,8 @@ class Store:
         self._write_lock = asyncio.Lock()
         self._load_task: Optional[asyncio.Future] = None
         self._encoder = encoder
+        self._compact = compact
+        self._coalesce = coalesce
 
     @property
     def path(self):
@@ -159,9 +171,12 @@ class Store:
             self._async_ensure_final_write_listener()
             return
 
-        self._unsub_delay_listener = async_call_later(
-            self.hass, delay, self._async_callback_delayed_write
-        )
+        if self._coalesce:
+            _async_get_flusher(self.hass).async_schedule(self, delay)
+        else:
+            self._unsub_delay_listener = async_call_later(
+                self.hass, delay, self._async_callback_delayed_write
+            )
         self._async_ensure_final_write_listener()
 
     @callback
@@ -210,13 +225,7 @@ class Store:
                 # Another write already consumed the data
                 return
 
-            data = self._data
-
-            if "data_func" in data:
-                data["data"] = data.pop("data_func")()
-
-            self._data = None
-
+            data = self._async_pop_data()
             try:
                 await self.hass.async_add_executor_job(
                     self._write_data, self.path, data
@@ -224,13 +233,27 @@ class Store:
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
+    @callback
+    def _async_pop_data(self) -> Dict:
+        """Return the pending data to write, generating it if needed."""
+        data = self._data
+        assert data is not None
+
+        if "data_func" in data:
+            data["data"] = data.pop("data_func")()
+
+        self._data = None
+        return data
+
     def _write_data(self, path: str, data: Dict) -> None:
         """Write the data."""
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s", self.key)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        json_util.save_json(
+            path, data, self._private, encoder=self._encoder, compact=self._compact
+        )
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
@@ -242,3 +265,227 @@ class Store:
             await self.hass.async_add_executor_job(os.unlink, self.path)
         except FileNotFoundError:
             pass
+
+
+class _StoreFlusher:
+    """Write the delayed saves of the coalescing stores in a single job.
+
+    The stores saved while a flush is pending are written with it, so the
+    registries changing together hit the disk once per delay.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the flusher."""
+        self.hass = hass
+        self._pending: Set[Store] = set()
+        self._flush_at: Optional[float] = None
+        self._unsub_flush: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_schedule(self, store: Store, delay: float) -> None:
+        """Write the store with the next flush, at the latest after the delay."""
+        self._pending.add(store)
+        flush_at = self.hass.loop.time() + delay
+        if self._flush_at is not None and self._flush_at <= flush_at:
+            return
+
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+        self._flush_at = flush_at
+        self._unsub_flush = async_call_later(self.hass, delay, self._async_flush)
+
+    async def _async_flush(self, _now: Any) -> None:
+        """Write the pending stores."""
+        # pylint: disable=protected-access
+        self._unsub_flush = None
+        self._flush_at = None
+        stores, self._pending = self._pending, set()
+
+        # The final write listeners of the stores write them when stopping
+        if self.hass.state == CoreState.stopping:
+            return
+
+        async with AsyncExitStack() as stack:
+            writes = []
+            for store in stores:
+                await stack.enter_async_context(store._write_lock)
+                # Another write already consumed the data
+                if store._data is None:
+                    continue
+                store._async_cleanup_final_write_listener()
+                writes.append((store, store._async_pop_data()))
+
+            if writes:
+                await self.hass.async_add_executor_job(self._write_stores, writes)
+
+    @staticmethod
+    def _write_stores(writes: List[Any]) -> None:
+        """Write the data of the stores."""
+        # pylint: disable=protected-access
+        for store, data in writes:
+            try:
+                store._write_data(store.path, data)
+            except (json_util.SerializationError, json_util.WriteError) as err:
+                _LOGGER.error("Error writing config for %s: %s", store.key, err)
+
+
+@callback
+def _async_get_flusher(hass: HomeAssistant) -> _StoreFlusher:
+    """Return the flusher of the coalescing stores."""
+    flusher = hass.data.get(DATA_STORE_FLUSHER)
+    if flusher is None:
+        flusher = hass.data[DATA_STORE_FLUSHER] = _StoreFlusher(hass)
+    return flusher
+
+
+class JournalStore(Store):
+    """Store of a list whose added items are appended to a journal.
+
+    Adding an item writes a line to the journal instead of the whole list.
+    The journal is folded into the list when it is loaded and when it gets
+    longer than max_journal items.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        version: int,
+        key: str,
+        private: bool = False,
+        *,
+        encoder: Optional[Type[JSONEncoder]] = None,
+        compact: bool = False,
+        max_journal: int = JOURNAL_MAX_ITEMS,
+    ):
+        """Initialize the journal store."""
+        super().__init__(hass, version, key, private, encoder=encoder, compact=compact)
+        self.items: List[Any] = []
+        self._max_journal = max_journal
+        # The items added since the last write of the journal
+        self._journal: List[Any] = []
+        self._journal_length = 0
+
+    @property
+    def journal_path(self) -> str:
+        """Return the path of the journal."""
+        return f"{self.path}.journal"
+
+    @property
+    def journal_length(self) -> int:
+        """Return the number of items added since the list was written."""
+        return self._journal_length + len(self._journal)
+
+    async def async_load(self) -> Optional[List[Any]]:  # type: ignore
+        """Load the list and the items added to the journal."""
+        data, added = await asyncio.gather(
+            super().async_load(), self.hass.async_add_executor_job(self._read_journal)
+        )
+        if data is None and not added:
+            return None
+
+        self.items = list(data or []) + added  # type: ignore
+        self._journal_length = len(added)
+        return self.items
+
+    @callback
+    def async_append(self, item: Any) -> None:
+        """Add an item to the list and write it to the journal."""
+        self.items.append(item)
+        if (
+            self._data is not None
+            and self._data.get("data_func") == self._async_data_to_save
+        ):
+            # The pending write of the list includes the item
+            return
+
+        if self.journal_length >= self._max_journal:
+            self.async_replace(self.items)
+            return
+
+        self._journal.append(item)
+        # The items added until the write starts are written together
+        if len(self._journal) == 1:
+            self.hass.async_create_task(self._async_write_journal())
+
+    @callback
+    def async_replace(self, items: List[Any], delay: float = 0) -> None:
+        """Replace the list, it is written after the delay."""
+        self.items = list(items)
+        self._journal.clear()
+        self.async_delay_save(self._async_data_to_save, delay)
+
+    async def async_save(self, data: List[Any]) -> None:  # type: ignore
+        """Replace the list and write it."""
+        self.async_replace(data)
+        self._async_cleanup_delay_listener()
+        if self.hass.state == CoreState.stopping:
+            return
+
+        self._async_cleanup_final_write_listener()
+        await self._async_handle_write_data()
+
+    @callback
+    def _async_data_to_save(self) -> List[Any]:
+        """Return the list to write, the journal is removed with the write."""
+        self._journal.clear()
+        self._journal_length = 0
+        return list(self.items)
+
+    async def _async_write_journal(self) -> None:
+        """Append the added items to the journal."""
+        async with self._write_lock:
+            added, self._journal = self._journal, []
+            if not added:
+                return
+
+            try:
+                await self.hass.async_add_executor_job(self._append_journal, added)
+            except (OSError, TypeError, ValueError) as err:
+                _LOGGER.error("Error writing the journal of %s: %s", self.key, err)
+                return
+            self._journal_length += len(added)
+
+    def _read_journal(self) -> List[Any]:
+        """Read the items added to the journal."""
+        try:
+            with open(self.journal_path, encoding="utf-8") as fdesc:
+                lines = fdesc.readlines()
+        except FileNotFoundError:
+            return []
+
+        added = []
+        for line in lines:
+            try:
+                added.append(json.loads(line))
+            except ValueError:
+                # The last line is cut when the write was interrupted
+                _LOGGER.warning("Skipping a broken line of %s", self.journal_path)
+        return added
+
+    def _append_journal(self, added: List[Any]) -> None:
+        """Append the items to the journal."""
+        if not os.path.isdir(os.path.dirname(self.journal_path)):
+            os.makedirs(os.path.dirname(self.journal_path))
+
+        with open(self.journal_path, "a", encoding="utf-8") as fdesc:
+            fdesc.writelines(
+                json.dumps(item, cls=self._encoder, separators=(",", ":")) + "\n"
+                for item in added
+            )
+
+    def _write_data(self, path: str, data: Dict) -> None:
+        """Write the list and remove the journal it includes."""
+        super()._write_data(path, data)
+        self._remove_journal()
+
+    def _remove_journal(self) -> None:
+        """Remove the journal."""
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+
+    async def async_remove(self) -> None:
+        """Remove the list and the journal."""
+        await super().async_remove()
+        await self.hass.async_add_executor_job(self._remove_journal)
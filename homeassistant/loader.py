@@ -9,8 +9,10 @@ import functools as ft
 import importlib
 import json
 import logging
+import os
 import pathlib
 import sys
+import threading
 from types import ModuleType
 from typing import (
     TYPE_CHECKING,
@@ -25,6 +27,7 @@ from typing import (
     cast,
 )
 
+from homeassistant.const import __version__
 from homeassistant.generated.mqtt import MQTT
 from homeassistant.generated.ssdp import SSDP
 from homeassistant.generated.zeroconf import HOMEKIT, ZEROCONF
@@ -40,6 +43,11 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_LOADER_CACHE = "loader_cache"
+LOADER_CACHE_KEY = "core.loader_cache"
+LOADER_CACHE_VERSION = 1
+LOADER_CACHE_SAVE_DELAY = 30
+DATA_LOADER_CACHE_SAVE = "loader_cache_save"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -51,6 +59,139 @@ CUSTOM_WARNING = (
 _UNDEF = object()
 
 
+class LoaderCache:
+    """The manifests and satisfied requirements kept between the boots.
+
+    A manifest is kept with the modification time of its file, the sub
+    directories of the custom components with the modification time of
+    their directory. The satisfied requirements are kept until a package
+    is installed or removed, which changes the modification time of the
+    directories of the packages.
+
+    The cache is filled from the executor and saved from the loop, its
+    dicts are only changed and copied with the lock held.
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        """Initialize the cache from the saved data."""
+        self.packages_mtime = [
+            os.stat(path).st_mtime for path in sys.path if os.path.isdir(path)
+        ]
+        if data is None or data.get("ha_version") != __version__:
+            data = {}
+        self.manifests: Dict[str, List] = data.get("manifests", {})
+        self.directories: Dict[str, List] = data.get("directories", {})
+        self.requirements: Set[str] = set()
+        if data.get("packages_mtime") == self.packages_mtime:
+            self.requirements.update(data.get("requirements", []))
+        self.changed = False
+        self._lock = threading.Lock()
+
+    def get_manifest(self, manifest_path: pathlib.Path) -> Optional[Dict[str, Any]]:
+        """Return the manifest of the file, None when there is no file.
+
+        Raises ValueError when the manifest can't be parsed.
+        """
+        try:
+            mtime = manifest_path.stat().st_mtime
+        except OSError:
+            return None
+
+        key = str(manifest_path)
+        cached = self.manifests.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = [mtime, json.loads(manifest_path.read_text())]
+            with self._lock:
+                self.manifests[key] = cached
+                self.changed = True
+        return dict(cached[1])
+
+    def get_sub_directories(self, path: pathlib.Path) -> List[pathlib.Path]:
+        """Return the sub directories of the directory."""
+        mtime = path.stat().st_mtime
+        key = str(path)
+        cached = self.directories.get(key)
+        if cached is None or cached[0] != mtime:
+            names = [entry.name for entry in path.iterdir() if entry.is_dir()]
+            cached = [mtime, names]
+            with self._lock:
+                self.directories[key] = cached
+                self.changed = True
+        return [path / name for name in cached[1]]
+
+    def is_satisfied(self, requirement: str) -> bool:
+        """Return if the requirement was satisfied."""
+        return requirement in self.requirements
+
+    def add_satisfied(self, requirement: str) -> None:
+        """Remember the requirement is satisfied."""
+        with self._lock:
+            self.requirements.add(requirement)
+            self.changed = True
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the data to save."""
+        with self._lock:
+            return {
+                "ha_version": __version__,
+                "packages_mtime": list(self.packages_mtime),
+                "manifests": {
+                    key: [mtime, dict(manifest)]
+                    for key, (mtime, manifest) in self.manifests.items()
+                },
+                "directories": {
+                    key: [mtime, list(names)]
+                    for key, (mtime, names) in self.directories.items()
+                },
+                "requirements": sorted(self.requirements),
+            }
+
+
+async def async_get_loader_cache(hass: "HomeAssistant") -> LoaderCache:
+    """Return the loader cache, loaded from the storage on the first call."""
+    cache_or_task = hass.data.get(DATA_LOADER_CACHE)
+    if isinstance(cache_or_task, LoaderCache):
+        return cache_or_task
+
+    if cache_or_task is None:
+        cache_or_task = hass.data[DATA_LOADER_CACHE] = hass.async_create_task(
+            _async_load_loader_cache(hass)
+        )
+
+    return cast(LoaderCache, await cache_or_task)
+
+
+async def _async_load_loader_cache(hass: "HomeAssistant") -> LoaderCache:
+    """Load the loader cache."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.storage import Store
+
+    store = Store(hass, LOADER_CACHE_VERSION, LOADER_CACHE_KEY)
+    data = await store.async_load()
+    cache = await hass.async_add_executor_job(LoaderCache, data)
+    hass.data[DATA_LOADER_CACHE] = cache
+
+    def data_to_save() -> Dict[str, Any]:
+        """Return the data of the cache to save."""
+        cache.changed = False
+        return cache.as_dict()
+
+    def async_schedule_save() -> None:
+        """Save the cache when it changed."""
+        if cache.changed:
+            store.async_delay_save(data_to_save, LOADER_CACHE_SAVE_DELAY)
+
+    hass.data[DATA_LOADER_CACHE_SAVE] = async_schedule_save
+    return cache
+
+
+def async_save_loader_cache(hass: "HomeAssistant") -> None:
+    """Schedule saving the loader cache when it changed."""
+    schedule_save = hass.data.get(DATA_LOADER_CACHE_SAVE)
+    if schedule_save is not None:
+        schedule_save()
+
+
 def manifest_from_legacy_module(domain: str, module: ModuleType) -> Dict:
     """Generate a manifest from a legacy module."""
     return {
@@ -75,13 +216,14 @@ async def _async_get_custom_components(
     except ImportError:
         return {}
 
+    loader_cache = await async_get_loader_cache(hass)
+
     def get_sub_directories(paths: List[str]) -> List[pathlib.Path]:
         """Return all sub directories in a set of paths."""
         return [
             entry
             for path in paths
-            for entry in pathlib.Path(path).iterdir()
-            if entry.is_dir()
+            for entry in loader_cache.get_sub_directories(pathlib.Path(path))
         ]
 
     dirs = await hass.async_add_executor_job(
@@ -91,11 +233,16 @@ async def _async_get_custom_components(
     integrations = await asyncio.gather(
         *(
             hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
+                Integration.resolve_from_root,
+                hass,
+                custom_components,
+                comp.name,
+                loader_cache,
             )
             for comp in dirs
         )
     )
+    async_save_loader_cache(hass)
 
     return {
         integration.domain: integration
@@ -223,17 +370,25 @@ class Integration:
 
     @classmethod
     def resolve_from_root(
-        cls, hass: "HomeAssistant", root_module: ModuleType, domain: str
+        cls,
+        hass: "HomeAssistant",
+        root_module: ModuleType,
+        domain: str,
+        loader_cache: Optional[LoaderCache] = None,
     ) -> "Optional[Integration]":
         """Resolve an integration from a root module."""
         for base in root_module.__path__:  # type: ignore
             manifest_path = pathlib.Path(base) / domain / "manifest.json"
 
-            if not manifest_path.is_file():
-                continue
-
             try:
-                manifest = json.loads(manifest_path.read_text())
+                if loader_cache is not None:
+                    manifest = loader_cache.get_manifest(manifest_path)
+                    if manifest is None:
+                        continue
+                elif not manifest_path.is_file():
+                    continue
+                else:
+                    manifest = json.loads(manifest_path.read_text())
             except ValueError as err:
                 _LOGGER.error(
                     "Error parsing manifest.json file at %s: %s", manifest_path, err
@@ -467,9 +622,11 @@ async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integrati
 
     from homeassistant import components  # pylint: disable=import-outside-toplevel
 
+    loader_cache = await async_get_loader_cache(hass)
     integration = await hass.async_add_executor_job(
-        Integration.resolve_from_root, hass, components, domain
+        Integration.resolve_from_root, hass, components, domain, loader_cache
     )
+    async_save_loader_cache(hass)
 
     if integration is not None:
         cache[domain] = integration
@@ -5,7 +5,13 @@ from typing import Any, Dict, Iterable, List, Optional, Set, Union, cast
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.loader import Integration, IntegrationNotFound, async_get_integration
+from homeassistant.loader import (
+    Integration,
+    IntegrationNotFound,
+    async_get_integration,
+    async_get_loader_cache,
+    async_save_loader_cache,
+)
 import homeassistant.util.package as pkg_util
 
 DATA_PIP_LOCK = "pip_lock"
@@ -115,10 +121,15 @@ async def async_process_requirements(
         pip_lock = hass.data[DATA_PIP_LOCK] = asyncio.Lock()
 
     kwargs = pip_kwargs(hass.config.config_dir)
+    loader_cache = await async_get_loader_cache(hass)
 
     async with pip_lock:
         for req in requirements:
+            if loader_cache.is_satisfied(req):
+                continue
+
             if pkg_util.is_installed(req):
+                loader_cache.add_satisfied(req)
                 continue
 
             def _install(req: str, kwargs: Dict) -> bool:
@@ -130,6 +141,10 @@ async def async_process_requirements(
             if not ret:
                 raise RequirementsNotFound(name, [req])
 
+            loader_cache.add_satisfied(req)
+
+    async_save_loader_cache(hass)
+
 
 def pip_kwargs(config_dir: Optional[str]) -> Dict[str, Any]:
     """Return keyword arguments for PIP install."""
@@ -6,12 +6,19 @@ from contextlib import suppress
 from datetime import datetime
 import json
 import logging
+import re
 from timeit import default_timer as timer
+import tracemalloc
 from typing import Callable, Dict, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.const import (
+    ATTR_NOW,
+    EVENT_HOMEASSISTANT_START,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+)
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
@@ -85,6 +92,34 @@ async def fire_events(hass):
     return timer() - start
 
 
+@benchmark
+async def bus_throughput(hass):
+    """Fire a million events of which a half is not listened to."""
+    count = 0
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 5 * 10 ** 5:
+            event.set()
+
+    for idx in range(20):
+        hass.bus.async_listen(f"benchmark_event_{idx}", listener)
+
+    start = timer()
+
+    for idx in range(10 ** 6):
+        hass.bus.async_fire(f"benchmark_event_{idx % 40}")
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -323,6 +358,409 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def state_changed_fan_out(hass):
+    """Send 10k state changes to 10 websocket connections and the recorder."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder.models import States
+    from homeassistant.components.websocket_api.messages import cached_event_message
+
+    attributes = {
+        "friendly_name": "Zigbee power",
+        "unit_of_measurement": "W",
+        "history": list(range(50)),
+    }
+    events = []
+    old_state = None
+    for idx in range(10 ** 4):
+        new_state = core.State("sensor.zigbee_power", str(idx), attributes)
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": "sensor.zigbee_power",
+                    "old_state": old_state,
+                    "new_state": new_state,
+                },
+            )
+        )
+        old_state = new_state
+
+    start = timer()
+
+    for event in events:
+        for iden in range(10):
+            cached_event_message(iden, event)
+        States.from_event(event)
+
+    return timer() - start
+
+
+@benchmark
+async def ais_intent_matching(hass):
+    """Match 100k texts against the AIS dom intents using the intent index."""
+    return await _ais_intent_matching(hass, True)
+
+
+@benchmark
+async def ais_intent_matching_linear(hass):
+    """Match 100k texts against the AIS dom intents one matcher at a time."""
+    return await _ais_intent_matching(hass, False)
+
+
+async def _ais_intent_matching(hass, use_index):
+    # pylint: disable=import-outside-toplevel, protected-access
+    from homeassistant.components import ais_ai_service
+    from homeassistant.components.ais_ai_service.intent_index import IntentIndex
+
+    intents = {
+        intent_type: [ais_ai_service._create_matcher(text) for text in utterances]
+        for intent_type, utterances in ais_ai_service.INTENT_UTTERANCES.items()
+    }
+
+    # every shipped utterance with the slots filled in, and some texts
+    # which are not matching any intent and are going to the cloud
+    texts = [
+        re.sub(r"[\[\]]", "", re.sub(r"{\w+}", "salon", utterance)).lower()
+        for utterances in ais_ai_service.INTENT_UTTERANCES.values()
+        for utterance in utterances
+    ]
+    texts += [
+        "radio trójka",
+        "podcast historia",
+        "ile kosztuje bilet do warszawy",
+        "dlaczego niebo jest niebieskie",
+    ]
+    size = len(texts)
+
+    if use_index:
+        match = IntentIndex(intents).match
+    else:
+
+        def match(text):
+            for intent_type, matchers in intents.items():
+                for matcher in matchers:
+                    found = matcher.match(text)
+                    if found:
+                        return intent_type, found
+            return None, None
+
+    start = timer()
+
+    for i in range(10 ** 5):
+        match(texts[i % size])
+
+    return timer() - start
+
+
+@benchmark
+async def ais_match_entity(hass):
+    """Match 1000 names against 2000 entities using the entity name index."""
+    return await _ais_match_entity(hass, True)
+
+
+@benchmark
+async def ais_match_entity_extract_one(hass):
+    """Match 1000 names against 2000 entities scanning all the names."""
+    return await _ais_match_entity(hass, False)
+
+
+async def _ais_match_entity(hass, use_index):
+    # pylint: disable=import-outside-toplevel
+    from fuzzywuzzy import process as fuzzy_extract
+
+    from homeassistant.components.ais_ai_service.entity_index import (
+        SCORE_CUTOFF,
+        EntityNameIndex,
+    )
+
+    rooms = ["salon", "kuchnia", "łazienka", "sypialnia", "garaż", "biuro", "taras"]
+    things = ["lampa", "światło", "gniazdko", "temperatura", "roleta", "termostat"]
+    domains = ["light", "switch", "sensor", "cover", "climate"]
+    names = [
+        f"{thing} {room} {idx}"
+        for idx in range(50)
+        for thing in things
+        for room in rooms
+    ][:2000]
+    for idx, name in enumerate(names):
+        hass.states.async_set(
+            f"{domains[idx % len(domains)]}.entity_{idx}", "on", {"friendly_name": name}
+        )
+    # half of the texts are the entity names, half only a part of them
+    texts = [names[idx * 7 % len(names)] for idx in range(500)]
+    texts += [name.rsplit(" ", 1)[0] for name in texts]
+
+    if use_index:
+        entity_index = EntityNameIndex(hass)
+        entity_index.async_start()
+        match = entity_index.async_match
+    else:
+
+        def match(text):
+            entities = {
+                state.entity_id: state.name for state in hass.states.async_all()
+            }
+            return fuzzy_extract.extractOne(text, entities, score_cutoff=SCORE_CUTOFF)
+
+    start = timer()
+
+    for text in texts:
+        match(text)
+
+    return timer() - start
+
+
+@benchmark
+async def ais_cloud_settings_tracker(hass):
+    """Run 100k sensor state changes past the AIS assistant settings tracker."""
+    return await _ais_cloud_settings(hass, True)
+
+
+@benchmark
+async def ais_cloud_settings_listener(hass):
+    """Run 100k sensor state changes past a state changed listener."""
+    return await _ais_cloud_settings(hass, False)
+
+
+async def _ais_cloud_settings(hass, use_tracker):
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import ais_cloud
+    from homeassistant.components.ais_dom import ais_global
+
+    ais_global.G_AIS_START_IS_DONE = True
+
+    if use_tracker:
+        ais_cloud.async_track_assistant_settings(hass)
+    else:
+        # the listener called with every state change, like before
+        def listener(event):
+            """Handle event."""
+            if event.data.get("entity_id") == "input_number.assistant_rate":
+                ais_global.GLOBAL_TTS_RATE = float(event.data["new_state"].state)
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+
+    event_data = [
+        {
+            "entity_id": f"sensor.temperature_{idx}",
+            "old_state": core.State(f"sensor.temperature_{idx}", "20"),
+            "new_state": core.State(f"sensor.temperature_{idx}", "21"),
+        }
+        for idx in range(100)
+    ]
+
+    start = timer()
+
+    for idx in range(10 ** 5):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, event_data[idx % 100])
+    await hass.async_block_till_done()
+
+    return timer() - start
+
+
+@benchmark
+async def recorder_write_stream(hass):
+    """Record a minute of a 10k events/min state changes stream in SQLite."""
+    # pylint: disable=import-outside-toplevel
+    import tempfile
+
+    from homeassistant.components.recorder import CONFIG_SCHEMA, DOMAIN, Recorder
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        instance = Recorder(
+            hass,
+            auto_purge=False,
+            keep_days=1,
+            commit_interval=1,
+            uri=f"sqlite:///{tmp_dir}/benchmark.db",
+            db_max_retries=1,
+            db_retry_wait=1,
+            entity_filter=convert_include_exclude_filter(
+                CONFIG_SCHEMA({DOMAIN: {}})[DOMAIN]
+            ),
+            exclude_t=[],
+            db_integrity_check=False,
+        )
+        instance.async_initialize()
+        instance.start()
+        await instance.async_db_ready
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+
+        states = [
+            [
+                core.State(
+                    f"sensor.zigbee_{idx}",
+                    str(value),
+                    {"unit_of_measurement": "°C", "friendly_name": f"Zigbee {idx}"},
+                )
+                for value in range(2)
+            ]
+            for idx in range(100)
+        ]
+
+        start = timer()
+
+        # 60 seconds of the stream, the time passes with the time changed events
+        for second in range(60):
+            for idx in range(10 ** 4 // 60):
+                entity_states = states[idx % 100]
+                hass.bus.async_fire(
+                    EVENT_STATE_CHANGED,
+                    {
+                        "entity_id": entity_states[0].entity_id,
+                        "old_state": entity_states[second % 2],
+                        "new_state": entity_states[(second + 1) % 2],
+                    },
+                )
+            hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: dt_util.utcnow()})
+        await hass.async_block_till_done()
+        # the recorder does not need the event loop to write the events
+        instance.block_till_done()
+
+        runtime = timer() - start
+
+        instance.queue.put(None)
+        instance.join()
+
+    return runtime
+
+
+@benchmark
+async def state_machine_domain_queries(hass):
+    """Query the states of 30 domains with 5000 entities 10k times."""
+    domains = [f"domain_{idx}" for idx in range(30)]
+    for idx in range(5000):
+        hass.states.async_set(f"{domains[idx % 30]}.entity_{idx}", "on")
+
+    start = timer()
+
+    for idx in range(10 ** 4):
+        domain = domains[idx % 30]
+        hass.states.async_all(domain)
+        hass.states.async_entity_ids(domain)
+        hass.states.async_entity_ids_count(domain)
+        hass.states.async_all(domains[:3])
+
+    return timer() - start
+
+
+@benchmark
+async def state_memory(hass):
+    """Keep 10 writes of 2k states and report the memory used per state."""
+    attributes = {
+        "friendly_name": "Zigbee power",
+        "unit_of_measurement": "W",
+        "icon": "mdi:flash",
+        "device_class": "power",
+    }
+    states = []
+
+    start = timer()
+    tracemalloc.start()
+
+    for idx in range(10):
+        for entity_idx in range(2000):
+            entity_id = f"sensor.zigbee_power_{entity_idx}"
+            # the entities give a new dict of the attributes on each write
+            hass.states.async_set(entity_id, str(idx), dict(attributes))
+            states.append(hass.states.get(entity_id))
+
+    print("Memory per state:", tracemalloc.get_traced_memory()[0] // len(states))
+    tracemalloc.stop()
+
+    return timer() - start
+
+
+@benchmark
+async def ais_file_upload(hass):
+    """Stream a 100 MB upload to a file and report its throughput and memory."""
+    # pylint: disable=import-outside-toplevel
+    import os
+    import tempfile
+
+    from homeassistant.components.ais_files import UPLOAD_CHUNK_SIZE, async_save_upload
+
+    size = 100 * 1024 * 1024
+    chunk = os.urandom(UPLOAD_CHUNK_SIZE)
+
+    class UploadField:
+        """The uploaded file part, read the same way as from aiohttp."""
+
+        def __init__(self):
+            self.left = size
+
+        async def read_chunk(self, chunk_size):
+            data = chunk[: min(chunk_size, self.left)]
+            self.left -= len(data)
+            return data
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = timer()
+        tracemalloc.start()
+        written = await async_save_upload(
+            hass, UploadField(), os.path.join(tmp_dir, "upload.jpg")
+        )
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        runtime = timer() - start
+
+    print("Throughput:", written / runtime // (1024 * 1024), "MB/s")
+    print("Peak memory:", peak // 1024, "kB")
+    return runtime
+
+
+@benchmark
+async def service_call_many(hass):
+    """Turn on 60 lights a thousand times with a single call."""
+    return await _service_calls(hass, True)
+
+
+@benchmark
+async def service_call_each(hass):
+    """Turn on 60 lights a thousand times with a call for each light."""
+    return await _service_calls(hass, False)
+
+
+async def _service_calls(hass, call_many):
+    # pylint: disable=import-outside-toplevel
+    import voluptuous as vol
+
+    from homeassistant.helpers import config_validation as cv
+
+    count = 0
+
+    async def turn_on(call):
+        """Handle the call like an entity service."""
+        nonlocal count
+        await asyncio.sleep(0)
+        count += len(call.data["entity_id"])
+
+    hass.services.async_register(
+        "light",
+        "turn_on",
+        turn_on,
+        cv.make_entity_service_schema({vol.Optional("brightness"): cv.positive_int}),
+    )
+    calls = [
+        ("light", "turn_on", {"entity_id": f"light.zigbee_{idx}", "brightness": 255})
+        for idx in range(60)
+    ]
+
+    start = timer()
+
+    for _ in range(1000):
+        if call_many:
+            await hass.services.async_call_many(calls, blocking=True)
+        else:
+            await asyncio.gather(
+                *(hass.services.async_call(*call, blocking=True) for call in calls)
+            )
+
+    assert count == 60 * 1000
+    return timer() - start
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -9,6 +9,14 @@ from homeassistant import config as conf_util, core, loader, requirements
 from homeassistant.config import async_notify_setup_error
 from homeassistant.const import EVENT_COMPONENT_LOADED, PLATFORM_FORMAT
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.startup_trace import (
+    STEP_IMPORT,
+    STEP_INTEGRATION,
+    STEP_REQUIREMENTS,
+    STEP_SETUP,
+    add_step,
+    trace_step,
+)
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 
@@ -18,6 +26,7 @@ ATTR_COMPONENT = "component"
 
 DATA_SETUP_DONE = "setup_done"
 DATA_SETUP_STARTED = "setup_started"
+DATA_SETUP_TIME = "setup_time"
 DATA_SETUP = "setup_tasks"
 DATA_DEPS_REQS = "deps_reqs_processed"
 
@@ -139,7 +148,8 @@ async def _async_setup_component(
         async_notify_setup_error(hass, domain, link)
 
     try:
-        integration = await loader.async_get_integration(hass, domain)
+        with trace_step(hass, domain, STEP_INTEGRATION):
+            integration = await loader.async_get_integration(hass, domain)
     except loader.IntegrationNotFound:
         log_error("Integration not found.")
         return False
@@ -162,6 +172,7 @@ async def _async_setup_component(
 
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
+    import_start = timer()
     try:
         component = integration.get_component()
     except ImportError as err:
@@ -170,6 +181,8 @@ async def _async_setup_component(
     except Exception:  # pylint: disable=broad-except
         _LOGGER.exception("Setup failed for %s: unknown error", domain)
         return False
+    import_time = timer() - import_start
+    add_step(hass, domain, STEP_IMPORT, import_start, import_start + import_time)
 
     processed_config = await conf_util.async_process_component_config(
         hass, config, integration
@@ -229,6 +242,12 @@ async def _async_setup_component(
         end = timer()
         if warn_task:
             warn_task.cancel()
+        hass.data.setdefault(DATA_SETUP_TIME, {})[domain] = {
+            "start": import_start,
+            "import": import_time,
+            "setup": end - start,
+        }
+        add_step(hass, domain, STEP_SETUP, start, end)
     _LOGGER.info("Setup of domain %s took %.1f seconds", domain, end - start)
 
     if result is False:
@@ -295,7 +314,8 @@ async def async_prepare_setup_platform(
         return None
 
     try:
-        platform = integration.get_platform(domain)
+        with trace_step(hass, platform_path, STEP_IMPORT):
+            platform = integration.get_platform(domain)
     except ImportError as exc:
         log_error(f"Platform not found ({exc}).")
         return None
@@ -340,9 +360,10 @@ async def async_process_deps_reqs(
 
     if not hass.config.skip_pip and integration.requirements:
         async with hass.timeout.async_freeze(integration.domain):
-            await requirements.async_get_integration_with_requirements(
-                hass, integration.domain
-            )
+            with trace_step(hass, integration.domain, STEP_REQUIREMENTS):
+                await requirements.async_get_integration_with_requirements(
+                    hass, integration.domain
+                )
 
     processed.add(integration.domain)
 
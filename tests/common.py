@@ -209,6 +209,9 @@ async def async_test_home_assistant(loop):
     hass.config.skip_pip = True
     hass.config.legacy_templates = False
 
+    # Keep the loader cache out of the test config dir
+    hass.data[loader.DATA_LOADER_CACHE] = loader.LoaderCache()
+
     hass.config_entries = config_entries.ConfigEntries(hass, {})
     hass.config_entries._entries = []
     hass.config_entries._store._async_ensure_stop_listener = lambda: None
@@ -937,6 +940,21 @@ def mock_storage(data=None):
         """Remove data."""
         data.pop(store.key, None)
 
+    def mock_read_journal(store):
+        """Mock version of reading the journal."""
+        return list(data.get(f"{store.key}.journal", []))
+
+    def mock_append_journal(store, added):
+        """Mock version of appending to the journal."""
+        _LOGGER.info("Appending data to %s: %s", store.key, added)
+        data.setdefault(f"{store.key}.journal", []).extend(
+            json.loads(json.dumps(added, cls=store._encoder))
+        )
+
+    def mock_remove_journal(store):
+        """Mock version of removing the journal."""
+        data.pop(f"{store.key}.journal", None)
+
     with patch(
         "homeassistant.helpers.storage.Store._async_load",
         side_effect=mock_async_load,
@@ -949,6 +967,18 @@ def mock_storage(data=None):
         "homeassistant.helpers.storage.Store.async_remove",
         side_effect=mock_remove,
         autospec=True,
+    ), patch(
+        "homeassistant.helpers.storage.JournalStore._read_journal",
+        side_effect=mock_read_journal,
+        autospec=True,
+    ), patch(
+        "homeassistant.helpers.storage.JournalStore._append_journal",
+        side_effect=mock_append_journal,
+        autospec=True,
+    ), patch(
+        "homeassistant.helpers.storage.JournalStore._remove_journal",
+        side_effect=mock_remove_journal,
+        autospec=True,
     ):
         yield data
 
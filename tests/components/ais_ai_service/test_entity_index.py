@@ -0,0 +1,133 @@
+"""The tests for the AIS dom entity name index."""
+import pytest
+
+from homeassistant.components.ais_ai_service.entity_index import (
+    SCORE_CUTOFF,
+    EntityNameIndex,
+)
+
+fuzzy_process = pytest.importorskip("fuzzywuzzy.process")
+
+ROOMS = ["Salon", "Kuchnia", "Sypialnia", "Łazienka", "Przedpokój", "Garaż"]
+DEVICES = [
+    ("light", "Światło"),
+    ("light", "Lampa"),
+    ("switch", "Gniazdko"),
+    ("switch", "Wentylator"),
+    ("sensor", "Temperatura"),
+    ("cover", "Roleta"),
+    ("climate", "Ogrzewanie"),
+    ("media_player", "Głośnik"),
+]
+OTHER_NAMES = {
+    "media_player.wbudowany_glosnik": "Odtwarzacz",
+    "switch.ais_tv": "Telewizor",
+    "light.led": "LED",
+    "light.led_strip": "Taśma LED w salonie",
+    "sensor.pm25": "PM2.5",
+    "switch.pompa": "Pompa ciepła",
+    "switch.brama": "Brama wjazdowa",
+    "cover.garaz": "Brama garażowa",
+    "input_boolean.tryb_nocny": "Tryb nocny",
+}
+OTHER_TEXTS = [
+    "LE",
+    "L",
+    "a g",
+    "r k",
+    "telewizja",
+    "radio",
+    "światła",
+    "lampy w salonie",
+    "brama",
+    "pm 2.5",
+    "ogrzewanie w łazience",
+    "gniazdko w kuchni",
+    "wentylator kuchnia proszę",
+]
+
+
+def _names():
+    """Return the names of the entities of a typical home."""
+    names = {
+        f"{domain}.{domain}_{device_idx}_{room_idx}": f"{device} {room}"
+        for device_idx, (domain, device) in enumerate(DEVICES)
+        for room_idx, room in enumerate(ROOMS)
+    }
+    names.update(OTHER_NAMES)
+    return names
+
+
+def _texts(names):
+    """Return the names as they are said, misspelled and shortened."""
+    texts = list(OTHER_TEXTS)
+    for name in names.values():
+        words = name.split()
+        texts += [
+            name.lower(),
+            name[:-1],
+            name.replace("a", "e", 1),
+            " ".join(reversed(words)),
+            words[-1],
+            name[: len(name) // 2],
+        ]
+    return texts
+
+
+def _extract_one(names, text, domain=None):
+    """Return the entity matched by scoring all the names, as before the index."""
+    choices = {
+        entity_id: name
+        for entity_id, name in names.items()
+        if domain is None or entity_id.startswith(domain)
+    }
+    found = fuzzy_process.extractOne(text, choices, score_cutoff=SCORE_CUTOFF)
+    return found[2] if found else None
+
+
+async def _async_index(hass, names):
+    """Set the states of the entities and index them."""
+    for entity_id, name in names.items():
+        hass.states.async_set(entity_id, "on", {"friendly_name": name})
+    index = EntityNameIndex(hass)
+    index.async_start()
+    return index
+
+
+async def test_same_match_as_extract_one(hass):
+    """Test the index finds the same entities as scoring all the names."""
+    names = _names()
+    index = await _async_index(hass, names)
+
+    for text in _texts(names):
+        assert index.async_match(text) == _extract_one(names, text), text
+
+
+async def test_same_match_in_domain(hass):
+    """Test the index finds the same entities of the domain."""
+    names = _names()
+    index = await _async_index(hass, names)
+
+    for text in OTHER_TEXTS + ["Lampa", "Brama", "Salon", "LED"]:
+        for domain in ("light", "switch", "cover"):
+            assert index.async_match(text, domain) == _extract_one(
+                names, text, domain
+            ), (text, domain)
+
+
+async def test_follow_state_changes(hass):
+    """Test the renamed and removed entities are matched by the new names."""
+    names = _names()
+    index = await _async_index(hass, names)
+    assert index.async_match("Telewizor") == "switch.ais_tv"
+
+    hass.states.async_set("switch.ais_tv", "on", {"friendly_name": "Projektor"})
+    hass.states.async_set("light.nowa", "on", {"friendly_name": "Lampka nocna"})
+    hass.states.async_remove("light.led")
+    await hass.async_block_till_done()
+
+    names["switch.ais_tv"] = "Projektor"
+    names["light.nowa"] = "Lampka nocna"
+    del names["light.led"]
+    for text in ("Telewizor", "Projektor", "lampka nocna", "LED", "L"):
+        assert index.async_match(text) == _extract_one(names, text), text
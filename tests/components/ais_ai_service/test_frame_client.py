@@ -0,0 +1,129 @@
+"""The tests for the AIS dom frame client."""
+from unittest.mock import patch
+
+from homeassistant.components.ais_ai_service import frame_client
+from homeassistant.components.ais_ai_service.frame_client import AisFrameClient
+
+FRAME_IP = "10.0.0.5"
+FRAME_URL = f"http://{FRAME_IP}:8122/command"
+
+
+def _sent(aioclient_mock):
+    """Return the commands posted to the frames."""
+    return [data for _, _, data, _ in aioclient_mock.mock_calls]
+
+
+def _queue(client, ip, commands):
+    """Queue the key and command pairs without sending them yet."""
+    with patch.object(client.hass, "async_create_task") as create_task:
+        for key, command in commands:
+            client.async_send_command(ip, key, command)
+    return create_task
+
+
+async def test_send_in_order(hass, aioclient_mock):
+    """Test the commands are sent to each frame in the queued order."""
+    aioclient_mock.post(FRAME_URL)
+    client = AisFrameClient(hass)
+
+    for volume in (10, 20, 30):
+        client.async_send_command(FRAME_IP, "upVolume", {"upVolume": volume})
+    await hass.async_block_till_done()
+
+    assert _sent(aioclient_mock) == [
+        {"upVolume": 10},
+        {"upVolume": 20},
+        {"upVolume": 30},
+    ]
+    metrics = client.metrics[FRAME_IP]
+    assert metrics["sent"] == 3
+    assert metrics["queue_depth"] == 0
+
+
+async def test_coalesce_keeps_order(hass, aioclient_mock):
+    """Test the coalesced command is sent after the commands queued before."""
+    aioclient_mock.post(FRAME_URL)
+    client = AisFrameClient(hass)
+
+    create_task = _queue(
+        client,
+        FRAME_IP,
+        [
+            ("setVolume", {"setVolume": 10}),
+            ("upVolume", {"upVolume": True}),
+            ("setVolume", {"setVolume": 50}),
+        ],
+    )
+    assert client.metrics[FRAME_IP]["queue_depth"] == 2
+    assert client.metrics[FRAME_IP]["coalesced"] == 1
+
+    await create_task.call_args[0][0]
+    assert _sent(aioclient_mock) == [{"upVolume": True}, {"setVolume": 50}]
+
+
+async def test_coalesce_only_value_commands(hass, aioclient_mock):
+    """Test only the value setting commands are coalesced, per frame."""
+    aioclient_mock.post(FRAME_URL)
+    aioclient_mock.post("http://10.0.0.6:8122/command")
+    client = AisFrameClient(hass)
+
+    create_task = _queue(
+        client,
+        FRAME_IP,
+        [
+            ("upVolume", {"upVolume": True}),
+            ("upVolume", {"upVolume": True}),
+            ("setVolume", {"setVolume": 10}),
+        ],
+    )
+    other_task = _queue(client, "10.0.0.6", [("setVolume", {"setVolume": 20})])
+    assert client.metrics[FRAME_IP]["queue_depth"] == 3
+    assert client.metrics[FRAME_IP]["coalesced"] == 0
+    assert client.metrics["10.0.0.6"]["queue_depth"] == 1
+
+    await create_task.call_args[0][0]
+    await other_task.call_args[0][0]
+    assert _sent(aioclient_mock) == [
+        {"upVolume": True},
+        {"upVolume": True},
+        {"setVolume": 10},
+        {"setVolume": 20},
+    ]
+
+
+async def test_drop_oldest(hass, aioclient_mock):
+    """Test the oldest commands are dropped when the queue is full."""
+    aioclient_mock.post(FRAME_URL)
+    client = AisFrameClient(hass)
+
+    with patch.object(frame_client, "MAX_QUEUED_COMMANDS", 3):
+        create_task = _queue(
+            client,
+            FRAME_IP,
+            [("skipTo", {"skipTo": 1})]
+            + [("upVolume", {"upVolume": idx}) for idx in range(4)],
+        )
+    assert client.metrics[FRAME_IP]["dropped"] == 2
+
+    await create_task.call_args[0][0]
+    assert _sent(aioclient_mock) == [
+        {"upVolume": 1},
+        {"upVolume": 2},
+        {"upVolume": 3},
+    ]
+
+
+async def test_failed_command(hass, aioclient_mock):
+    """Test the failed command does not stop the commands queued after it."""
+    aioclient_mock.post(FRAME_URL, exc=OSError)
+    client = AisFrameClient(hass)
+
+    client.async_send_command(FRAME_IP, "upVolume", {"upVolume": True})
+    client.async_send_command(FRAME_IP, "downVolume", {"downVolume": True})
+    await hass.async_block_till_done()
+
+    metrics = client.metrics[FRAME_IP]
+    assert metrics["failed"] == 2
+    assert metrics["sent"] == 0
+    assert metrics["queue_depth"] == 0
+    assert metrics["average_latency"] is not None
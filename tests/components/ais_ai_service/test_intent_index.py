@@ -0,0 +1,95 @@
+"""The tests for the AIS dom intent index."""
+import re
+
+import pytest
+
+from homeassistant.components import ais_ai_service
+from homeassistant.components.ais_ai_service.intent_index import IntentIndex
+
+SLOT_VALUES = ["salon", "Kult", "album Kult", "radio zet", "nowy świat 2"]
+CLOUD_TEXTS = [
+    "",
+    "radio",
+    "ile kosztuje bilet do warszawy",
+    "dlaczego niebo jest niebieskie",
+    "WŁĄCZ",
+    "włącz album",
+    "włączyć album kult",
+]
+
+
+def _linear_match(intents, text):
+    """Match the text trying all the matchers one by one, as before the index."""
+    for intent_type, matchers in intents.items():
+        for matcher in matchers:
+            match = matcher.match(text)
+            if match:
+                return intent_type, match
+    return None, None
+
+
+def _texts():
+    """Return the shipped utterances with and without the optional words."""
+    texts = list(CLOUD_TEXTS)
+    for utterances in ais_ai_service.INTENT_UTTERANCES.values():
+        for utterance in utterances:
+            for optional in (r"\1", ""):
+                text = re.sub(r"\[([\w ]+)\] *", optional, utterance)
+                for value in SLOT_VALUES:
+                    filled = re.sub(r"{\w+}", value, text)
+                    texts += [filled, filled.lower(), filled.upper()]
+    return texts
+
+
+@pytest.fixture(name="intents")
+def intents_fixture():
+    """Return the matchers of the shipped AIS dom intents."""
+    # pylint: disable=protected-access
+    return {
+        intent_type: [ais_ai_service._create_matcher(text) for text in utterances]
+        for intent_type, utterances in ais_ai_service.INTENT_UTTERANCES.items()
+    }
+
+
+def test_same_match_as_linear_scan(intents):
+    """Test the index finds the same intent and slots as the linear scan."""
+    index = IntentIndex(intents)
+    assert len(index) == sum(len(matchers) for matchers in intents.values())
+
+    for text in _texts():
+        intent_type, match = index.match(text)
+        expected_type, expected = _linear_match(intents, text)
+        assert intent_type == expected_type, text
+        if expected is None:
+            assert match is None, text
+        else:
+            assert match.re is expected.re, text
+            assert match.groupdict() == expected.groupdict(), text
+
+
+def test_overlapping_prefixes(intents):
+    """Test the longer prefix does not hide the intent registered first."""
+    index = IntentIndex(intents)
+
+    intent_type, match = index.match("Włącz album Kult")
+    assert intent_type == ais_ai_service.INTENT_PLAY_LOCAL_MEDIA
+    assert match.groupdict() == {"item": "Kult"}
+
+    intent_type, match = index.match("Włącz salon")
+    assert intent_type == ais_ai_service.INTENT_TURN_ON
+    assert match.groupdict() == {"item": "salon"}
+
+
+def test_matchers_without_prefix():
+    """Test the matchers without a literal prefix are always tried in order."""
+    intents = {
+        "First": [re.compile(r"(?P<item>\w+) radio$", re.I)],
+        "Second": [re.compile(r"^radio (?P<item>\w+)$", re.I)],
+        "Third": [re.compile(r"^(?:the )?radio$", re.I)],
+    }
+    index = IntentIndex(intents)
+
+    assert index.match("zet radio")[0] == "First"
+    assert index.match("Radio zet")[0] == "Second"
+    assert index.match("radio")[0] == "Third"
+    assert index.match("telewizja") == (None, None)
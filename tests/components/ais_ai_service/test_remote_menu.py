@@ -0,0 +1,85 @@
+"""The tests for the AIS dom remote menu."""
+from homeassistant.components import ais_ai_service
+from homeassistant.components.ais_ai_service.remote_menu import RemoteMenu
+
+
+def _set_group(hass, entity_id, order, **attributes):
+    """Set the menu group."""
+    hass.states.async_set(
+        entity_id,
+        "on",
+        {"remote_group_view": "Mój Dom", "order": order, **attributes},
+    )
+
+
+def _entities(menu, entity_id):
+    """Return the entities of the menu group."""
+    for group in menu.groups:
+        if group["entity_id"] == entity_id:
+            return group["entities"]
+    return None
+
+
+async def test_incremental_update(hass):
+    """Test the domain members follow the added and removed entities."""
+    _set_group(hass, "group.all_ais_lights", 2)
+    _set_group(hass, "group.all_ais_switches", 1)
+    _set_group(hass, "group.dom_radio", 0, entity_id=["input_select.radio"])
+    hass.states.async_set("group.not_in_menu", "on")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("switch.fan", "off")
+    hass.states.async_set("switch.zigbee_tryb_parowania", "off")
+    hass.states.async_set("sensor.no_class", "1")
+
+    menu = RemoteMenu(hass)
+    menu.async_start()
+    groups = menu.async_update()
+    assert [group["entity_id"] for group in groups] == [
+        "group.dom_radio",
+        "group.all_ais_switches",
+        "group.all_ais_lights",
+    ]
+    assert _entities(menu, "group.dom_radio") == ["input_select.radio"]
+    assert _entities(menu, "group.all_ais_lights") == ["light.kitchen"]
+    assert _entities(menu, "group.all_ais_switches") == ["switch.fan"]
+    switches = groups[1]
+
+    hass.states.async_set("light.bedroom", "off")
+    hass.states.async_set("sensor.temperature", "21", {"device_class": "temperature"})
+    await hass.async_block_till_done()
+    groups = menu.async_update()
+    assert _entities(menu, "group.all_ais_lights") == [
+        "light.bedroom",
+        "light.kitchen",
+    ]
+    # the unchanged group is kept as it is
+    assert groups[1] is switches
+
+    # a state change does not add the entity again
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    menu.async_update()
+    assert _entities(menu, "group.all_ais_lights") == ["light.bedroom"]
+
+    # the sensors group shows up with its members
+    _set_group(hass, "group.all_ais_sensors", 3)
+    menu.async_update()
+    assert _entities(menu, "group.all_ais_sensors") == ["sensor.temperature"]
+
+
+async def test_get_groups_from_executor(hass):
+    """Test the groups are updated on the loop when asked from the executor."""
+    _set_group(hass, "group.all_ais_lights", 1)
+    hass.states.async_set("light.kitchen", "on")
+    menu = hass.data[ais_ai_service.DATA_REMOTE_MENU] = RemoteMenu(hass)
+    menu.async_start()
+
+    await hass.async_add_executor_job(ais_ai_service.get_groups, hass)
+    assert ais_ai_service.GROUP_ENTITIES is menu.groups
+    assert _entities(menu, "group.all_ais_lights") == ["light.kitchen"]
+
+    hass.states.async_set("light.bedroom", "on")
+    await hass.async_block_till_done()
+    ais_ai_service.get_groups(hass)
+    assert _entities(menu, "group.all_ais_lights") == ["light.bedroom", "light.kitchen"]
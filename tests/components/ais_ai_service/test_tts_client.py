@@ -0,0 +1,194 @@
+"""The tests for the AIS dom text to speech client."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components import ais_ai_service
+from homeassistant.components.ais_ai_service import tts_client
+from homeassistant.components.ais_ai_service.tts_client import (
+    LATENCY_WEIGHT,
+    MAX_ALIGN_DELAY,
+    MAX_FAILURES,
+    MAX_RETRY_INTERVAL,
+    RETRY_INTERVAL,
+    AisTtsClient,
+    SpeakerHealth,
+)
+import homeassistant.components.ais_dom.ais_global as ais_global
+
+from tests.common import async_mock_service
+
+SPEAKER_IP = "10.0.0.5"
+OTHER_IP = "10.0.0.6"
+TTS_DATA = {"text": "Dzień dobry", "pitch": 1.0, "rate": 1.0}
+
+
+def _tts_url(ip):
+    """Return the text to speech URL of the speaker."""
+    return f"http://{ip}:8122/text_to_speech"
+
+
+def test_circuit_opens_after_failures():
+    """Test the speaker is skipped after failures in a row until its retry."""
+    speaker = SpeakerHealth(SPEAKER_IP)
+    with patch.object(tts_client, "time") as mock_time:
+        mock_time.monotonic.return_value = 100
+        for _ in range(MAX_FAILURES - 1):
+            speaker.delivery_failed()
+        assert speaker.available
+
+        speaker.delivery_failed()
+        assert not speaker.available
+        assert speaker.metrics["circuit_open"]
+        assert speaker.retry_at == 100 + RETRY_INTERVAL
+
+        mock_time.monotonic.return_value = 100 + RETRY_INTERVAL
+        assert speaker.available
+        assert not speaker.metrics["circuit_open"]
+
+
+def test_retry_backoff():
+    """Test the retry interval doubles after each failed retry, up to the max."""
+    speaker = SpeakerHealth(SPEAKER_IP)
+    with patch.object(tts_client, "time") as mock_time:
+        mock_time.monotonic.return_value = 100
+        for _ in range(MAX_FAILURES):
+            speaker.delivery_failed()
+
+        intervals = []
+        for _ in range(6):
+            retry_at = mock_time.monotonic.return_value = speaker.retry_at
+            speaker.delivery_failed()
+            intervals.append(speaker.retry_interval)
+            assert speaker.retry_at == retry_at + speaker.retry_interval
+
+    assert intervals == [60, 120, 240, 480, MAX_RETRY_INTERVAL, MAX_RETRY_INTERVAL]
+    assert speaker.failed == MAX_FAILURES + 6
+
+
+def test_success_closes_circuit():
+    """Test a delivery resets the failures and the retry interval."""
+    speaker = SpeakerHealth(SPEAKER_IP)
+    for _ in range(MAX_FAILURES + 1):
+        speaker.delivery_failed()
+    assert speaker.retry_interval == 2 * RETRY_INTERVAL
+
+    speaker.delivery_succeeded(0.2)
+    assert speaker.available
+    assert speaker.failures_in_row == 0
+    assert speaker.retry_at is None
+    assert speaker.retry_interval == RETRY_INTERVAL
+
+    # a single failure does not open the circuit again
+    speaker.delivery_failed()
+    assert speaker.available
+
+
+def test_average_latency():
+    """Test the average latency weights the last delivery."""
+    speaker = SpeakerHealth(SPEAKER_IP)
+    assert speaker.metrics["average_latency"] is None
+
+    speaker.delivery_succeeded(1.0)
+    assert speaker.average_latency == 1.0
+
+    speaker.delivery_succeeded(2.0)
+    assert speaker.last_latency == 2.0
+    assert speaker.average_latency == pytest.approx(1.0 + LATENCY_WEIGHT)
+    assert speaker.metrics["delivered"] == 2
+
+
+def test_align_delay():
+    """Test the faster speakers are held back, but not too long."""
+    slow = SpeakerHealth(SPEAKER_IP)
+    slow.delivery_succeeded(0.5)
+    fast = SpeakerHealth(OTHER_IP)
+    fast.delivery_succeeded(0.2)
+    very_fast = SpeakerHealth("10.0.0.7")
+    very_fast.delivery_succeeded(0.01)
+    new = SpeakerHealth("10.0.0.8")
+
+    assert AisTtsClient._align_delay(slow, 0.5) == 0
+    assert AisTtsClient._align_delay(fast, 0.5) == pytest.approx(0.3)
+    assert AisTtsClient._align_delay(very_fast, 2.0) == MAX_ALIGN_DELAY
+    assert AisTtsClient._align_delay(new, 0.5) == 0
+
+
+async def test_say_to_speakers(hass, aioclient_mock):
+    """Test the text is posted to each speaker."""
+    aioclient_mock.post(_tts_url(SPEAKER_IP))
+    aioclient_mock.post(_tts_url(OTHER_IP))
+    client = AisTtsClient(hass)
+
+    latencies = await client.async_say_now([SPEAKER_IP, OTHER_IP], TTS_DATA)
+
+    assert set(latencies) == {SPEAKER_IP, OTHER_IP}
+    assert all(latency is not None for latency in latencies.values())
+    assert sorted(
+        (str(url), data) for _, url, data, _ in aioclient_mock.mock_calls
+    ) == [(_tts_url(SPEAKER_IP), TTS_DATA), (_tts_url(OTHER_IP), TTS_DATA)]
+    assert client.metrics[SPEAKER_IP]["delivered"] == 1
+    assert client.metrics[OTHER_IP]["delivered"] == 1
+
+
+async def test_skip_unavailable_speaker(hass, aioclient_mock):
+    """Test the dead speaker is not asked until its retry time."""
+    aioclient_mock.post(_tts_url(SPEAKER_IP), exc=asyncio.TimeoutError())
+    aioclient_mock.post(_tts_url(OTHER_IP))
+    client = AisTtsClient(hass)
+
+    for _ in range(MAX_FAILURES):
+        latencies = await client.async_say_now([SPEAKER_IP, OTHER_IP], TTS_DATA)
+        assert latencies[SPEAKER_IP] is None
+    assert client.metrics[SPEAKER_IP]["circuit_open"]
+    assert aioclient_mock.call_count == 2 * MAX_FAILURES
+
+    latencies = await client.async_say_now([SPEAKER_IP, OTHER_IP], TTS_DATA)
+    assert list(latencies) == [OTHER_IP]
+    assert aioclient_mock.call_count == 2 * MAX_FAILURES + 1
+
+    metrics = client.metrics[SPEAKER_IP]
+    assert metrics["failed"] == MAX_FAILURES
+    assert metrics["skipped"] == 1
+    assert metrics["delivered"] == 0
+    assert client.metrics[OTHER_IP]["delivered"] == MAX_FAILURES + 1
+
+
+async def test_hold_back_faster_speaker(hass):
+    """Test the post to the faster speaker waits for the slower one."""
+    client = AisTtsClient(hass)
+    client._speakers[SPEAKER_IP] = SpeakerHealth(SPEAKER_IP)
+    client._speakers[SPEAKER_IP].delivery_succeeded(0.4)
+    client._speakers[OTHER_IP] = SpeakerHealth(OTHER_IP)
+    client._speakers[OTHER_IP].delivery_succeeded(0.1)
+
+    with patch.object(client, "_async_post", return_value=0.1) as mock_post:
+        await client.async_say_now([SPEAKER_IP, OTHER_IP], TTS_DATA)
+
+    delays = {call[1][0].ip: call[1][2] for call in mock_post.mock_calls}
+    assert delays[SPEAKER_IP] == 0
+    assert delays[OTHER_IP] == pytest.approx(0.3)
+
+
+async def test_post_message_from_executor(hass):
+    """Test the message posted from a worker thread is sent from the loop."""
+    browser_calls = async_mock_service(hass, "ais_ai_service", "say_in_browser")
+    hass.states.async_set(
+        "media_player.salon", "on", {"unique_id": "abc", "device_ip": OTHER_IP}
+    )
+
+    with patch.object(
+        ais_global, "G_SPEAKERS_GROUP_LIST", ["media_player.salon"]
+    ), patch.object(AisTtsClient, "async_say_now", return_value={}) as mock_say:
+        await hass.async_add_executor_job(
+            ais_ai_service._post_message, "Dzień dobry", hass
+        )
+        await hass.async_block_till_done()
+
+    assert len(browser_calls) == 1
+    assert browser_calls[0].data == {"text": "Dzień dobry"}
+    assert len(mock_say.mock_calls) == 1
+    ips, tts_data = mock_say.call_args[0]
+    assert ips == ["127.0.0.1", OTHER_IP]
+    assert tts_data["text"] == "Dzień dobry"
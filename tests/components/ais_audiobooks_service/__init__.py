@@ -0,0 +1 @@
+"""Tests for the AIS audiobooks service integration."""
@@ -0,0 +1,71 @@
+"""The tests for the AIS audiobooks catalogue."""
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.ais_audiobooks_service.catalogue import (
+    AudioBooksCatalogue,
+)
+
+BOOKS = [
+    {"author": "Adam Mickiewicz", "title": "Pan Tadeusz"},
+    {"author": "bolesław Prus", "title": "Lalka"},
+    {"author": "Adam Mickiewicz", "title": "Dziady"},
+    {"author": "Aleksander Fredro", "title": "Zemsta"},
+]
+
+
+@pytest.fixture(name="books_path")
+def books_path_fixture(tmp_path):
+    """Return the path of the audiobooks list file."""
+    path = tmp_path / "audiobooks.json"
+    path.write_text(json.dumps(BOOKS))
+    return path
+
+
+def test_load(books_path):
+    """Test the authors are sorted and the books are kept by the author."""
+    catalogue = AudioBooksCatalogue(str(books_path))
+    catalogue.load()
+
+    assert catalogue.authors == [
+        "Adam Mickiewicz",
+        "Aleksander Fredro",
+        "bolesław Prus",
+    ]
+    assert [book["title"] for book in catalogue.books("Adam Mickiewicz")] == [
+        "Pan Tadeusz",
+        "Dziady",
+    ]
+    assert catalogue.books("Jan Kochanowski") == []
+
+
+def test_refresh_when_changed(books_path):
+    """Test the file is parsed again only after it was changed."""
+    catalogue = AudioBooksCatalogue(str(books_path))
+    catalogue.load()
+
+    with patch("json.loads") as mock_loads:
+        catalogue.load()
+    assert len(mock_loads.mock_calls) == 0
+
+    books_path.write_text(json.dumps(BOOKS[:1]))
+    os.utime(books_path, (0, 0))
+    catalogue.load()
+    assert catalogue.authors == ["Adam Mickiewicz"]
+
+    books_path.unlink()
+    catalogue.load()
+    assert catalogue.authors == []
+
+
+def test_broken_file(books_path):
+    """Test a broken file gives an empty catalogue."""
+    books_path.write_text('[{"author": ')
+    catalogue = AudioBooksCatalogue(str(books_path))
+    catalogue.load()
+
+    assert catalogue.authors == []
+    assert catalogue.books("Adam Mickiewicz") == []
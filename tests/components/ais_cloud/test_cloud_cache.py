@@ -0,0 +1,152 @@
+"""The tests for the AIS cloud response cache."""
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from homeassistant.components.ais_cloud.cloud_cache import CloudCache
+
+TTL = 60
+
+
+class MockCloud:
+    """Count the requests to the cloud and hold them until released."""
+
+    def __init__(self):
+        """Initialize the cloud."""
+        self.calls = 0
+        self.response = "first"
+        self.error = None
+        self.released = asyncio.Event()
+        self.released.set()
+
+    async def fetch(self):
+        """Return the response of the cloud."""
+        self.calls += 1
+        await self.released.wait()
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+@pytest.fixture(name="now")
+def now_fixture():
+    """Return the mocked monotonic clock of the cache."""
+    clock = [1000.0]
+    with patch(
+        "homeassistant.components.ais_cloud.cloud_cache.time",
+        Mock(monotonic=lambda: clock[0]),
+    ):
+        yield clock
+
+
+async def test_cache_response(hass, now):
+    """Test the response is cached for the TTL."""
+    cache = CloudCache(hass)
+    cloud = MockCloud()
+
+    assert await cache.async_get("key", cloud.fetch, TTL) == "first"
+    now[0] += TTL - 1
+    cloud.response = "second"
+    assert await cache.async_get("key", cloud.fetch, TTL) == "first"
+    assert await cache.async_get("other", cloud.fetch, TTL) == "second"
+    assert cloud.calls == 2
+
+
+async def test_coalesce_requests(hass, now):
+    """Test the requests in flight wait for the response of the first one."""
+    cache = CloudCache(hass)
+    cloud = MockCloud()
+    cloud.released.clear()
+
+    requests = [
+        hass.async_create_task(cache.async_get("key", cloud.fetch, TTL))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    cloud.released.set()
+
+    assert await asyncio.gather(*requests) == ["first"] * 3
+    assert cloud.calls == 1
+
+
+async def test_cancelled_request(hass, now):
+    """Test a cancelled request does not cancel the others waiting."""
+    cache = CloudCache(hass)
+    cloud = MockCloud()
+    cloud.released.clear()
+
+    cancelled = hass.async_create_task(cache.async_get("key", cloud.fetch, TTL))
+    waiting = hass.async_create_task(cache.async_get("key", cloud.fetch, TTL))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    cloud.released.set()
+
+    assert await waiting == "first"
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert cloud.calls == 1
+
+
+async def test_stale_while_revalidate(hass, now):
+    """Test the expired response is returned while it is refreshed."""
+    cache = CloudCache(hass)
+    cloud = MockCloud()
+    await cache.async_get("key", cloud.fetch, TTL)
+
+    now[0] += TTL
+    cloud.response = "second"
+    cloud.released.clear()
+    assert await cache.async_get("key", cloud.fetch, TTL) == "first"
+    assert await cache.async_get("key", cloud.fetch, TTL) == "first"
+
+    cloud.released.set()
+    await hass.async_block_till_done()
+    assert await cache.async_get("key", cloud.fetch, TTL) == "second"
+    assert cloud.calls == 2
+
+
+async def test_keep_response_when_refresh_fails(hass, now):
+    """Test the expired response is kept when the cloud can't be reached."""
+    cache = CloudCache(hass)
+    cloud = MockCloud()
+    await cache.async_get("key", cloud.fetch, TTL)
+
+    now[0] += TTL
+    cloud.error = asyncio.TimeoutError()
+    assert await cache.async_get("key", cloud.fetch, TTL) == "first"
+    await hass.async_block_till_done()
+
+    cloud.error = None
+    cloud.response = "second"
+    assert await cache.async_get("key", cloud.fetch, TTL) == "first"
+    await hass.async_block_till_done()
+    assert await cache.async_get("key", cloud.fetch, TTL) == "second"
+    assert cloud.calls == 3
+
+
+async def test_first_request_fails(hass, now):
+    """Test the error is raised when there is no response to fall back to."""
+    cache = CloudCache(hass)
+    cloud = MockCloud()
+    cloud.error = asyncio.TimeoutError()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await cache.async_get("key", cloud.fetch, TTL)
+
+    cloud.error = None
+    assert await cache.async_get("key", cloud.fetch, TTL) == "first"
+    assert cloud.calls == 2
+
+
+async def test_invalidate(hass, now):
+    """Test the invalidated response is fetched again."""
+    cache = CloudCache(hass)
+    cloud = MockCloud()
+    await cache.async_get("key", cloud.fetch, TTL)
+
+    cache.async_invalidate("key")
+    cache.async_invalidate("missing")
+    cloud.response = "second"
+    assert await cache.async_get("key", cloud.fetch, TTL) == "second"
+    assert cloud.calls == 2
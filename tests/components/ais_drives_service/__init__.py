@@ -0,0 +1 @@
+"""Tests for the AIS drives service integration."""
@@ -0,0 +1,205 @@
+"""The tests for the AIS drives media index."""
+import hashlib
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.ais_drives_service import media_index
+from homeassistant.components.ais_drives_service.media_index import MediaIndex
+
+# file name: duration, artist, album, title
+TRACKS = {
+    "Kult/Spokojnie/01.mp3": (200, "Kult", "Spokojnie", "Arahja"),
+    "Kult/Spokojnie/02.mp3": (180, "Kult", "Spokojnie", "Polska"),
+    "Kult/Ostatnia/01.mp3": (240, "KULT", "Ostatnia płyta", "Dziewczyna"),
+    "Kazik/01.mp3": (150, "Kazik", "Melassa", "Kult sztuki"),
+    "Składanka/01.mp3": (190, "Maanam", "Składanka", "Kocham cię, kochanie moje"),
+    "Składanka/02.mp3": (210, "Republika", "Składanka", "Kult"),
+    "Bez tagów/nagranie.mp3": (60, None, None, None),
+    "Bez tagów/okładka.jpg": None,
+}
+
+
+def _read_tags(path):
+    """Return the tags of the track, without the cover image."""
+    for name, tags in TRACKS.items():
+        if path.endswith(name):
+            return tags + (None,)
+    return None, None, None, None, None
+
+
+@pytest.fixture(name="index")
+def index_fixture(tmp_path):
+    """Return the index of the scanned tracks."""
+    root = tmp_path / "dysk"
+    for name in TRACKS:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"track")
+    index = MediaIndex(
+        str(tmp_path / "media.db"), str(tmp_path / "covers"), "/local/covers"
+    )
+    with patch.object(media_index, "read_tags", side_effect=_read_tags):
+        index.scan(str(root))
+    yield index
+    index.close()
+
+
+def test_artists(index):
+    """Test the artists are listed once, whatever their case, in pages."""
+    artists = index.artists()
+    assert [artist.casefold() for artist in artists] == [
+        "kazik",
+        "kult",
+        "maanam",
+        "republika",
+    ]
+    assert index.artists(0, 2) == artists[:2]
+    assert index.artists(2, 2) == artists[2:]
+    assert index.artists(4, 2) == []
+
+
+def test_artist_tracks(index):
+    """Test only the tracks of the artist are listed, in the album order."""
+    tracks = index.artist_tracks("kult")
+    assert [track["title"] for track in tracks] == ["Dziewczyna", "Arahja", "Polska"]
+
+    assert [track["title"] for track in index.artist_tracks("Kult", 1, 1)] == ["Arahja"]
+    assert index.artist_tracks("Kult", 3, 1) == []
+    assert index.artist_tracks("Kul") == []
+
+
+def test_search(index):
+    """Test the tracks matching the most query words are found first."""
+    assert [track["title"] for track in index.search("kult arahja")] == ["Arahja"]
+    assert {track["title"] for track in index.search("kochanie")} == {
+        "Kocham cię, kochanie moje"
+    }
+    assert [track["name"] for track in index.search("nagranie")] == ["nagranie.mp3"]
+    assert index.search("okładka") == []
+
+
+@pytest.fixture(name="empty_index")
+def empty_index_fixture(tmp_path):
+    """Return the index without the scanned tracks."""
+    index = MediaIndex(
+        str(tmp_path / "media.db"), str(tmp_path / "covers"), "/local/covers"
+    )
+    yield index
+    index.close()
+
+
+def _paths(index):
+    """Return the indexed paths."""
+    return [row["path"] for row in index.db.execute("SELECT path FROM entries")]
+
+
+def test_folder_scanned_when_changed(tmp_path, empty_index):
+    """Test the folder is scanned again only after it was changed."""
+    root = tmp_path / "dysk"
+    root.mkdir()
+    (root / "01.mp3").write_bytes(b"track")
+    os.utime(root, (1000, 1000))
+
+    with patch.object(
+        media_index, "read_tags", side_effect=_read_tags
+    ) as mock_read_tags:
+        assert [row["name"] for row in empty_index.list_folder(str(root))] == ["01.mp3"]
+        assert len(mock_read_tags.mock_calls) == 1
+
+        # the folder looks unchanged, the new file is not listed yet
+        (root / "02.mp3").write_bytes(b"track")
+        os.utime(root, (1000, 1000))
+        assert len(empty_index.list_folder(str(root))) == 1
+
+        os.utime(root, (2000, 2000))
+        assert [row["name"] for row in empty_index.list_folder(str(root))] == [
+            "01.mp3",
+            "02.mp3",
+        ]
+        # the tags of the unchanged file are not read again
+        assert len(mock_read_tags.mock_calls) == 2
+
+
+def test_tags_read_when_changed(tmp_path, empty_index):
+    """Test the tags are read again only after the file was changed."""
+    path = tmp_path / "01.mp3"
+    path.write_bytes(b"track")
+    os.utime(path, (1000, 1000))
+
+    with patch.object(
+        media_index,
+        "read_tags",
+        return_value=(200, "Kult", "Spokojnie", "Arahja", None),
+    ) as mock_read_tags:
+        assert empty_index.track(str(path))["title"] == "Arahja"
+        assert empty_index.track(str(path))["duration"] == 200
+        assert len(mock_read_tags.mock_calls) == 1
+
+        # a new size
+        path.write_bytes(b"longer track")
+        os.utime(path, (1000, 1000))
+        empty_index.track(str(path))
+        assert len(mock_read_tags.mock_calls) == 2
+
+        # a new modification time
+        os.utime(path, (2000, 2000))
+        empty_index.track(str(path))
+        assert len(mock_read_tags.mock_calls) == 3
+
+    path.unlink()
+    assert empty_index.track(str(path)) is None
+
+
+def test_removed_tree(tmp_path, empty_index):
+    """Test the removed folder is removed from the index with its content."""
+    root = tmp_path / "dysk"
+    for name in ("Kult/01.mp3", "Kult/Live/01.mp3", "Kult2/01.mp3"):
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"track")
+
+    with patch.object(media_index, "read_tags", side_effect=_read_tags):
+        empty_index.scan(str(root))
+        assert len(_paths(empty_index)) == 6
+
+        shutil.rmtree(root / "Kult")
+        empty_index.scan(str(root))
+
+    assert sorted(_paths(empty_index)) == [
+        str(root / "Kult2"),
+        str(root / "Kult2" / "01.mp3"),
+    ]
+    assert sorted(
+        row["path"] for row in empty_index.db.execute("SELECT path FROM folders")
+    ) == [str(root), str(root / "Kult2")]
+
+
+def test_cover_written_once(tmp_path, empty_index):
+    """Test the cover shared by the tracks is written once under its hash."""
+    root = tmp_path / "dysk"
+    root.mkdir()
+    (root / "01.mp3").write_bytes(b"track")
+    cover = hashlib.sha1(b"cover").hexdigest()
+    cover_path = tmp_path / "covers" / f"{cover}.jpg"
+
+    with patch.object(
+        media_index,
+        "read_tags",
+        return_value=(200, "Kult", "Spokojnie", "Arahja", b"cover"),
+    ):
+        empty_index.scan(str(root))
+        assert cover_path.read_bytes() == b"cover"
+        os.utime(cover_path, (1000, 1000))
+
+        (root / "02.mp3").write_bytes(b"track")
+        empty_index.scan(str(root))
+
+    # the cover was not written again
+    assert cover_path.stat().st_mtime == 1000
+    assert os.listdir(tmp_path / "covers") == [f"{cover}.jpg"]
+    tracks = empty_index.list_folder(str(root))
+    assert [track["cover"] for track in tracks] == [cover, cover]
+    assert empty_index.cover_path(cover) == f"/local/covers/{cover}.jpg"
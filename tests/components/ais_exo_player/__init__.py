@@ -0,0 +1 @@
+"""Tests for the AIS exo player integration."""
@@ -0,0 +1,154 @@
+"""The tests for the AIS exo player media browser."""
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from homeassistant.components import ais_drives_service
+from homeassistant.components.ais_audiobooks_service import DATA_CATALOGUE
+from homeassistant.components.ais_audiobooks_service.catalogue import (
+    AudioBooksCatalogue,
+)
+from homeassistant.components.ais_drives_service import media_index
+from homeassistant.components.ais_drives_service.media_index import MediaIndex
+from homeassistant.components.ais_exo_player import media_browser
+from homeassistant.components.media_player.const import (
+    MEDIA_CLASS_TRACK,
+    MEDIA_TYPE_APP,
+)
+from homeassistant.components.media_player.errors import BrowseError
+
+
+@pytest.fixture(name="books")
+def books_fixture(hass, tmp_path):
+    """Set up the catalogue of 150 authors with a book each."""
+    path = tmp_path / "audiobooks.json"
+    path.write_text(
+        json.dumps(
+            [
+                {
+                    "author": f"Autor {idx:03}",
+                    "title": f"Książka {idx:03}",
+                    "href": f"https://wolnelektury.pl/api/books/{idx}/",
+                    "cover_thumb": f"cover/{idx}.jpg",
+                }
+                for idx in range(150)
+            ]
+        )
+    )
+    hass.data[DATA_CATALOGUE] = AudioBooksCatalogue(str(path))
+
+
+@pytest.fixture(name="local_media")
+def local_media_fixture(hass, tmp_path):
+    """Set up the index of the media on the drives."""
+    tags = {
+        "01.mp3": (200, "Kult", "Spokojnie", "Arahja", None),
+        "02.mp3": (180, "Kult", "Spokojnie", "Polska", None),
+        "03.mp3": (150, "Kazik", "Melassa", "Kult sztuki", None),
+    }
+    root = tmp_path / "dysk"
+    root.mkdir()
+    for name in tags:
+        (root / name).write_bytes(b"track")
+    index = MediaIndex(
+        str(tmp_path / "media.db"), str(tmp_path / "covers"), "/local/covers"
+    )
+    with patch.object(
+        media_index, "read_tags", side_effect=lambda path: tags[path[-6:]]
+    ):
+        index.scan(str(root))
+    hass.data[ais_drives_service.DOMAIN] = Mock(media_index=index)
+    yield root
+    index.close()
+
+
+def test_split_page():
+    """Test the page number is split from the media content id."""
+    assert media_browser._split_page("ais_audio_books") == ("ais_audio_books", 1)
+    assert media_browser._split_page("ais_audio_books?page=3") == (
+        "ais_audio_books",
+        3,
+    )
+    assert media_browser._split_page("ais_audio_books/A?b?page=2") == (
+        "ais_audio_books/A?b",
+        2,
+    )
+    for page in ("x", "0", "-1", "", "1.5", "²"):
+        with pytest.raises(BrowseError):
+            media_browser._split_page("ais_audio_books?page=" + page)
+
+
+async def test_audio_books_pages(hass, books):
+    """Test the authors are listed in pages."""
+    root = await media_browser.browse_media(hass, MEDIA_TYPE_APP, "ais_audio_books")
+    assert len(root.children) == media_browser.AUDIO_BOOKS_PAGE_SIZE + 1
+    assert root.children[0].title == "Autor 000"
+    assert root.children[-1].media_content_id == "ais_audio_books?page=2"
+
+    root = await media_browser.browse_media(
+        hass, MEDIA_TYPE_APP, "ais_audio_books?page=2"
+    )
+    assert [child.title for child in root.children] == [
+        f"Autor {idx:03}" for idx in range(100, 150)
+    ]
+
+    root = await media_browser.browse_media(
+        hass, MEDIA_TYPE_APP, "ais_audio_books?page=3"
+    )
+    assert root.children == []
+
+
+async def test_audio_books_of_author(hass, books):
+    """Test the books of the author are listed."""
+    root = await media_browser.browse_media(
+        hass, MEDIA_TYPE_APP, "ais_audio_books/Autor 007"
+    )
+    assert [
+        (child.title, child.media_content_id, child.thumbnail)
+        for child in root.children
+    ] == [
+        (
+            "Książka 007",
+            "ais_audio_books/Autor 007/Książka 007/"
+            "https://wolnelektury.pl/api/books/7/",
+            "https://wolnelektury.pl/media/cover/7.jpg",
+        )
+    ]
+
+
+async def test_audio_books_malformed_page(hass, books):
+    """Test the malformed page is rejected."""
+    with pytest.raises(BrowseError):
+        await media_browser.browse_media(
+            hass, MEDIA_TYPE_APP, "ais_audio_books?page=next"
+        )
+
+
+async def test_local_media_search(hass, local_media):
+    """Test the media on the drives are searched from the browser."""
+    root = await media_browser.browse_media(hass, MEDIA_TYPE_APP, "ais_local_media")
+    assert [(child.title, child.media_content_id) for child in root.children] == [
+        ("Szukaj", "ais_local_media/search/"),
+        ("Kazik", "ais_local_media/Kazik"),
+        ("Kult", "ais_local_media/Kult"),
+    ]
+
+    root = await media_browser.browse_media(
+        hass, MEDIA_TYPE_APP, "ais_local_media/search/kult polska"
+    )
+    assert root.title == "Szukaj: kult polska"
+    assert [
+        (child.title, child.media_class, child.media_content_id, child.can_play)
+        for child in root.children
+    ] == [("Polska", MEDIA_CLASS_TRACK, str(local_media / "02.mp3"), True)]
+
+    root = await media_browser.browse_media(
+        hass, MEDIA_TYPE_APP, "ais_local_media/search/sztuki"
+    )
+    assert [child.title for child in root.children] == ["Kult sztuki"]
+
+    root = await media_browser.browse_media(
+        hass, MEDIA_TYPE_APP, "ais_local_media/search/"
+    )
+    assert root.children == []
@@ -0,0 +1 @@
+"""Tests for the AIS shell command integration."""
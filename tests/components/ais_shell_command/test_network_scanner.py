@@ -0,0 +1,156 @@
+"""The tests for the AIS shell command network scanner."""
+import asyncio
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+import pytest
+import voluptuous as vol
+
+from homeassistant.components.ais_shell_command import network_scanner
+
+
+@pytest.fixture
+async def stub_device(hass):
+    """Start a local server responding like the Tasmota and AIS devices."""
+
+    async def tasmota_status(request):
+        """Respond to the Tasmota status command."""
+        assert request.query["cmnd"] == "status"
+        return web.json_response({"Status": {"FriendlyName": ["Lampa"]}})
+
+    async def ais_info(request):
+        """Respond with the AIS device info as plain text JSON."""
+        return web.Response(text='{"Model": "AIS", "IPAddressIPv4": "127.0.0.1"}')
+
+    async def slow(request):
+        """Respond after the probe timeout."""
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/cm", tasmota_status)
+    app.router.add_get("/", ais_info)
+    app.router.add_get("/slow", slow)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server(loop=hass.loop)
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def session(hass):
+    """Return the client session used to probe the hosts."""
+    async with ClientSession() as client_session:
+        yield client_session
+
+
+def test_network_hosts():
+    """Test the hosts of the scanned network."""
+    hosts = network_scanner.network_hosts("192.168.1.17")
+    assert len(hosts) == 254
+    assert hosts[0] == "192.168.1.1"
+    assert hosts[-1] == "192.168.1.254"
+
+    hosts = network_scanner.network_hosts("192.168.1.17", "10.0.0.0/23")
+    assert len(hosts) == 510
+    assert hosts[-1] == "10.0.1.254"
+
+    with pytest.raises(ValueError):
+        network_scanner.network_hosts("192.168.1.17", "10.0.0.0/16")
+
+
+def test_valid_network():
+    """Test the network to scan is validated."""
+    assert network_scanner.valid_network("192.168.1.17/24") == "192.168.1.0/24"
+    assert network_scanner.valid_network("10.0.0.0/20") == "10.0.0.0/20"
+
+    for network in ("192.168.1", "192.168.1.0/33", "lan", "10.0.0.0/16", "::/64"):
+        with pytest.raises(vol.Invalid):
+            network_scanner.valid_network(network)
+
+
+async def test_probe_hosts(hass, stub_device, session):
+    """Test the responses are passed to the callback as they arrive."""
+    results = []
+    url = f"http://{{}}:{stub_device.port}/cm?cmnd=status"
+
+    # only 127.0.0.1 is listening, the other loopback hosts refuse
+    found = await network_scanner.async_probe_hosts(
+        session,
+        ["127.0.0.1", "127.0.0.2", "127.0.0.3"],
+        url,
+        lambda host, result: results.append((host, result)),
+        max_concurrent=2,
+    )
+
+    assert found == 1
+    assert results == [("127.0.0.1", {"Status": {"FriendlyName": ["Lampa"]}})]
+
+
+async def test_probe_hosts_plain_text_json(hass, stub_device, session):
+    """Test the JSON response is parsed whatever the content type is."""
+    results = []
+
+    found = await network_scanner.async_probe_hosts(
+        session,
+        ["127.0.0.1"],
+        f"http://{{}}:{stub_device.port}/",
+        lambda host, result: results.append(result),
+    )
+
+    assert found == 1
+    assert results == [{"Model": "AIS", "IPAddressIPv4": "127.0.0.1"}]
+
+
+async def test_probe_hosts_timeout_and_errors(hass, stub_device, session):
+    """Test the hosts not responding in time or with an error are skipped."""
+    results = []
+
+    found = await network_scanner.async_probe_hosts(
+        session,
+        ["127.0.0.1"],
+        f"http://{{}}:{stub_device.port}/slow",
+        lambda host, result: results.append(result),
+        timeout=0.1,
+    )
+    assert found == 0
+
+    found = await network_scanner.async_probe_hosts(
+        session,
+        ["127.0.0.1"],
+        f"http://{{}}:{stub_device.port}/missing",
+        lambda host, result: results.append(result),
+    )
+    assert found == 0
+    assert results == []
+
+
+async def test_probe_whole_network(hass, stub_device, session):
+    """Test the whole /24 network is probed at once."""
+    results = []
+
+    found = await network_scanner.async_probe_hosts(
+        session,
+        network_scanner.network_hosts("127.0.0.1"),
+        f"http://{{}}:{stub_device.port}/cm?cmnd=status",
+        lambda host, result: results.append(host),
+    )
+
+    assert found == 1
+    assert results == ["127.0.0.1"]
+
+
+async def test_probe_hosts_other_device(hass, stub_device, session, caplog):
+    """Test the hosts answering with some other JSON are skipped quietly."""
+    results = []
+
+    found = await network_scanner.async_probe_hosts(
+        session,
+        ["127.0.0.1"],
+        f"http://{{}}:{stub_device.port}/cm?cmnd=status",
+        lambda host, info: results.append(info["Model"]),
+    )
+
+    assert found == 0
+    assert results == []
+    assert "Error processing the response" not in caplog.text
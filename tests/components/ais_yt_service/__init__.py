@@ -0,0 +1 @@
+"""Tests for the AIS YouTube service integration."""
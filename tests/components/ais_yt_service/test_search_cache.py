@@ -0,0 +1,210 @@
+"""The tests for the AIS YouTube search cache."""
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.ais_yt_service import YouTubeData, search_cache
+from homeassistant.components.ais_yt_service.search_cache import (
+    PAGE_TTL,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    STREAM_EXPIRY_MARGIN,
+    STREAM_TTL,
+    YouTubeCache,
+)
+from homeassistant.core import ServiceCall
+
+from tests.common import async_mock_service
+
+NOW = 1600000000
+PAGE = {
+    "items": [
+        {
+            "id": {"videoId": "abc"},
+            "snippet": {
+                "title": "Kult - Arahja",
+                "thumbnails": {"medium": {"url": "https://i.ytimg.com/abc.jpg"}},
+            },
+        }
+    ],
+    "pageInfo": {"totalResults": 20},
+    "nextPageToken": "NEXT",
+}
+ERROR_PAGE = {"error": {"errors": [{"reason": "keyInvalid", "message": "Zły klucz"}]}}
+
+
+@pytest.fixture(name="mock_time")
+def mock_time_fixture():
+    """Return the mocked time of the cache."""
+    with patch.object(search_cache, "time") as mock_time:
+        mock_time.time.return_value = NOW
+        yield mock_time
+
+
+@pytest.fixture(name="cache")
+def cache_fixture(hass, hass_storage, mock_time):
+    """Return the cache with the mocked storage."""
+    return YouTubeCache(hass)
+
+
+def test_stream_expires(mock_time):
+    """Test the stream URL is used until its expiry, less the margin."""
+    assert (
+        search_cache._stream_expires(
+            "https://r1.googlevideo.com/videoplayback?expire=1600007200&itag=140"
+        )
+        == 1600007200 - STREAM_EXPIRY_MARGIN
+    )
+    assert (
+        search_cache._stream_expires("https://r1.googlevideo.com/videoplayback")
+        == NOW + STREAM_TTL
+    )
+    assert (
+        search_cache._stream_expires(
+            "https://r1.googlevideo.com/videoplayback?expire=soon"
+        )
+        == NOW + STREAM_TTL
+    )
+
+
+async def test_pages_lru(cache):
+    """Test the least recently used page is dropped when the cache is full."""
+    with patch.object(search_cache, "MAX_PAGES", 3):
+        for query in ("kult", "kazik", "maanam"):
+            cache.async_set_page(query, None, {"query": query})
+        # the query is not case sensitive
+        assert cache.async_get_page(" KULT", None) == {"query": "kult"}
+
+        cache.async_set_page("kult", "NEXT", {"query": "kult 2"})
+
+    assert cache.async_get_page("kazik", None) is None
+    assert cache.async_get_page("kult", None) == {"query": "kult"}
+    assert cache.async_get_page("maanam", None) == {"query": "maanam"}
+    assert cache.async_get_page("kult", "NEXT") == {"query": "kult 2"}
+
+
+async def test_streams_lru(cache):
+    """Test the least recently used stream is dropped when the cache is full."""
+    with patch.object(search_cache, "MAX_STREAMS", 2):
+        cache.async_set_stream("abc", "https://example.com/abc")
+        cache.async_set_stream("def", "https://example.com/def")
+        assert cache.async_get_stream("abc") == "https://example.com/abc"
+        cache.async_set_stream("ghi", "https://example.com/ghi")
+
+    assert cache.async_get_stream("def") is None
+    assert cache.async_get_stream("abc") == "https://example.com/abc"
+    assert cache.async_get_stream("ghi") == "https://example.com/ghi"
+
+
+async def test_expired_on_get(cache, mock_time):
+    """Test the expired entries are dropped when they are asked for."""
+    cache.async_set_page("kult", None, PAGE)
+    cache.async_set_stream("abc", "https://example.com/abc")
+
+    mock_time.time.return_value = NOW + STREAM_TTL
+    assert cache.async_get_stream("abc") is None
+    assert cache.async_has_page("kult", None)
+
+    mock_time.time.return_value = NOW + PAGE_TTL
+    assert not cache.async_has_page("kult", None)
+    assert cache.async_get_page("kult", None) is None
+    assert cache._pages == {}
+    assert cache._streams == {}
+
+
+async def test_expired_on_load(hass, hass_storage, mock_time):
+    """Test the expired entries are not loaded."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {
+            "pages": [
+                ["kult\n", {"data": {"query": "kult"}, "expires": NOW - 1}],
+                ["kazik\n", {"data": {"query": "kazik"}, "expires": NOW + 1}],
+            ],
+            "streams": [
+                ["abc", {"data": "https://example.com/abc", "expires": NOW}],
+                ["def", {"data": "https://example.com/def", "expires": NOW + 1}],
+            ],
+        },
+    }
+    cache = YouTubeCache(hass)
+    await cache.async_load()
+
+    assert cache.async_get_page("kult", None) is None
+    assert cache.async_get_page("kazik", None) == {"query": "kazik"}
+    assert cache.async_get_stream("abc") is None
+    assert cache.async_get_stream("def") == "https://example.com/def"
+
+
+async def test_saved(hass, hass_storage, cache):
+    """Test the entries are saved from the least recently used."""
+    cache.async_set_page("kult", None, PAGE)
+    cache.async_set_stream("abc", "https://example.com/abc")
+
+    data = cache._data_to_save()
+    assert data["pages"] == [
+        ("kult\n", {"data": PAGE, "expires": NOW + PAGE_TTL}),
+    ]
+    assert data["streams"] == [
+        ("abc", {"data": "https://example.com/abc", "expires": NOW + STREAM_TTL}),
+    ]
+
+
+@pytest.fixture(name="yt_data")
+def yt_data_fixture(hass, hass_storage, mock_time):
+    """Return the YouTube search with the mocked services."""
+    async_mock_service(hass, "ais_ai_service", "say_it")
+    async_mock_service(hass, "ais_yt_service", "select_track_uri")
+    data = YouTubeData(hass)
+    data.yt_key = "key"
+    return data
+
+
+async def _search(hass, yt_data, **call_data):
+    """Run the search service."""
+    await yt_data.async_process_search(
+        ServiceCall("ais_yt_service", "search", call_data)
+    )
+    await hass.async_block_till_done()
+
+
+async def test_prefetch_next_page(hass, yt_data):
+    """Test the next page is fetched to the cache while the user listens."""
+    next_page = {**PAGE, "nextPageToken": "NEXT2"}
+    with patch.object(
+        yt_data, "async_fetch_page", side_effect=[PAGE, next_page]
+    ) as mock_fetch:
+        await _search(hass, yt_data, query="kult")
+    assert [call[1] for call in mock_fetch.mock_calls] == [
+        ("kult", None),
+        ("kult", "NEXT"),
+    ]
+    assert yt_data.cache.async_has_page("kult", "NEXT")
+    assert hass.states.get("sensor.youtubelist").attributes[0]["uri"] == "abc"
+
+    # the next page is taken from the cache, the page after it is fetched
+    with patch.object(yt_data, "async_fetch_page", return_value=PAGE) as mock_fetch:
+        await _search(hass, yt_data, query="kult", nextPageToken="nextPageToken_NEXT")
+    assert [call[1] for call in mock_fetch.mock_calls] == [("kult", "NEXT2")]
+
+    # the cached pages are not fetched again
+    with patch.object(yt_data, "async_fetch_page") as mock_fetch:
+        await _search(hass, yt_data, query="kult")
+    assert mock_fetch.mock_calls == []
+
+
+async def test_error_not_cached(hass, yt_data):
+    """Test the error responses are not cached."""
+    with patch.object(
+        yt_data, "async_fetch_page", return_value=ERROR_PAGE
+    ) as mock_fetch:
+        await _search(hass, yt_data, query="kult")
+        await _search(hass, yt_data, query="kult")
+    assert len(mock_fetch.mock_calls) == 2
+    assert not yt_data.cache.async_has_page("kult", None)
+
+    # nor the prefetched ones
+    with patch.object(yt_data, "async_fetch_page", return_value=ERROR_PAGE):
+        await yt_data.async_prefetch_page("kult", "NEXT")
+    assert not yt_data.cache.async_has_page("kult", "NEXT")
@@ -6,7 +6,11 @@ import json
 import unittest
 
 from homeassistant.components import history, recorder
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.models import (
+    StatisticsShortTerm,
+    process_timestamp,
+)
+from homeassistant.const import STATE_UNAVAILABLE
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
@@ -758,6 +762,111 @@ class TestComponentHistory(unittest.TestCase):
 
         return zero, four, states
 
+    def test_get_significant_states_with_statistics(self):
+        """Test the states are replaced by the statistics of each entity.
+
+        The states of each entity are only returned after the last period of
+        its own statistics, the outages are returned between the statistics.
+        """
+        self.test_setup()
+        zero = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        zero -= timedelta(hours=3)
+        sensor_a = "sensor.a"
+        sensor_b = "sensor.b"
+
+        def minutes(value):
+            """Return the time the minutes after zero."""
+            return zero + timedelta(minutes=value)
+
+        for entity_id, minute, state in (
+            (sensor_a, 1, "10"),
+            (sensor_b, 1, "20"),
+            (sensor_a, 20, STATE_UNAVAILABLE),
+            (sensor_a, 40, "12"),
+            (sensor_a, 90, "15"),
+            (sensor_b, 90, "21"),
+        ):
+            with patch(
+                "homeassistant.components.recorder.dt_util.utcnow",
+                return_value=minutes(minute),
+            ):
+                self.hass.states.set(entity_id, state)
+                wait_recording_done(self.hass)
+
+        # the statistics of sensor.a end an hour before the ones of sensor.b
+        with recorder.session_scope(hass=self.hass) as session:
+            for entity_id, minute, mean in (
+                (sensor_a, 0, 10),
+                (sensor_a, 5, 10),
+                (sensor_a, 40, 12),
+                (sensor_a, 45, 12),
+                (sensor_a, 50, 12),
+                (sensor_a, 55, 12),
+                (sensor_b, 115, 20.5),
+            ):
+                session.add(
+                    StatisticsShortTerm(
+                        entity_id=entity_id,
+                        start=minutes(minute),
+                        mean=mean,
+                        min=mean,
+                        max=mean,
+                    )
+                )
+
+        hist = history.get_significant_states(
+            self.hass,
+            zero,
+            minutes(180),
+            entity_ids=[sensor_a, sensor_b],
+            include_start_time_state=False,
+            statistics_table=StatisticsShortTerm,
+        )
+
+        assert [(state.state, state.last_changed) for state in hist[sensor_a]] == [
+            ("10", minutes(0)),
+            ("10", minutes(5)),
+            (STATE_UNAVAILABLE, minutes(20)),
+            ("12", minutes(40)),
+            ("12", minutes(45)),
+            ("12", minutes(50)),
+            ("12", minutes(55)),
+            ("15", minutes(90)),
+        ]
+        assert [(state.state, state.last_changed) for state in hist[sensor_b]] == [
+            ("20.5", minutes(115))
+        ]
+
+        hist = history.get_significant_states(
+            self.hass,
+            zero,
+            minutes(180),
+            entity_ids=[sensor_a, sensor_b],
+            include_start_time_state=False,
+            minimal_response=True,
+            statistics_table=StatisticsShortTerm,
+        )
+
+        states = hist[sensor_a]
+        assert isinstance(states[0], ha.State)
+        assert isinstance(states[-1], ha.State)
+        assert states[-1].state == "15"
+        assert states[1:-1] == [
+            {
+                "state": state,
+                "last_changed": minutes(minute).isoformat(),
+            }
+            for minute, state in (
+                (5, "10"),
+                (20, STATE_UNAVAILABLE),
+                (40, "12"),
+                (45, "12"),
+                (50, "12"),
+                (55, "12"),
+            )
+        ]
+        assert isinstance(hist[sensor_b][0], ha.State)
+
 
 async def test_fetch_period_api(hass, hass_client):
     """Test the fetch period view for history."""
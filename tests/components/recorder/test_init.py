@@ -55,17 +55,18 @@ def test_saving_state_with_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    event_session = hass.data[DATA_INSTANCE].event_session
+    execute = event_session.execute
+
+    def _throw_if_state_inserted(statement, *args, **kwargs):
+        if getattr(statement, "table", None) is States.__table__:
+            raise OperationalError("insert the state", "fake params", "forced to fail")
+        return execute(statement, *args, **kwargs)
 
     with patch("time.sleep"), patch.object(
-        hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        event_session,
+        "execute",
+        side_effect=_throw_if_state_inserted,
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -1,6 +1,6 @@
 """The tests for the Recorder component."""
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.pool import StaticPool
 
 from homeassistant.bootstrap import async_setup_component
@@ -65,6 +65,19 @@ def test_invalid_update():
         migration._apply_update(None, -1, 0)
 
 
+def test_statistics_tables_update():
+    """Test that the schema 10 update adds the statistics tables."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models_original.Base.metadata.create_all(engine)
+    assert models.TABLE_STATISTICS not in inspect(engine).get_table_names()
+
+    migration._apply_update(engine, 10, 9)
+
+    tables = inspect(engine).get_table_names()
+    assert models.TABLE_STATISTICS in tables
+    assert models.TABLE_STATISTICS_SHORT_TERM in tables
+
+
 def test_forgiving_add_column():
     """Test that add column will continue if column exists."""
     engine = create_engine("sqlite://", poolclass=StaticPool)
@@ -4,7 +4,13 @@ import json
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    States,
+    Statistics,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
@@ -62,6 +68,37 @@ def test_purge_old_events(hass, hass_recorder):
         assert events.count() == 2
 
 
+def test_purge_old_statistics(hass, hass_recorder):
+    """Test deleting old statistics."""
+    hass = hass_recorder()
+    now = dt_util.utcnow()
+    with session_scope(hass=hass) as session:
+        for table, days in (
+            (StatisticsShortTerm, 11),
+            (StatisticsShortTerm, 5),
+            (StatisticsShortTerm, 0),
+            (Statistics, 400),
+            (Statistics, 11),
+            (Statistics, 0),
+        ):
+            session.add(
+                table(
+                    entity_id="sensor.test",
+                    start=now - timedelta(days=days),
+                    mean=1,
+                    min=1,
+                    max=1,
+                )
+            )
+
+    # the statistics are kept longer than the states
+    with session_scope(hass=hass) as session:
+        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        assert finished
+        assert session.query(StatisticsShortTerm).count() == 2
+        assert session.query(Statistics).count() == 2
+
+
 def test_purge_method(hass, hass_recorder):
     """Test purge method."""
     hass = hass_recorder()
@@ -123,7 +160,7 @@ def test_purge_method(hass, hass_recorder):
             hass.data[DATA_INSTANCE].block_till_done()
             wait_recording_done(hass)
             assert (
-                mock_logger.debug.mock_calls[5][1][0]
+                mock_logger.debug.mock_calls[7][1][0]
                 == "Vacuuming SQL DB to free space"
             )
 
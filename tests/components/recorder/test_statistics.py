@@ -0,0 +1,137 @@
+"""The tests for the Recorder statistics."""
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from homeassistant.components.recorder.models import (
+    Base,
+    Statistics,
+    StatisticsShortTerm,
+)
+from homeassistant.components.recorder.statistics import (
+    StatisticsCompiler,
+    statistics_during_period,
+)
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+import homeassistant.core as ha
+
+START = datetime(2021, 1, 1, 12, 0, tzinfo=pytz.utc)
+UNIT = {ATTR_UNIT_OF_MEASUREMENT: "°C"}
+
+
+def _rows(compiler, now):
+    """Return the compiled rows as tuples."""
+    return [
+        (type(row), row.entity_id, row.start, row.mean, row.min, row.max)
+        for row in compiler.compile(now)
+    ]
+
+
+def test_time_weighted_mean():
+    """Test the mean is weighted by the time the value was kept."""
+    compiler = StatisticsCompiler(tables=(StatisticsShortTerm,))
+    entity_id = "sensor.temperature"
+    compiler.add_state(entity_id, ha.State(entity_id, "10", UNIT), START)
+    compiler.add_state(
+        entity_id,
+        ha.State(entity_id, "20", UNIT),
+        START + timedelta(minutes=4),
+    )
+
+    assert _rows(compiler, START + timedelta(minutes=4)) == []
+    assert _rows(compiler, START + timedelta(minutes=5)) == [
+        (StatisticsShortTerm, entity_id, START, 12.0, 10.0, 20.0)
+    ]
+    # The value is carried over to the next period
+    assert _rows(compiler, START + timedelta(minutes=10)) == [
+        (StatisticsShortTerm, entity_id, START + timedelta(minutes=5), 20, 20, 20)
+    ]
+
+
+def test_periods_are_aligned():
+    """Test the periods start at the period boundaries."""
+    compiler = StatisticsCompiler()
+    entity_id = "sensor.power"
+    compiler.add_state(
+        entity_id, ha.State(entity_id, "5", UNIT), START + timedelta(minutes=32)
+    )
+
+    rows = _rows(compiler, START + timedelta(hours=1))
+    assert rows[0] == (
+        StatisticsShortTerm,
+        entity_id,
+        START + timedelta(minutes=30),
+        5,
+        5,
+        5,
+    )
+    assert len(rows) == 7
+    assert rows[-1] == (Statistics, entity_id, START, 5, 5, 5)
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        ha.State("sensor.temperature", "unavailable", UNIT),
+        ha.State("sensor.temperature", "10"),
+        ha.State("switch.heater", "10", UNIT),
+    ],
+)
+def test_not_numeric_states(state):
+    """Test only the numeric sensors with a unit are compiled."""
+    compiler = StatisticsCompiler()
+    compiler.add_state(state.entity_id, state, START)
+
+    assert _rows(compiler, START + timedelta(days=1)) == []
+
+
+def test_value_ends():
+    """Test the statistics stop when the sensor has no value."""
+    compiler = StatisticsCompiler(tables=(StatisticsShortTerm,))
+    entity_id = "sensor.temperature"
+    compiler.add_state(entity_id, ha.State(entity_id, "10", UNIT), START)
+    compiler.add_state(
+        entity_id,
+        ha.State(entity_id, "unavailable", UNIT),
+        START + timedelta(minutes=1),
+    )
+    compiler.add_state(
+        entity_id,
+        ha.State(entity_id, "30", UNIT),
+        START + timedelta(minutes=2),
+    )
+    compiler.add_state(entity_id, None, START + timedelta(minutes=3))
+
+    assert _rows(compiler, START + timedelta(minutes=20)) == [
+        (StatisticsShortTerm, entity_id, START, 20.0, 10.0, 30.0)
+    ]
+
+
+def test_statistics_during_period():
+    """Test reading the compiled statistics."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+
+    compiler = StatisticsCompiler(tables=(StatisticsShortTerm,))
+    for entity_id in ("sensor.b", "sensor.a"):
+        compiler.add_state(entity_id, ha.State(entity_id, "1", UNIT), START)
+    session.add_all(compiler.compile(START + timedelta(minutes=15)))
+    session.commit()
+
+    statistics = statistics_during_period(
+        session,
+        StatisticsShortTerm,
+        START + timedelta(minutes=5),
+        START + timedelta(hours=1),
+        ["sensor.a"],
+    )
+
+    assert list(statistics) == ["sensor.a"]
+    assert [row.mean for row in statistics["sensor.a"]] == [1, 1]
+
+    session.close()
+    engine.dispose()
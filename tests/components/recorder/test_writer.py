@@ -0,0 +1,107 @@
+"""The tests for the Recorder batch writer."""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from homeassistant.components.recorder.models import Base, Events, States
+from homeassistant.components.recorder.writer import BatchWriter
+from homeassistant.const import EVENT_STATE_CHANGED
+import homeassistant.core as ha
+
+
+def _state_changed(entity_id, state):
+    """Return a state_changed event of the entity."""
+    new_state = ha.State(entity_id, state) if state is not None else None
+    return ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "old_state": None, "new_state": new_state},
+    )
+
+
+def _add(writer, event):
+    """Add the state_changed event to the writer."""
+    writer.add_state(event, writer.add_event(event, event_data="{}"))
+
+
+def _commit(writer, session):
+    """Commit the rows of the writer."""
+    writer.flush(session)
+    session.commit()
+    writer.clear()
+
+
+def test_batches_are_linked():
+    """Test the states refer to their events and old states."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Events.from_event(ha.Event("test_event")))
+    session.commit()
+
+    writer = BatchWriter()
+    _add(writer, _state_changed("light.kitchen", "on"))
+    _add(writer, _state_changed("light.kitchen", "off"))
+    assert len(writer) == 4
+    _commit(writer, session)
+    assert len(writer) == 0
+
+    _add(writer, _state_changed("light.kitchen", "on"))
+    _add(writer, _state_changed("light.kitchen", None))
+    _commit(writer, session)
+
+    states = session.query(States).order_by(States.state_id).all()
+    assert [state.state for state in states] == ["on", "off", "on", None]
+    assert [state.event_id for state in states] == [2, 3, 4, 5]
+    assert [state.old_state_id for state in states] == [
+        None,
+        states[0].state_id,
+        states[1].state_id,
+        states[2].state_id,
+    ]
+
+    session.close()
+    engine.dispose()
+
+
+def test_discard():
+    """Test the discarded rows are not referred to."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    writer = BatchWriter()
+    _add(writer, _state_changed("light.kitchen", "on"))
+    writer.discard()
+    _add(writer, _state_changed("light.kitchen", "off"))
+    _commit(writer, session)
+
+    states = session.query(States).all()
+    assert [(state.state, state.old_state_id) for state in states] == [("off", None)]
+
+    session.close()
+    engine.dispose()
+
+
+def test_failed_commit_keeps_old_state():
+    """Test the committed old state is referred to after a failed commit."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    writer = BatchWriter()
+    _add(writer, _state_changed("light.kitchen", "on"))
+    _commit(writer, session)
+
+    _add(writer, _state_changed("light.kitchen", "off"))
+    writer.flush(session)
+    session.rollback()
+    writer.discard()
+
+    _add(writer, _state_changed("light.kitchen", "off"))
+    _commit(writer, session)
+
+    states = session.query(States).order_by(States.state_id).all()
+    assert [state.state for state in states] == ["on", "off"]
+    assert states[1].old_state_id == states[0].state_id
+
+    session.close()
+    engine.dispose()
@@ -11,6 +11,7 @@ from homeassistant.components.websocket_api.const import URL
 from homeassistant.core import Context, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity
+from homeassistant.helpers.startup_trace import DATA_STARTUP_TRACE, StartupTrace
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
 
@@ -674,6 +675,35 @@ async def test_manifest_get(hass, websocket_client):
     assert msg["error"]["code"] == "not_found"
 
 
+async def test_startup_trace(hass, websocket_client, hass_admin_user):
+    """Test the startup trace summary."""
+    await websocket_client.send_json({"id": 6, "type": "startup_trace"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_NOT_FOUND
+
+    trace = hass.data[DATA_STARTUP_TRACE] = StartupTrace()
+    trace.add("light", "setup", trace.start, trace.start + 1)
+
+    await websocket_client.send_json({"id": 7, "type": "startup_trace"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["success"]
+    assert msg["result"] == trace.summary()
+
+    hass_admin_user.groups = []
+
+    await websocket_client.send_json({"id": 8, "type": "startup_trace"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
 async def test_entity_source_admin(hass, websocket_client, hass_admin_user):
     """Check that we fetch sources correctly."""
     platform = MockEntityPlatform(hass)
@@ -7,6 +7,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.restore_state import (
     DATA_RESTORE_STATE_TASK,
+    STATE_SNAPSHOT_INTERVAL,
     STORAGE_KEY,
     RestoreEntity,
     RestoreStateData,
@@ -39,7 +40,7 @@ async def test_caching_data(hass):
 
     # Mock that only b1 is present this run
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.JournalStore.async_save"
     ) as mock_write_data:
         state = await entity.async_get_last_state()
         await hass.async_block_till_done()
@@ -76,7 +77,7 @@ async def test_hass_starting(hass):
     # Mock that only b1 is present this run
     states = [State("input_boolean.b1", "on")]
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.JournalStore.async_save"
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
         state = await entity.async_get_last_state()
         await hass.async_block_till_done()
@@ -90,7 +91,7 @@ async def test_hass_starting(hass):
 
     # Finish hass startup
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.JournalStore.async_save"
     ) as mock_write_data:
         hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
         await hass.async_block_till_done()
@@ -133,7 +134,7 @@ async def test_dump_data(hass):
     }
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.JournalStore.async_save"
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
         await data.async_dump_states()
 
@@ -159,7 +160,7 @@ async def test_dump_data(hass):
     await entity.async_remove()
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save"
+        "homeassistant.helpers.restore_state.JournalStore.async_save"
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
         await data.async_dump_states()
 
@@ -194,7 +195,7 @@ async def test_dump_error(hass):
     data = await RestoreStateData.async_get_instance(hass)
 
     with patch(
-        "homeassistant.helpers.restore_state.Store.async_save",
+        "homeassistant.helpers.restore_state.JournalStore.async_save",
         side_effect=HomeAssistantError,
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
         await data.async_dump_states()
@@ -272,3 +273,49 @@ async def test_restoring_invalid_entity_id(hass, hass_storage):
 
     state = await entity.async_get_last_state()
     assert state is None
+
+
+async def test_dump_changed_states(hass, hass_storage):
+    """Test only the changed states are appended to the journal."""
+    for entity_id in ("input_boolean.b0", "input_boolean.b1"):
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = entity_id
+        await entity.async_internal_added_to_hass()
+        hass.states.async_set(entity_id, "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await data.async_dump_states()
+    assert len(hass_storage[STORAGE_KEY]["data"]) == 2
+    assert f"{STORAGE_KEY}.journal" not in hass_storage
+
+    hass.states.async_set("input_boolean.b1", "off")
+    await data.async_dump_changed_states()
+    await hass.async_block_till_done()
+    journal = hass_storage[f"{STORAGE_KEY}.journal"]
+    assert [item["state"]["entity_id"] for item in journal] == ["input_boolean.b1"]
+
+    # Nothing changed since the last dump
+    await data.async_dump_changed_states()
+    await hass.async_block_till_done()
+    assert len(hass_storage[f"{STORAGE_KEY}.journal"]) == 1
+
+    # The journal is folded into the states on load
+    hass.data.pop(DATA_RESTORE_STATE_TASK)
+    loaded = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+    assert loaded.last_states["input_boolean.b0"].state.state == "on"
+    assert loaded.last_states["input_boolean.b1"].state.state == "off"
+
+    # All the states are saved again once in a while
+    with patch(
+        "homeassistant.helpers.restore_state.dt_util.utcnow",
+        return_value=dt_util.utcnow() + STATE_SNAPSHOT_INTERVAL,
+    ):
+        await data.async_dump_changed_states()
+    await hass.async_block_till_done()
+    assert f"{STORAGE_KEY}.journal" not in hass_storage
+    assert [item["state"]["state"] for item in hass_storage[STORAGE_KEY]["data"]] == [
+        "on",
+        "off",
+    ]
@@ -0,0 +1,115 @@
+"""Test the startup trace."""
+import pytest
+
+from homeassistant.helpers.startup_trace import (
+    DATA_STARTUP_TRACE,
+    STEP_IMPORT,
+    STEP_INTEGRATION,
+    STEP_SETUP,
+    StartupTrace,
+    trace_step,
+)
+from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
+
+from tests.common import MockModule, mock_integration
+
+
+async def test_trace_setup(hass):
+    """Test the steps of the setup of an integration are traced."""
+    trace = hass.data[DATA_STARTUP_TRACE] = StartupTrace()
+    mock_integration(hass, MockModule("comp"))
+
+    assert await async_setup_component(hass, "comp", {})
+
+    assert [(name, step) for name, step, _, _ in trace.spans] == [
+        ("comp", STEP_INTEGRATION),
+        ("comp", STEP_IMPORT),
+        ("comp", STEP_SETUP),
+    ]
+    # the import and the setup are timed once, for the timeline and the trace
+    setup_time = hass.data[DATA_SETUP_TIME]["comp"]
+    _, _, import_start, import_end = trace.spans[1]
+    _, _, setup_start, setup_end = trace.spans[2]
+    assert import_start == setup_time["start"]
+    assert import_end - import_start == pytest.approx(setup_time["import"])
+    assert setup_end - setup_start == pytest.approx(setup_time["setup"])
+
+    summary = trace.summary()
+    assert [item["name"] for item in summary["integrations"]] == ["comp"]
+    assert set(summary["integrations"][0]) == {
+        "name",
+        STEP_INTEGRATION,
+        STEP_IMPORT,
+        STEP_SETUP,
+    }
+
+
+async def test_not_traced(hass):
+    """Test nothing is traced unless the startup is traced."""
+    with trace_step(hass, "comp", STEP_SETUP):
+        pass
+
+    assert DATA_STARTUP_TRACE not in hass.data
+
+
+def test_chrome_trace():
+    """Test the trace in the Chrome trace event format."""
+    trace = StartupTrace()
+    trace.add("light", STEP_IMPORT, trace.start + 0.5, trace.start + 1)
+    trace.add("light", STEP_SETUP, trace.start + 1, trace.start + 3)
+    trace.add("light.hue", STEP_SETUP, trace.start + 2, trace.start + 2.5)
+
+    assert trace.as_chrome_trace()["traceEvents"] == [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": 1,
+            "tid": 1,
+            "args": {"name": "light"},
+        },
+        {
+            "name": "light import",
+            "cat": STEP_IMPORT,
+            "ph": "X",
+            "pid": 1,
+            "tid": 1,
+            "ts": 500000,
+            "dur": 500000,
+        },
+        {
+            "name": "light setup",
+            "cat": STEP_SETUP,
+            "ph": "X",
+            "pid": 1,
+            "tid": 1,
+            "ts": 1000000,
+            "dur": 2000000,
+        },
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": 1,
+            "tid": 2,
+            "args": {"name": "light.hue"},
+        },
+        {
+            "name": "light.hue setup",
+            "cat": STEP_SETUP,
+            "ph": "X",
+            "pid": 1,
+            "tid": 2,
+            "ts": 2000000,
+            "dur": 500000,
+        },
+    ]
+    assert trace.summary() == {
+        "duration": pytest.approx(3),
+        "integrations": [
+            {
+                "name": "light",
+                STEP_IMPORT: pytest.approx(0.5),
+                STEP_SETUP: pytest.approx(2),
+            },
+            {"name": "light.hue", STEP_SETUP: pytest.approx(0.5)},
+        ],
+    }
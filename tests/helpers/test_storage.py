@@ -2,6 +2,7 @@
 import asyncio
 from datetime import timedelta
 import json
+import os
 
 import pytest
 
@@ -236,3 +237,111 @@ async def test_migrator_transforming_config(hass, store, hass_storage):
         "version": MOCK_VERSION,
         "data": data,
     }
+
+
+async def test_coalesced_saves(hass, hass_storage):
+    """Test the delayed saves of the coalescing stores are written together."""
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, coalesce=True)
+    store2 = storage.Store(hass, MOCK_VERSION, "storage-test-2", coalesce=True)
+
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_executor:
+        store.async_delay_save(lambda: MOCK_DATA, 10)
+        store2.async_delay_save(lambda: MOCK_DATA2, 5)
+
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=4))
+        await hass.async_block_till_done()
+        assert store.key not in hass_storage
+        assert store2.key not in hass_storage
+
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=5))
+        await hass.async_block_till_done()
+
+    assert hass_storage[store.key]["data"] == MOCK_DATA
+    assert hass_storage[store2.key]["data"] == MOCK_DATA2
+    assert len(mock_executor.mock_calls) == 1
+
+    # Nothing is left to write when stopping
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    hass_storage.clear()
+    await hass.async_block_till_done()
+    assert hass_storage == {}
+
+
+async def test_coalesced_saves_on_final_write(hass, hass_storage):
+    """Test the coalesced saves are written when we quit Home Assistant."""
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, coalesce=True)
+    store.async_delay_save(lambda: MOCK_DATA, 5)
+
+    hass.state = CoreState.stopping
+    async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert store.key not in hass_storage
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert hass_storage[store.key]["data"] == MOCK_DATA
+
+
+async def test_journal_store(hass, hass_storage):
+    """Test the added items are appended to the journal until it is long."""
+    store = storage.JournalStore(hass, MOCK_VERSION, MOCK_KEY, max_journal=2)
+    assert await store.async_load() is None
+
+    store.async_append({"id": 1})
+    store.async_append({"id": 2})
+    await hass.async_block_till_done()
+
+    assert store.key not in hass_storage
+    assert hass_storage[f"{store.key}.journal"] == [{"id": 1}, {"id": 2}]
+
+    store = storage.JournalStore(hass, MOCK_VERSION, MOCK_KEY, max_journal=2)
+    assert await store.async_load() == [{"id": 1}, {"id": 2}]
+    assert store.journal_length == 2
+
+    # The journal is full, the whole list is written instead
+    store.async_append({"id": 3})
+    await hass.async_block_till_done()
+    assert hass_storage[store.key]["data"] == [{"id": 1}, {"id": 2}, {"id": 3}]
+    assert f"{store.key}.journal" not in hass_storage
+    assert store.journal_length == 0
+
+    store.async_append({"id": 4})
+    await store.async_save([{"id": 4}])
+    await hass.async_block_till_done()
+    assert hass_storage[store.key]["data"] == [{"id": 4}]
+    assert f"{store.key}.journal" not in hass_storage
+
+    store = storage.JournalStore(hass, MOCK_VERSION, MOCK_KEY)
+    assert await store.async_load() == [{"id": 4}]
+
+
+async def test_journal_file(hass, tmp_path):
+    """Test the journal is written as a line per item."""
+    hass.config.config_dir = str(tmp_path)
+    store = storage.JournalStore(hass, MOCK_VERSION, MOCK_KEY)
+
+    def read_file():
+        """Return the content of the journal file."""
+        with open(store.journal_path) as fdesc:
+            return fdesc.read()
+
+    def cut_line():
+        """Append a line cut by an interrupted write."""
+        with open(store.journal_path, "a") as fdesc:
+            fdesc.write('{"id":')
+
+    await hass.async_add_executor_job(store._append_journal, [{"id": 1}, {"id": 2}])
+    assert await hass.async_add_executor_job(read_file) == '{"id":1}\n{"id":2}\n'
+
+    # A line cut by an interrupted write is skipped
+    await hass.async_add_executor_job(cut_line)
+    assert await hass.async_add_executor_job(store._read_journal) == [
+        {"id": 1},
+        {"id": 2},
+    ]
+
+    await hass.async_add_executor_job(store._remove_journal)
+    assert not os.path.exists(store.journal_path)
+    assert await hass.async_add_executor_job(store._read_journal) == []
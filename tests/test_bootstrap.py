@@ -278,6 +278,51 @@ async def test_setup_after_deps_not_trigger_load(hass):
     assert "second_dep" in hass.config.components
 
 
+async def test_setup_deferred_after_start(hass):
+    """Test the deferred integrations are set up after the start."""
+    hass.state = core.CoreState.not_running
+    order = []
+
+    def gen_domain_setup(domain):
+        async def async_setup(hass, config):
+            order.append(domain)
+            return True
+
+        return async_setup
+
+    mock_integration(
+        hass, MockModule(domain="root", async_setup=gen_domain_setup("root"))
+    )
+    mock_integration(
+        hass, MockModule(domain="slow", async_setup=gen_domain_setup("slow"))
+    )
+    mock_integration(
+        hass, MockModule(domain="slow_dep", async_setup=gen_domain_setup("slow_dep"))
+    )
+    mock_integration(
+        hass,
+        MockModule(
+            domain="first_dep",
+            async_setup=gen_domain_setup("first_dep"),
+            dependencies=["slow_dep"],
+        ),
+    )
+
+    with patch.object(bootstrap, "DEFERRED_INTEGRATIONS", {"slow", "slow_dep"}):
+        await bootstrap._async_set_up_integrations(
+            hass, {"root": {}, "slow": {}, "first_dep": {}}
+        )
+
+    assert "slow_dep" in hass.config.components
+    assert "slow" not in hass.config.components
+
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    assert "slow" in hass.config.components
+    assert order[-1] == "slow"
+
+
 async def test_setup_after_deps_not_present(hass):
     """Test after_dependencies when referenced integration doesn't exist."""
     order = []
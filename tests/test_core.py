@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -34,6 +35,7 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError, InvalidStateError
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -341,6 +343,23 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_and_event_as_json():
+    """Test the JSON of a State and of its event is encoded once."""
+    state = ha.State("happy.happy", "on", {"pig": "dog", "count": [1, 2]})
+    assert json.loads(state.as_json()) == json.loads(json.dumps(state, cls=JSONEncoder))
+    assert state.as_json() is state.as_json()
+
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "happy.happy", "old_state": None, "new_state": state},
+    )
+    assert json.loads(event.as_json()) == json.loads(json.dumps(event, cls=JSONEncoder))
+    assert event.as_json() is event.as_json()
+
+    with pytest.raises(ValueError):
+        ha.State("happy.happy", "on", {"pig": float("nan")}).as_json()
+
+
 class TestEventBus(unittest.TestCase):
     """Test EventBus methods."""
 
@@ -397,6 +416,33 @@ class TestEventBus(unittest.TestCase):
 
         assert len(calls) == 1
 
+    def test_listeners_of_all_events(self):
+        """Test the listeners of all the events follow the subscriptions."""
+        calls = []
+
+        @ha.callback
+        def listener(event):
+            """Mock listener."""
+            calls.append(event.event_type)
+
+        self.bus.listen("test", listener)
+        unsub = self.bus.listen(MATCH_ALL, listener)
+
+        self.bus.fire("test")
+        self.bus.fire("event")
+        self.bus.fire(EVENT_HOMEASSISTANT_CLOSE)
+        self.hass.block_till_done()
+
+        assert calls == ["test", "test", "event"]
+
+        unsub()
+
+        self.bus.fire("test")
+        self.bus.fire("event")
+        self.hass.block_till_done()
+
+        assert calls == ["test", "test", "event", "test"]
+
     def test_listen_once_event_with_callback(self):
         """Test listen_once_event method."""
         runs = []
@@ -1251,6 +1297,69 @@ async def test_service_call_event_contains_original_data(hass):
     assert calls[0].context is context
 
 
+async def test_call_many_merges_the_entities(hass):
+    """Test the calls differing by their entities are merged."""
+    events = []
+
+    @ha.callback
+    def callback(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_CALL_SERVICE, callback)
+
+    calls = async_mock_service(
+        hass, "light", "turn_on", vol.Schema({}, extra=vol.ALLOW_EXTRA)
+    )
+    off_calls = async_mock_service(hass, "light", "turn_off")
+
+    context = ha.Context()
+    assert await hass.services.async_call_many(
+        [
+            ("light", "turn_on", {"entity_id": "light.bowl"}),
+            ("light", "turn_on", {"entity_id": "light.frog, light.lamp"}),
+            ("light", "turn_on", {"entity_id": "light.desk", "brightness": 100}),
+            ("light", "turn_on", {"entity_id": ["light.ceiling"]}),
+            ("light", "turn_off", {"entity_id": "all"}),
+        ],
+        blocking=True,
+        context=context,
+    )
+    await hass.async_block_till_done()
+
+    assert len(events) == 3
+    assert [call.data for call in calls] == [
+        {"entity_id": ["light.bowl", "light.frog", "light.lamp", "light.ceiling"]},
+        {"entity_id": "light.desk", "brightness": 100},
+    ]
+    assert all(call.context is context for call in calls)
+    assert [call.data for call in off_calls] == [{"entity_id": "all"}]
+
+
+async def test_call_many_validates_before_running(hass):
+    """Test no service is called when a call is not valid."""
+    calls = async_mock_service(
+        hass, "test", "service", vol.Schema({"number": vol.Coerce(int)})
+    )
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call_many(
+            [
+                ("test", "service", {"number": "23"}),
+                ("test", "service", {"number": "abc"}),
+            ],
+            blocking=True,
+        )
+
+    with pytest.raises(ha.ServiceNotFound):
+        await hass.services.async_call_many(
+            [("test", "service", {"number": "23"}), ("test", "missing", None)],
+            blocking=True,
+        )
+
+    await hass.async_block_till_done()
+    assert calls == []
+
+
 def test_context():
     """Test context init."""
     c = ha.Context()
@@ -1548,6 +1657,41 @@ async def test_async_entity_ids_count(hass):
     assert hass.states.async_entity_ids_count("light") == 3
 
 
+async def test_domain_queries_follow_changes(hass):
+    """Test the domain queries after the states are updated and removed."""
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.link", "on")
+    hass.states.async_set("light.frog", "on")
+    hass.states.async_set("light.bowl", "off")
+
+    assert hass.states.async_entity_ids("LIGHT") == ["light.bowl", "light.frog"]
+    assert [state.state for state in hass.states.async_all("light")] == ["off", "on"]
+    assert hass.states.async_entity_ids_count(["light", "switch", "light"]) == 3
+
+    hass.states.async_remove("light.bowl")
+    hass.states.async_remove("switch.link")
+
+    assert hass.states.async_entity_ids(["light", "switch"]) == ["light.frog"]
+    assert hass.states.async_all("switch") == []
+    assert hass.states.async_entity_ids_count("switch") == 0
+
+
+async def test_unchanged_attributes_are_shared(hass):
+    """Test the states share the attributes which are not changed."""
+    hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+    old_state = hass.states.get("sensor.power")
+    old_state.attributes_as_json()
+
+    hass.states.async_set("sensor.power", "20", {"unit_of_measurement": "W"})
+    state = hass.states.get("sensor.power")
+    assert state.attributes is old_state.attributes
+    assert state.attributes_as_json() is old_state.attributes_as_json()
+
+    hass.states.async_set("sensor.power", "20", {"unit_of_measurement": "kW"})
+    assert hass.states.get("sensor.power").attributes == {"unit_of_measurement": "kW"}
+
+
 async def test_hassjob_forbid_coroutine():
     """Test hassjob forbids coroutines."""
 
@@ -1,4 +1,6 @@
 """Test to verify that we can load components."""
+import os
+
 import pytest
 
 from homeassistant.components import http, hue
@@ -394,3 +396,67 @@ async def test_get_custom_components_safe_mode(hass):
     """Test that we get empty custom components in safe mode."""
     hass.config.safe_mode = True
     assert await loader.async_get_custom_components(hass) == {}
+
+
+def test_loader_cache_manifest(tmp_path):
+    """Test the manifests are parsed again only when the file changed."""
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text('{"domain": "comp", "name": "Comp"}')
+    cache = loader.LoaderCache()
+
+    assert cache.get_manifest(manifest_path) == {"domain": "comp", "name": "Comp"}
+    assert cache.changed
+
+    with patch("json.loads") as mock_loads:
+        manifest = cache.get_manifest(manifest_path)
+    assert manifest == {"domain": "comp", "name": "Comp"}
+    assert len(mock_loads.mock_calls) == 0
+
+    # The integration adds keys to its manifest
+    manifest["is_built_in"] = True
+    assert "is_built_in" not in cache.get_manifest(manifest_path)
+
+    manifest_path.write_text('{"domain": "comp", "name": "New Comp"}')
+    os.utime(manifest_path, (0, 0))
+    assert cache.get_manifest(manifest_path)["name"] == "New Comp"
+
+    assert cache.get_manifest(tmp_path / "missing.json") is None
+    assert loader.LoaderCache(cache.as_dict()).manifests == cache.manifests
+
+    # The saved data is not changed by the cache
+    data = cache.as_dict()
+    cache.get_sub_directories(tmp_path)
+    cache.manifests[str(manifest_path)][1]["name"] = "Changed"
+    assert data["directories"] == {}
+    assert data["manifests"][str(manifest_path)][1]["name"] == "New Comp"
+
+
+async def test_get_integration_uses_loader_cache(hass):
+    """Test the manifests of the integrations are kept in the loader cache."""
+    integration = await loader.async_get_integration(hass, "http")
+
+    cache = await loader.async_get_loader_cache(hass)
+    assert str(integration.file_path / "manifest.json") in cache.manifests
+
+
+async def test_loader_cache_storage(hass, hass_storage):
+    """Test the loader cache is loaded from and saved to the storage."""
+    hass.data.pop(loader.DATA_LOADER_CACHE)
+    hass_storage[loader.LOADER_CACHE_KEY] = {
+        "version": loader.LOADER_CACHE_VERSION,
+        "key": loader.LOADER_CACHE_KEY,
+        "data": {
+            "ha_version": loader.__version__,
+            "manifests": {"/comp/manifest.json": [1, {"domain": "comp"}]},
+        },
+    }
+
+    cache = await loader.async_get_loader_cache(hass)
+    assert cache.manifests == {"/comp/manifest.json": [1, {"domain": "comp"}]}
+
+    cache.add_satisfied("package==1.0")
+    with patch("homeassistant.helpers.storage.Store.async_delay_save") as mock_save:
+        loader.async_save_loader_cache(hass)
+    data = mock_save.mock_calls[0][1][0]()
+    assert data["requirements"] == ["package==1.0"]
+    assert not cache.changed
@@ -4,6 +4,7 @@ import os
 import pytest
 
 from homeassistant import loader, setup
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.requirements import (
     CONSTRAINT_FILE,
     RequirementsNotFound,
@@ -244,3 +245,47 @@ async def test_discovery_requirements_zeroconf(hass, partial_manifest):
 
     assert len(mock_process.mock_calls) == 2  # zeroconf also depends on http
     assert mock_process.mock_calls[0][1][2] == zeroconf.requirements
+
+
+async def test_satisfied_requirements_are_cached(hass, hass_storage):
+    """Test the satisfied requirements are only checked once."""
+    with patch(
+        "homeassistant.util.package.is_installed", return_value=True
+    ) as mock_is_installed:
+        await async_process_requirements(hass, "comp", ["package==0.0.1"])
+        await async_process_requirements(hass, "comp", ["package==0.0.1"])
+
+    assert len(mock_is_installed.mock_calls) == 1
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert hass_storage[loader.LOADER_CACHE_KEY]["data"]["requirements"] == [
+        "package==0.0.1"
+    ]
+
+
+async def test_satisfied_requirements_restored(hass, hass_storage):
+    """Test the satisfied requirements are restored until a package changes."""
+    cache = loader.LoaderCache()
+    cache.add_satisfied("package==0.0.1")
+    hass_storage[loader.LOADER_CACHE_KEY] = {
+        "version": loader.LOADER_CACHE_VERSION,
+        "data": cache.as_dict(),
+    }
+
+    with patch(
+        "homeassistant.util.package.is_installed", return_value=True
+    ) as mock_is_installed:
+        await async_process_requirements(hass, "comp", ["package==0.0.1"])
+
+    assert len(mock_is_installed.mock_calls) == 0
+
+    hass.data.pop(loader.DATA_LOADER_CACHE)
+    hass_storage[loader.LOADER_CACHE_KEY]["data"]["packages_mtime"] = []
+
+    with patch(
+        "homeassistant.util.package.is_installed", return_value=True
+    ) as mock_is_installed:
+        await async_process_requirements(hass, "comp", ["package==0.0.1"])
+
+    assert len(mock_is_installed.mock_calls) == 1